@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 from dataclasses import dataclass
@@ -18,3 +19,40 @@ class Config:
     APP_NGINX_PREFIX = os.getenv('APP_NGINX_PREFIX', default='/')
 
     PARAMETER_SELECTION_N_JOBS: int = 4
+
+    # Сколько окон отправлять в NeuralForecast.predict за один вызов
+    NEURAL_PREDICT_WINDOWS_BATCH_SIZE: int = int(os.getenv('NEURAL_PREDICT_WINDOWS_BATCH_SIZE', default=512))
+
+    # Фоновые задачи обучения (jobs): каталог общий для всех воркеров uvicorn
+    JOBS_DIR: str = os.getenv('JOBS_DIR', default=os.path.join(tempfile.gettempdir(), 'forecast-service-jobs'))
+    # Сколько тяжелых задач одновременно выполняет один процесс приложения
+    JOBS_MAX_WORKERS: int = int(os.getenv('JOBS_MAX_WORKERS', default=1))
+    # Сколько задач (в очереди и выполняющихся) может быть у одного процесса приложения
+    JOBS_MAX_QUEUE: int = int(os.getenv('JOBS_MAX_QUEUE', default=8))
+    # Сколько хранить результаты завершенных задач
+    JOBS_RESULT_TTL_SECONDS: int = int(os.getenv('JOBS_RESULT_TTL_SECONDS', default=24 * 60 * 60))
+    # Как часто процесс сообщает, что его задачи живы, и через сколько без сигнала задача считается упавшей
+    JOBS_HEARTBEAT_SECONDS: int = int(os.getenv('JOBS_HEARTBEAT_SECONDS', default=10))
+    JOBS_STALE_SECONDS: int = int(os.getenv('JOBS_STALE_SECONDS', default=60))
+
+    # Формат файлов моделей: pickle или compact (только то, что нужно прогнозу). Оба читают pickle-файлы.
+    # compact - не pickle: такие файлы не открываются pickle.load и сборками без CompactSerializer
+    MODEL_SERIALIZER: str = os.getenv('MODEL_SERIALIZER', default='pickle')
+
+    # Архив обученной модели: уровень DEFLATE для fit_results.json и сжимать ли файл модели
+    # (файл модели обычно уже сжат, поэтому по умолчанию хранится как есть)
+    ARCHIVE_JSON_COMPRESSLEVEL: int = int(os.getenv('ARCHIVE_JSON_COMPRESSLEVEL', default=1))
+    ARCHIVE_COMPRESS_MODEL: bool = os.getenv('ARCHIVE_COMPRESS_MODEL', default='false').lower() == 'true'
+
+    # Кэш десериализованных моделей для эндпоинтов прогноза (на процесс приложения)
+    MODEL_CACHE_MAX_ENTRIES: int = int(os.getenv('MODEL_CACHE_MAX_ENTRIES', default=16))
+    MODEL_CACHE_MAX_BYTES: int = int(os.getenv('MODEL_CACHE_MAX_BYTES', default=512 * 1024 * 1024))
+
+    # Реестр обученных моделей: прогноз по model_id без повторной загрузки файла модели
+    MODEL_REGISTRY_DIR: str = os.getenv('MODEL_REGISTRY_DIR', default=os.path.join(tempfile.gettempdir(), 'forecast-service-models'))
+    MODEL_REGISTRY_TTL_SECONDS: int = int(os.getenv('MODEL_REGISTRY_TTL_SECONDS', default=7 * 24 * 60 * 60))
+    MODEL_REGISTRY_MAX_BYTES: int = int(os.getenv('MODEL_REGISTRY_MAX_BYTES', default=5 * 1024 ** 3))
+
+    # Пакетный мониторинг рядов: число процессов и сколько пар (ряд, тест) отправлять в процесс за раз
+    MONITORING_SWEEP_N_JOBS: int = int(os.getenv('MONITORING_SWEEP_N_JOBS', default=4))
+    MONITORING_SWEEP_CHUNK_SIZE: int = int(os.getenv('MONITORING_SWEEP_CHUNK_SIZE', default=64))
@@ -1,4 +1,5 @@
 import uvicorn
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
@@ -10,10 +11,18 @@ from src.api import container, router
 from src.api.logs import RequestLoggingMiddleware
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # закрываем зависимости уровня приложения, в т.ч. пул процессов подбора параметров
+    container.close()
+
+
 def create_fastapi_app() -> FastAPI:
     app = FastAPI(
         title="Сервис моделирования и прогнозирования",
         root_path=Config.APP_NGINX_PREFIX,
+        lifespan=lifespan,
     )
 
     app.include_router(router)
@@ -25,7 +25,7 @@ from src.core.application.preliminary_diagnosis.use_cases.auto_qq import AutoQQp
 from src.core.application.preliminary_diagnosis.use_cases.corr import CorrelationMatrixUC
 from src.core.application.preliminary_diagnosis.use_cases.df_gls import DfGlsUC
 from src.core.application.preliminary_diagnosis.use_cases.dicker_fuller import DickeuFullerUC
-from src.core.application.preliminary_diagnosis.use_cases.fao import FaoUC
+from src.core.application.preliminary_diagnosis.use_cases.fao import FaoUC, FaoBatchUC
 from src.core.application.preliminary_diagnosis.use_cases.hegy import HegyUC
 from src.core.application.preliminary_diagnosis.use_cases.histogram import HistogramUC
 from src.core.application.preliminary_diagnosis.use_cases.kde import EstimateDistributionsUC
@@ -39,6 +39,7 @@ from src.core.application.preliminary_diagnosis.use_cases.range_uc import RangeU
 from src.core.application.preliminary_diagnosis.use_cases.student_test import StudentTestUC
 from src.core.application.preliminary_diagnosis.use_cases.fisher_test import FisherTestUC
 from src.core.application.preliminary_diagnosis.use_cases.two_sigma_test import TwoSigmaTestUC
+from src.core.application.preliminary_diagnosis.use_cases.series_monitoring_sweep import MonitoringSweepUC
 from src.core.application.preliminary_diagnosis.use_cases.statistics import StatisticsUC
 from src.core.application.preliminary_diagnosis.use_cases.zivot_andrews import ZivotAndrewsUC
 from src.core.application.preprocessing.preprocessing_uc import PreprocessUC
@@ -128,11 +129,13 @@ class CoreProvider(Provider):
 
     # fao процедура
     fao_command = provide(FaoUC, provides=FaoUC)
+    fao_batch_command = provide(FaoBatchUC, provides=FaoBatchUC)
 
     # Тест Стьюдента
     student_test_command = provide(StudentTestUC, provides=StudentTestUC)
     fisher_test_command = provide(FisherTestUC, provides=FisherTestUC)
     two_sigma_test_command = provide(TwoSigmaTestUC, provides=TwoSigmaTestUC)
+    monitoring_sweep_command = provide(MonitoringSweepUC, provides=MonitoringSweepUC)
 
     # Определение структурных сдвигов
     break_finder_command = provide(BreakFinderUC, provides=BreakFinderUC)
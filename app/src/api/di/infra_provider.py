@@ -1,5 +1,11 @@
+import zipfile
+from datetime import timedelta
+from typing import Iterable
+
 from dishka import Provider, Scope, provide
 
+from config import Config
+
 from src.infrastructure.adapters.distributions import HistogramEstimator, DensityEstimator, EmpiricalDistribution
 from src.infrastructure.adapters.equality_of_distribution.mann_whitney import MannWhitneyAdapter
 from src.infrastructure.adapters.equality_of_distribution.ttest import TtestAdapter
@@ -7,6 +13,9 @@ from src.infrastructure.adapters.equality_of_distribution.wilcoxon import Wilcox
 from src.infrastructure.adapters.forecast_accuracy_comparison.dm_test import DmTestAdapter
 from src.infrastructure.adapters.model_parameters_selection.arima_gridsearch import ArimaGridsearch
 from src.infrastructure.adapters.model_parameters_selection.parallel_arima_gridsearch import ParallelArimaGridsearch
+from src.infrastructure.adapters.model_parameters_selection.worker_pool import ParameterSelectionPool
+from src.infrastructure.adapters.jobs import FileJobStore, JobManager
+from src.infrastructure.adapters.model_registry import ModelRegistry, FileModelRegistry
 from src.infrastructure.adapters.modeling_2.nhits import NhitsAdapter_V2
 from src.infrastructure.adapters.modeling_2.lstm import LstmAdapter_V2
 from src.infrastructure.adapters.modeling_2.gru import GruAdapter_V2
@@ -17,6 +26,7 @@ from src.infrastructure.adapters.preliminary_diagnosis.kim_andrews import KimAnd
 from src.infrastructure.adapters.preliminary_diagnosis.statistics import StatisticsAdapter
 from src.infrastructure.adapters.stat_tests.fisher import FisherTestAdapter
 from src.infrastructure.adapters.stat_tests.student import StudentTestAdapter
+from src.infrastructure.adapters.stat_tests.sweep import MonitoringSweepPool
 from src.infrastructure.adapters.stat_tests.two_sigma import TwoSigmaTestAdapter
 from src.infrastructure.adapters.timeseries.forecast_aligner import ForecastTargetAligner
 from src.infrastructure.adapters.timeseries.split_windows import WindowSplitter
@@ -36,7 +46,7 @@ from src.infrastructure.adapters.predicting.neural_predict.models import Predict
 from src.infrastructure.factories.stationarity import StationaryTestsFactory
 from src.infrastructure.factories.statistics import StatisticsFactory
 from src.infrastructure.factories.preprocessing import PreprocessFactory
-from src.infrastructure.adapters.serializer import PickleSerializer, ModelSerializer
+from src.infrastructure.adapters.serializer import PickleSerializer, CompactSerializer, ModelSerializer, ModelCache
 from src.infrastructure.adapters.archiver import ModelArchiver, ZipArchiver
 from src.infrastructure.factories.validation import ValidationVisitor
 from src.infrastructure.adapters.timeseries import (
@@ -62,8 +72,6 @@ class InfraProvider(Provider):
     ts_extender = provide(TimeseriesExtender, provides=TimeseriesExtender)
     freq_determiner = provide(FrequencyDeterminer, provides=FrequencyDeterminer)
     ts_spliter = provide(TimeseriesTrainTestSplit, provides=TimeseriesTrainTestSplit)
-    model_serializer = provide(PickleSerializer, provides=ModelSerializer)
-    model_archiver = provide(ZipArchiver, provides=ModelArchiver)
 
     arimax = provide(ArimaxAdapter, provides=ArimaxAdapter)
     arimax_predictor = provide(PredictArimaxAdapter, provides=PredictArimaxAdapter)
@@ -120,6 +128,57 @@ class InfraProvider(Provider):
     arima_gridsearch = provide(ArimaGridsearch, provides=ArimaGridsearch)
     parallel_sarimax_gridsearch = provide(ParallelArimaGridsearch, provides=ParallelArimaGridsearch)
 
+    @provide(scope=Scope.APP)
+    def parameter_selection_pool(self) -> Iterable[ParameterSelectionPool]:
+        # один пул на процесс приложения, закрывается вместе с контейнером
+        pool = ParameterSelectionPool(n_jobs=Config.PARAMETER_SELECTION_N_JOBS)
+        yield pool
+        pool.shutdown()
+
+    @provide(scope=Scope.APP)
+    def monitoring_sweep_pool(self) -> Iterable[MonitoringSweepPool]:
+        pool = MonitoringSweepPool(n_jobs=Config.MONITORING_SWEEP_N_JOBS, chunk_size=Config.MONITORING_SWEEP_CHUNK_SIZE)
+        yield pool
+        pool.shutdown()
+
+    @provide(scope=Scope.APP)
+    def model_serializer(self) -> ModelSerializer:
+        if Config.MODEL_SERIALIZER == 'compact':
+            return CompactSerializer()
+        return PickleSerializer()
+
+    @provide(scope=Scope.APP)
+    def model_archiver(self) -> ModelArchiver:
+        return ZipArchiver(
+            json_compresslevel=Config.ARCHIVE_JSON_COMPRESSLEVEL,
+            model_compression=zipfile.ZIP_DEFLATED if Config.ARCHIVE_COMPRESS_MODEL else zipfile.ZIP_STORED,
+        )
+
+    @provide(scope=Scope.APP)
+    def model_cache(self) -> ModelCache:
+        return ModelCache(max_entries=Config.MODEL_CACHE_MAX_ENTRIES, max_bytes=Config.MODEL_CACHE_MAX_BYTES)
+
+    @provide(scope=Scope.APP)
+    def model_registry(self) -> ModelRegistry:
+        return FileModelRegistry(
+            root=Config.MODEL_REGISTRY_DIR,
+            ttl_seconds=Config.MODEL_REGISTRY_TTL_SECONDS,
+            max_bytes=Config.MODEL_REGISTRY_MAX_BYTES,
+        )
+
+    @provide(scope=Scope.APP)
+    def job_manager(self) -> Iterable[JobManager]:
+        manager = JobManager(
+            store=FileJobStore(Config.JOBS_DIR),
+            max_workers=Config.JOBS_MAX_WORKERS,
+            max_queue=Config.JOBS_MAX_QUEUE,
+            result_ttl=timedelta(seconds=Config.JOBS_RESULT_TTL_SECONDS),
+            heartbeat_interval=timedelta(seconds=Config.JOBS_HEARTBEAT_SECONDS),
+            stale_after=timedelta(seconds=Config.JOBS_STALE_SECONDS),
+        )
+        yield manager
+        manager.shutdown()
+
     stat_tests_factory = provide(StationaryTestsFactory, provides=StationaryTestsFactory)
 
     ttest = provide(TtestAdapter, provides=TtestAdapter)
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+from src.infrastructure.adapters.model_registry import ModelRegistry, ModelNotFoundError
+
+MODEL_FILE_DESCRIPTION = "Файл модели в формате .pickle. Не нужен, если передан model_id"
+MODEL_ID_DESCRIPTION = "Идентификатор модели из реестра (model_id в fit_results.json). Вместо загрузки файла модели"
+
+
+def read_model_bytes(registry: ModelRegistry, model_file: Optional[UploadFile], model_id: Optional[str]) -> bytes:
+    """Байты модели из загруженного файла или из реестра по model_id"""
+    if (model_file is None) == (model_id is None):
+        raise HTTPException(status_code=400, detail="Нужно передать либо файл модели model_file, либо model_id")
+
+    if model_file is not None:
+        return model_file.file.read()
+
+    try:
+        return registry.load(model_id)
+    except ModelNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
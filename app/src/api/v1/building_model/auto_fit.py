@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Response, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
@@ -14,13 +15,13 @@ automl_model_router = APIRouter(prefix="/building_model/auto", tags=["Модел
 def autoarimax(
     request: AutoArimaRequest,
     autoarimax_uc: FromDishka[AutoArimaUC]
-) -> Response:
+) -> StreamingResponse:
     try:
-        archive_response = autoarimax_uc.execute(request=request)
+        archive_response = autoarimax_uc.execute_stream(request=request)
     except ConstantInExogAndSpecification as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    return Response(
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
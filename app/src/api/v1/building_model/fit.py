@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Response, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
@@ -32,13 +33,13 @@ fit_model_router = APIRouter(prefix="/building_model", tags=["Построени
 def fit_arimax(
     request: ArimaxFitRequest,
     fit_arimax_uc: FromDishka[FitArimaxUC]
-) -> Response:
+) -> StreamingResponse:
     try:
-        archive_response = fit_arimax_uc.execute(request=request)
+        archive_response = fit_arimax_uc.execute_stream(request=request)
     except ConstantInExogAndSpecification as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    return Response(
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
@@ -64,9 +65,9 @@ def fit_arimax(
 def fit_nhits(
     request: NhitsFitRequest,
     fit_nhits_uc: FromDishka[FitNhitsUC]
-) -> Response:
-    archive_response = fit_nhits_uc.execute(request=request)
-    return Response(
+) -> StreamingResponse:
+    archive_response = fit_nhits_uc.execute_stream(request=request)
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
@@ -89,9 +90,9 @@ def fit_nhits(
 def fit_lstm(
     request: LstmFitRequest,
     fit_lstm_uc: FromDishka[FitLstmUC]
-) -> Response:
-    archive_response = fit_lstm_uc.execute(request=request)
-    return Response(
+) -> StreamingResponse:
+    archive_response = fit_lstm_uc.execute_stream(request=request)
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
@@ -114,9 +115,9 @@ def fit_lstm(
 def fit_gru(
     request: GruFitRequest,
     fit_gru_uc: FromDishka[FitGruUC]
-) -> Response:
-    archive_response = fit_gru_uc.execute(request=request)
-    return Response(
+) -> StreamingResponse:
+    archive_response = fit_gru_uc.execute_stream(request=request)
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, UploadFile, File
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Form
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
+from src.api.model_source import read_model_bytes, MODEL_FILE_DESCRIPTION, MODEL_ID_DESCRIPTION
 from src.core.application.predict_series.use_cases.predict_arimax import PredictArimaxUC
 from src.core.application.predict_series.use_cases.predict_gru import PredictGruUC
 from src.core.application.predict_series.schemas.schemas import PredictRequest
 from src.core.application.predict_series.use_cases.predict_lstm import PredictLstmUC
 from src.core.application.predict_series.use_cases.predict_nhits import PredictNhitsUC
 from src.core.domain import ForecastResult
+from src.infrastructure.adapters.model_registry import ModelRegistry
 
 model_predict_router = APIRouter(prefix="/model_predicting", tags=["Прогнозы моделей"])
 
@@ -25,9 +29,12 @@ model_predict_router = APIRouter(prefix="/model_predicting", tags=["Прогно
 def predict_arimax(
     predict_arimax_uc: FromDishka[PredictArimaxUC],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult:
-    return predict_arimax_uc.execute(request=request, model_bytes=model_file.file.read())
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_arimax_uc.execute(request=request, model_bytes=model_bytes)
 
 
 @model_predict_router.post(
@@ -43,9 +50,12 @@ def predict_arimax(
 def predict_gru(
     predict_gru_uc: FromDishka[PredictGruUC],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult:
-    return predict_gru_uc.execute(request=request, model_bytes=model_file.file.read())
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_gru_uc.execute(request=request, model_bytes=model_bytes)
 
 
 @model_predict_router.post(
@@ -61,9 +71,12 @@ def predict_gru(
 def predict_nhits(
     predict_nhits_uc: FromDishka[PredictNhitsUC],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult:
-    return predict_nhits_uc.execute(request=request, model_bytes=model_file.file.read())
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_nhits_uc.execute(request=request, model_bytes=model_bytes)
 
 
 @model_predict_router.post(
@@ -79,6 +92,9 @@ def predict_nhits(
 def predict_lstm(
     predict_lstm_uc: FromDishka[PredictLstmUC],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult:
-    return predict_lstm_uc.execute(request=request, model_bytes=model_file.file.read())
\ No newline at end of file
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_lstm_uc.execute(request=request, model_bytes=model_bytes)
\ No newline at end of file
@@ -1,11 +1,12 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
 from src.core.application.preliminary_diagnosis.errors.fao import FaoValidationError
 from src.core.application.preliminary_diagnosis.schemas.auto_pp import AutoPPRequest, AutoPPResult
 from src.core.application.preliminary_diagnosis.schemas.auto_qq import AutoQQRequest, AutoQQResult
-from src.core.application.preliminary_diagnosis.schemas.fao import FaoResult, FaoRequest
+from src.core.application.preliminary_diagnosis.schemas.fao import FaoResult, FaoRequest, FaoBatchRequest, FaoBatchItem
 from src.core.application.preliminary_diagnosis.schemas.histogram import HistogramRequest
 from src.core.application.preliminary_diagnosis.schemas.kde import DistributionsRequest, DistributionsResult
 from src.core.application.preliminary_diagnosis.schemas.pp_plot import PPplotParams, PPResult
@@ -13,7 +14,7 @@ from src.core.application.preliminary_diagnosis.schemas.qq import QQResult, QQPa
 
 from src.core.application.preliminary_diagnosis.use_cases.auto_pp import AutoPPplotUC
 from src.core.application.preliminary_diagnosis.use_cases.auto_qq import AutoQQplotUC
-from src.core.application.preliminary_diagnosis.use_cases.fao import FaoUC
+from src.core.application.preliminary_diagnosis.use_cases.fao import FaoUC, FaoBatchUC
 from src.core.application.preliminary_diagnosis.use_cases.histogram import HistogramUC
 from src.core.application.preliminary_diagnosis.use_cases.kde import EstimateDistributionsUC
 from src.core.application.preliminary_diagnosis.use_cases.pp_plot import PPplotUC
@@ -93,4 +94,27 @@ def get_fao_values(
     request: FaoRequest,
     fao_uc: FromDishka[FaoUC]
 ) -> FaoResult:
-    return fao_uc.execute(request=request)
\ No newline at end of file
+    return fao_uc.execute(request=request)
+
+
+@data_representations_router.post(
+    path="/fao/batch",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "model": FaoBatchItem,
+            "content": {"application/x-ndjson": {}},
+            "description": "Результаты по рядам в порядке запроса, по одному JSON-объекту FaoBatchItem на строку",
+        },
+    }
+)
+@inject_sync
+def get_fao_batch_values(
+    request: FaoBatchRequest,
+    fao_batch_uc: FromDishka[FaoBatchUC]
+) -> StreamingResponse:
+    items = fao_batch_uc.execute(request=request)
+    return StreamingResponse(
+        (item.model_dump_json() + "\n" for item in items),
+        media_type="application/x-ndjson",
+    )
@@ -3,7 +3,8 @@ from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 from src.core.application.preliminary_diagnosis.schemas.quantiles import QuantilesResult, QuantilesParams
 from src.core.application.preliminary_diagnosis.schemas.statistics import StatisticResult, \
-    StatisticsResponse, StatisticsRequest, StatMetricEnum, get_russian_metric
+    StatisticsResponse, StatisticsRequest, StatMetricEnum, get_russian_metric, \
+    StatisticsTableRequest, StatisticsTableResponse
 from src.core.application.preliminary_diagnosis.use_cases.quantiles import QuantilesUC
 from src.core.application.preliminary_diagnosis.use_cases.statistics import StatisticsUC
 from src.core.domain import Timeseries
@@ -51,4 +52,20 @@ def statistics(
             - Названия групп формируются как "номер группы + тип разбиения" (например, "1 квартиль")
             - Нумерация групп начинается с 1 (group_num+1)
     """
-    return statistics_uc.execute_many(request=request)
\ No newline at end of file
+    return statistics_uc.execute_many(request=request)
+
+
+@descriptive_statistics_router.post(path="/statistics_table")
+@inject_sync
+def statistics_table(
+    request: StatisticsTableRequest,
+    statistics_uc: FromDishka[StatisticsUC],
+) -> StatisticsTableResponse:
+    """
+    Статистики для многих рядов за один запрос.
+
+    Ряды передаются столбцами на общей сетке дат (values[i] - значения ряда names[i], пропуски - null).
+    Ответ - таблица: для каждой статистики список значений в порядке names.
+    Если статистику для ряда посчитать нельзя, значение - null.
+    """
+    return statistics_uc.execute_table(request=request)
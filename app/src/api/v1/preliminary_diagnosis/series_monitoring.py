@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
@@ -7,6 +8,7 @@ from src.core.application.preliminary_diagnosis.use_cases.break_finder import Br
 from src.core.application.preliminary_diagnosis.use_cases.student_test import StudentTestUC
 from src.core.application.preliminary_diagnosis.use_cases.fisher_test import FisherTestUC
 from src.core.application.preliminary_diagnosis.use_cases.two_sigma_test import TwoSigmaTestUC
+from src.core.application.preliminary_diagnosis.use_cases.series_monitoring_sweep import MonitoringSweepUC
 
 from src.core.application.preliminary_diagnosis.schemas.series_monitoring import (
     StudentTestRequest,
@@ -14,7 +16,9 @@ from src.core.application.preliminary_diagnosis.schemas.series_monitoring import
     FisherTestRequest,
     FisherTestResponse,
     TwoSigmaTestRequest,
-    TwoSigmaTestResponse
+    TwoSigmaTestResponse,
+    MonitoringSweepRequest,
+    MonitoringSweepResponse,
 )
 from src.core.domain.stat_test.student import InvalidDateError
 
@@ -61,3 +65,27 @@ def break_finder(
         return uc.execute(request=request)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=exc)
+
+
+@series_monitoring_router.post(
+    path="/sweep",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "При stream=true - по одному JSON-объекту MonitoringSweepRow на строку, в порядке ряд, затем тест",
+        },
+    }
+)
+@inject_sync
+def sweep(
+    request: MonitoringSweepRequest,
+    uc: FromDishka[MonitoringSweepUC],
+    stream: bool = False,
+) -> MonitoringSweepResponse:
+    rows = uc.execute(request=request)
+    if stream:
+        return StreamingResponse(
+            (row.model_dump_json() + "\n" for row in rows),
+            media_type="application/x-ndjson",
+        )
+    return MonitoringSweepResponse(results=list(rows))
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
@@ -28,9 +29,9 @@ fit_model_router = APIRouter(prefix="/building_model", tags=["Построени
 def fit_nhits(
     request: NhitsFitRequest_V2,
     fit_nhits_uc: FromDishka[FitNhitsUC_V2]
-) -> Response:
-    archive_response = fit_nhits_uc.execute(request=request)
-    return Response(
+) -> StreamingResponse:
+    archive_response = fit_nhits_uc.execute_stream(request=request)
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
@@ -53,9 +54,9 @@ def fit_nhits(
 def fit_lstm(
     request: LstmFitRequest_V2,
     fit_lstm_uc: FromDishka[FitLstmUC_V2]
-) -> Response:
-    archive_response = fit_lstm_uc.execute(request=request)
-    return Response(
+) -> StreamingResponse:
+    archive_response = fit_lstm_uc.execute_stream(request=request)
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
@@ -78,9 +79,9 @@ def fit_lstm(
 def fit_gru(
     request: GruFitRequest_V2,
     fit_gru_uc: FromDishka[FitGruUC_V2]
-) -> Response:
-    archive_response = fit_gru_uc.execute(request=request)
-    return Response(
+) -> StreamingResponse:
+    archive_response = fit_gru_uc.execute_stream(request=request)
+    return StreamingResponse(
         content=archive_response,
         media_type="application/octet-stream",
     )
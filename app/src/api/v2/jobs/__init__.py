@@ -0,0 +1 @@
+from .jobs import jobs_router
@@ -0,0 +1,124 @@
+from typing import Callable
+
+from fastapi import APIRouter, Response, HTTPException
+from dishka import FromDishka
+from dishka.integrations.fastapi import inject_sync
+
+from src.api.di import container
+from src.core.application.building_model.schemas import NhitsFitRequest_V2, LstmFitRequest_V2, GruFitRequest_V2
+from src.core.application.building_model.schemas.arimax import ArimaxFitRequest
+from src.core.application.building_model.schemas.autoarima import AutoArimaRequest
+from src.core.application.building_model.use_cases.autoarima import AutoArimaUC
+from src.core.application.building_model.use_cases.models import FitArimaxUC
+from src.core.application.building_model.use_cases.models_v2 import FitNhitsUC_V2, FitLstmUC_V2, FitGruUC_V2
+from src.core.domain.jobs import JobInfo
+from src.infrastructure.adapters.jobs import (
+    JobManager,
+    JobNotFoundError,
+    JobQueueFullError,
+    JobNotFinishedError,
+    JobFailedError,
+)
+from src.infrastructure.adapters.modeling.errors.arimax import ConstantInExogAndSpecification
+
+jobs_router = APIRouter(prefix="/jobs", tags=["Фоновые задачи"])
+
+SUBMIT_RESPONSES = {
+    429: {"description": "Очередь задач заполнена"},
+}
+JOB_RESPONSES = {
+    404: {"description": "Задача не найдена"},
+}
+
+
+def _use_case_job(use_case_type: type, request) -> Callable[[], bytes]:
+    # задача живет дольше запроса, который ее поставил, поэтому зависимости берутся в своем REQUEST scope
+    def run() -> bytes:
+        with container() as request_container:
+            use_case = request_container.get(use_case_type)
+            try:
+                return use_case.execute(request=request)
+            except ConstantInExogAndSpecification as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
+    return run
+
+
+def _submit(job_manager: JobManager, kind: str, use_case_type: type, request) -> JobInfo:
+    try:
+        return job_manager.submit(kind=kind, fn=_use_case_job(use_case_type, request))
+    except JobQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+
+
+@jobs_router.post(path="/building_model/arimax/fit", status_code=202, responses=SUBMIT_RESPONSES)
+@inject_sync
+def submit_fit_arimax(request: ArimaxFitRequest, job_manager: FromDishka[JobManager]) -> JobInfo:
+    return _submit(job_manager, "building_model/arimax/fit", FitArimaxUC, request)
+
+
+@jobs_router.post(path="/building_model/nhits/fit", status_code=202, responses=SUBMIT_RESPONSES)
+@inject_sync
+def submit_fit_nhits(request: NhitsFitRequest_V2, job_manager: FromDishka[JobManager]) -> JobInfo:
+    return _submit(job_manager, "building_model/nhits/fit", FitNhitsUC_V2, request)
+
+
+@jobs_router.post(path="/building_model/lstm/fit", status_code=202, responses=SUBMIT_RESPONSES)
+@inject_sync
+def submit_fit_lstm(request: LstmFitRequest_V2, job_manager: FromDishka[JobManager]) -> JobInfo:
+    return _submit(job_manager, "building_model/lstm/fit", FitLstmUC_V2, request)
+
+
+@jobs_router.post(path="/building_model/gru/fit", status_code=202, responses=SUBMIT_RESPONSES)
+@inject_sync
+def submit_fit_gru(request: GruFitRequest_V2, job_manager: FromDishka[JobManager]) -> JobInfo:
+    return _submit(job_manager, "building_model/gru/fit", FitGruUC_V2, request)
+
+
+@jobs_router.post(path="/building_model/auto/autoarimax/fit", status_code=202, responses=SUBMIT_RESPONSES)
+@inject_sync
+def submit_autoarimax(request: AutoArimaRequest, job_manager: FromDishka[JobManager]) -> JobInfo:
+    return _submit(job_manager, "building_model/auto/autoarimax/fit", AutoArimaUC, request)
+
+
+@jobs_router.get(path="/{job_id}", responses=JOB_RESPONSES)
+@inject_sync
+def get_job(job_id: str, job_manager: FromDishka[JobManager]) -> JobInfo:
+    try:
+        return job_manager.get(job_id)
+    except JobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@jobs_router.get(
+    path="/{job_id}/result",
+    responses={
+        **JOB_RESPONSES,
+        409: {"description": "Задача еще выполняется или отменена"},
+    }
+)
+@inject_sync
+def get_job_result(job_id: str, job_manager: FromDishka[JobManager]) -> Response:
+    try:
+        archive_response = job_manager.result(job_id)
+    except JobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except JobNotFinishedError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except JobFailedError as exc:
+        # та же ошибка, что вернул бы синхронный эндпоинт
+        raise HTTPException(status_code=exc.status_code, detail=exc.error)
+
+    return Response(
+        content=archive_response,
+        media_type="application/octet-stream",
+    )
+
+
+@jobs_router.delete(path="/{job_id}", responses=JOB_RESPONSES)
+@inject_sync
+def cancel_job(job_id: str, job_manager: FromDishka[JobManager]) -> JobInfo:
+    try:
+        return job_manager.cancel(job_id)
+    except JobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
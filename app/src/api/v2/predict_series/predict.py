@@ -1,12 +1,16 @@
-from fastapi import APIRouter, File, UploadFile
+from typing import Optional
+
+from fastapi import APIRouter, File, UploadFile, Form
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject_sync
 
+from src.api.model_source import read_model_bytes, MODEL_FILE_DESCRIPTION, MODEL_ID_DESCRIPTION
 from src.core.application.predict_series.schemas.schemas import PredictRequest
 from src.core.application.predict_series.use_cases.predict_gru import PredictGruUC_V2
 from src.core.application.predict_series.use_cases.predict_lstm import PredictLstmUC_V2
 from src.core.application.predict_series.use_cases.predict_nhits import PredictNhitsUC_V2
 from src.core.domain import ForecastResult_V2
+from src.infrastructure.adapters.model_registry import ModelRegistry
 
 model_predict_router = APIRouter(prefix="/model_predicting", tags=["Прогнозы моделей"])
 
@@ -15,9 +19,12 @@ model_predict_router = APIRouter(prefix="/model_predicting", tags=["Прогно
 def predict_gru(
     predict_gru_uc: FromDishka[PredictGruUC_V2],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult_V2:
-    return predict_gru_uc.execute(request=request, model_bytes=model_file.file.read())
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_gru_uc.execute(request=request, model_bytes=model_bytes)
 
 
 @model_predict_router.post(path="/nhits/predict")
@@ -25,9 +32,12 @@ def predict_gru(
 def predict_nhits(
     predict_nhits_uc: FromDishka[PredictNhitsUC_V2],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult_V2:
-    return predict_nhits_uc.execute(request=request, model_bytes=model_file.file.read())
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_nhits_uc.execute(request=request, model_bytes=model_bytes)
 
 
 @model_predict_router.post(path="/lstm/predict")
@@ -35,6 +45,9 @@ def predict_nhits(
 def predict_lstm(
     predict_lstm_uc: FromDishka[PredictLstmUC_V2],
     request: PredictRequest,
-    model_file: UploadFile = File(..., description="Файл модели в формате .pickle"),
+    model_registry: FromDishka[ModelRegistry],
+    model_file: Optional[UploadFile] = File(None, description=MODEL_FILE_DESCRIPTION),
+    model_id: Optional[str] = Form(None, description=MODEL_ID_DESCRIPTION),
 ) -> ForecastResult_V2:
-    return predict_lstm_uc.execute(request=request, model_bytes=model_file.file.read())
+    model_bytes = read_model_bytes(model_registry, model_file, model_id)
+    return predict_lstm_uc.execute(request=request, model_bytes=model_bytes)
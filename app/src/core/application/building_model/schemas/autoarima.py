@@ -7,6 +7,7 @@ from src.core.domain import Timeseries, FitParams
 from src.core.domain.model.model_data import ModelData
 from src.core.domain.parameter_selection.gridsearch_result.arimax import ArimaxGridsearchResult
 from src.core.domain.parameter_selection.scoring.information_criteria import InformationCriteriaScoring
+from src.core.domain.parameter_selection.search_strategy.search_strategy import SearchStrategy
 from src.core.domain.stat_test.supported_stat_tests import SupportedStationaryTests
 
 
@@ -23,6 +24,11 @@ class AutoArimaRequest(BaseModel):
         default=InformationCriteriaScoring.aic,
         description='информационный критерий, по которому оптимизируется модель'
     )
+    search_strategy: SearchStrategy = Field(
+        default=SearchStrategy.grid,
+        description='стратегия перебора: полный перебор (grid), пошаговый поиск (stepwise) '
+                    'или отсев бесперспективных моделей по бюджету итераций (successive_halving)'
+    )
 
     fit_params: FitParams
     # TODO: добавить стратегию кросс-валидации
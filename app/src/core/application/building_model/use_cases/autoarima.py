@@ -1,11 +1,14 @@
 # TODO:
 # from profilehooks import profile
+from typing import Iterator
 
 from src.core.application.building_model.schemas.autoarima import AutoArimaRequest, AutoArimaResult
 from src.core.domain.parameter_selection.gridsearch_result.arimax import ArimaxGridsearchResult
 from src.core.domain.stat_test import SignificanceLevel
 from src.core.domain.stat_test.supported_stat_tests import SupportedStationaryTests
 from src.infrastructure.adapters.archiver import ModelArchiver
+from src.infrastructure.adapters.model_registry import ModelRegistry
+from src.infrastructure.adapters.jobs import checkpoint
 from src.infrastructure.adapters.model_parameters_selection.arima_gridsearch import ArimaGridsearch
 from src.infrastructure.adapters.model_parameters_selection.parallel_arima_gridsearch import ParallelArimaGridsearch
 from src.infrastructure.adapters.modeling import ArimaxAdapter
@@ -30,10 +33,11 @@ from src.infrastructure.factories.stationarity.factory import StationaryTestsFac
 class AutoArimaUC:
     def __init__(
             self,
-            gridsearch:    ArimaGridsearch,
+            gridsearch:    ParallelArimaGridsearch,
             ts_aligner:    TimeseriesAlignment,
             archiver:      ModelArchiver,
             serializer:    ModelSerializer,
+            model_registry: ModelRegistry,
             arima_adapter: ArimaxAdapter,
             stationary_factory: StationaryTestsFactory,
     ):
@@ -41,12 +45,20 @@ class AutoArimaUC:
         self._gridsearch = gridsearch
         self._archiver = archiver
         self._serializer = serializer
+        self._model_registry = model_registry
         self._arima_adapter = arima_adapter
         self._stationary_factory = stationary_factory
 
+    def execute(self, request: AutoArimaRequest) -> bytes:
+        return self._archiver.execute(*self._fit(request))
+
+    def execute_stream(self, request: AutoArimaRequest) -> Iterator[bytes]:
+        """Модель обучается сразу, архив отдается по частям при чтении итератора"""
+        return self._archiver.stream(*self._fit(request))
+
     # Для профилирования:
     # @profile(filename='autoarima.prof', stdout=False)
-    def execute(self, request: AutoArimaRequest) -> bytes:
+    def _fit(self, request: AutoArimaRequest) -> tuple[dict, bytes]:
         target, exog = self._ts_aligner.align(request.model_data)
         current = target.copy()
 
@@ -57,6 +69,7 @@ class AutoArimaUC:
             # FIXME: ограничить d каким нибудь максимальным
             current = current.diff().dropna()
             d += 1
+        checkpoint(progress=0.05)
 
         # TODO: оценивать параметры надо только на обучающей и валидационной выборке НА КРОСС ВАЛИДАЦИИ
         gridsearch_result: ArimaxGridsearchResult = self._gridsearch.fit(
@@ -69,8 +82,10 @@ class AutoArimaUC:
             max_D=request.max_D,
             max_Q=request.max_Q,
             m=request.m,
-            scoring=request.scoring
+            scoring=request.scoring,
+            search_strategy=request.search_strategy,
         )
+        checkpoint(progress=0.8)
 
         # TODO: Обучать нужно на всем наборе данных
         arima_fit_result, model_weight = self._arima_adapter.fit(
@@ -88,10 +103,10 @@ class AutoArimaUC:
 
         data_dict: dict = result.model_dump()
         model_bytes: bytes = self._serializer.serialize(model_weight)
+        # по model_id модель можно прогнозировать, не загружая файл модели заново
+        data_dict['model_id'] = self._model_registry.save(model_bytes)
 
-        archive: bytes = self._archiver.execute(data_dict=data_dict, model_bytes=model_bytes)
-
-        return archive
+        return data_dict, model_bytes
 
     def _is_not_stationary(
             self,
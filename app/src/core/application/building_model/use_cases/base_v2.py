@@ -1,8 +1,10 @@
-from typing import Generic, Protocol, TypeVar
+from typing import Generic, Iterator, Protocol, TypeVar
 
 from pydantic import BaseModel
 
 from src.infrastructure.adapters.archiver import ModelArchiver
+from src.infrastructure.adapters.model_registry import ModelRegistry
+from src.infrastructure.adapters.jobs import checkpoint
 from src.infrastructure.adapters.serializer import ModelSerializer
 from src.infrastructure.adapters.timeseries import (
     PandasTimeseriesAdapter,
@@ -41,14 +43,23 @@ class FitUC_V2(Generic[TRequest, TAdapter]):
         ts_adapter: PandasTimeseriesAdapter,
         archiver: ModelArchiver,
         serializer: ModelSerializer,
+        model_registry: ModelRegistry,
     ):
         self._ts_adapter = ts_adapter
         self._ts_aligner = ts_aligner
         self._model_adapter = model_adapter
         self._serializer = serializer
         self._archiver = archiver
+        self._model_registry = model_registry
 
     def execute(self, request: TRequest) -> bytes:
+        return self._archiver.execute(*self._fit(request))
+
+    def execute_stream(self, request: TRequest) -> Iterator[bytes]:
+        """Модель обучается сразу, архив отдается по частям при чтении итератора"""
+        return self._archiver.stream(*self._fit(request))
+
+    def _fit(self, request: TRequest) -> tuple[dict, bytes]:
         target, exog_df = self._ts_aligner.align(request.model_data)
 
         model_result, model_weight = self._model_adapter.fit(
@@ -58,10 +69,11 @@ class FitUC_V2(Generic[TRequest, TAdapter]):
             fit_params=request.fit_params,
             data_frequency=request.model_data.dependent_variables.data_frequency,
         )
+        checkpoint(progress=0.95)
 
         data_dict: dict = model_result.model_dump()
         model_bytes: bytes = self._serializer.serialize(model_weight)
+        # по model_id модель можно прогнозировать, не загружая файл модели заново
+        data_dict['model_id'] = self._model_registry.save(model_bytes)
 
-        archive: bytes = self._archiver.execute(data_dict=data_dict, model_bytes=model_bytes)
-
-        return archive
+        return data_dict, model_bytes
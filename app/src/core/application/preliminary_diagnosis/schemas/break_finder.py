@@ -7,8 +7,7 @@ from src.core.domain import Timeseries
 from src.core.domain.structural_shift.break_criterion import BreakCriterion
 
 
-class BreakFinderRequest(BaseModel):
-    timeseries: Timeseries
+class BreakFinderParams(BaseModel):
     trim: tuple[Union[float, int], Union[float, int]] = (0.15, 0.15)
     gap: float = 0.15
 
@@ -21,5 +20,9 @@ class BreakFinderRequest(BaseModel):
     seasons: int = 0
 
 
+class BreakFinderRequest(BreakFinderParams):
+    timeseries: Timeseries
+
+
 class BreakFinderResponse(BaseModel):
     break_datetimes: List[datetime]
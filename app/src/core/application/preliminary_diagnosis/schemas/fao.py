@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
 from src.core.domain import Timeseries
 
@@ -18,3 +18,13 @@ class FaoRequest(BaseModel):
 class FaoResult(BaseModel):
     UN_result: list[Optional[FaoEnum]]
     PC_result: list[Optional[FaoEnum]]
+
+
+class FaoBatchRequest(BaseModel):
+    ts: list[Timeseries] = Field(min_length=1, title="Ряды цен")
+
+
+class FaoBatchItem(BaseModel):
+    name: str = Field(title="Название ряда")
+    result: Optional[FaoResult] = Field(default=None, title="Результат FAO процедуры")
+    error: Optional[str] = Field(default=None, title="Описание ошибки, если процедуру провести не удалось")
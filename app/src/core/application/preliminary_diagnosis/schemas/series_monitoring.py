@@ -1,7 +1,9 @@
-from typing import List
+from enum import Enum
+from typing import List, Optional
 from datetime import date, datetime
 from pydantic import BaseModel, Field, model_validator
 
+from src.core.application.preliminary_diagnosis.schemas.break_finder import BreakFinderParams
 from src.core.domain import Timeseries
 from src.core.domain.stat_test import SignificanceLevel, Frequency2SeriesSize
 from src.core.domain.stat_test.fisher import FisherTestResult
@@ -142,3 +144,56 @@ class FisherTestRequest(MonitoringTestRequest):
 
 class FisherTestResponse(BaseModel):
     results: List[FisherTestResult]
+
+
+class MonitoringTest(str, Enum):
+    student = "student_test"
+    fisher = "fisher_test"
+    two_sigma = "two_sigma_test"
+    break_finder = "break_finder"
+
+
+class MonitoringSweepRequest(BaseModel):
+    timeseries: List[Timeseries] = Field(min_length=1, title="Ряды")
+    tests: List[MonitoringTest] = Field(min_length=1, title="Тесты")
+    date_boundary: Optional[date] = Field(
+        default=None,
+        title="Граничная дата",
+        description="Общая для всех рядов, нужна тестам Стьюдента, Фишера и двух сигм"
+    )
+    equal_var: bool = Field(True, title="Флаг равенства дисперсий для теста Стьюдента")
+    alpha: SignificanceLevel = Field(0.05, ge=0, le=1, title="Уровень значимости")
+    break_finder: Optional[BreakFinderParams] = Field(default=None, title="Параметры поиска структурных сдвигов")
+
+    @model_validator(mode='after')
+    def validate_tests_params(self):
+        if self.date_boundary is None and set(self.tests) - {MonitoringTest.break_finder}:
+            raise ValueError('Для тестов Стьюдента, Фишера и двух сигм нужна граничная дата')
+        if self.break_finder is None and MonitoringTest.break_finder in self.tests:
+            raise ValueError('Для поиска структурных сдвигов нужны параметры break_finder')
+        return self
+
+
+# поле datetime ниже скрывает тип datetime в теле класса
+_Datetimes = Optional[List[Optional[datetime]]]
+
+
+class MonitoringSweepRow(BaseModel):
+    """
+    Результат одного теста для одного ряда в компактном виде: вместо списка объектов - столбцы.
+    Столбцы, которых у теста нет, равны None: p_value у теста двух сигм, все кроме datetime у поиска сдвигов.
+    У теста двух сигм statistic - стандартное отклонение.
+    """
+    name: str = Field(title="Название ряда")
+    test: MonitoringTest = Field(title="Тест")
+    datetime: _Datetimes = None
+    statistic: Optional[List[Optional[float]]] = None
+    p_value: Optional[List[Optional[float]]] = None
+    ci_lower: Optional[List[Optional[float]]] = None
+    ci_upper: Optional[List[Optional[float]]] = None
+    conclusion: Optional[List[str]] = None
+    error: Optional[str] = Field(default=None, title="Описание ошибки, если тест провести не удалось")
+
+
+class MonitoringSweepResponse(BaseModel):
+    results: List[MonitoringSweepRow]
@@ -1,3 +1,4 @@
+from datetime import date
 from enum import Enum
 from typing import List, Dict, Optional
 
@@ -154,3 +155,43 @@ class StatisticsResponse(BaseModel):
         ]
     )
 
+
+class StatisticsTableRequest(BaseModel):
+    """Много рядов на общей сетке дат: по столбцу значений на ряд"""
+    metrics: List[StatMetricEnum] = Field(
+        ..., min_length=1, title="Список статистик для расчета",
+        examples=[[StatMetricEnum.N_OBS, StatMetricEnum.MEAN, StatMetricEnum.VAR]]
+    )
+    names: List[str] = Field(..., min_length=1, title="Названия рядов", examples=[["IPP", "CPI"]])
+    dates: List[date] = Field(..., min_length=1, title="Даты", examples=[["2020-01-31", "2020-02-29", "2020-03-31"]])
+    values: List[List[Optional[float]]] = Field(
+        ..., title="Значения рядов",
+        description="По списку на ряд в порядке names, значения в порядке dates, пропуск - null",
+        examples=[[[1.0, 2.0, 3.5], [10.0, None, 12.0]]]
+    )
+
+    @model_validator(mode='after')
+    def validate_shape(self):
+        if len(self.values) != len(self.names):
+            raise ValueError('Число столбцов значений должно совпадать с числом названий рядов')
+        if any(len(column) != len(self.dates) for column in self.values):
+            raise ValueError('Длина каждого столбца значений должна совпадать с числом дат')
+        return self
+
+
+class StatisticsTableResponse(BaseModel):
+    names: List[str] = Field(..., title="Названия рядов")
+    results: Dict[StatMetricEnum, List[Optional[float | dict[str, float]]]] = Field(
+        ..., title="Результаты расчетов",
+        description="По столбцу на статистику, значения в порядке names. None - статистику для ряда посчитать нельзя",
+        examples=[{"Mean": [2.167, 11.0], "Number of observations": [3, 2]}]
+    )
+
+    @model_validator(mode='after')
+    def validate_results(self):
+        # как в StatisticResult: дробные значения округляются до 3 знаков
+        for column in self.results.values():
+            for i, value in enumerate(column):
+                if isinstance(value, float):
+                    column[i] = round(value, 3)
+        return self
@@ -1,12 +1,43 @@
+from typing import Iterator
+
+import pandas as pd
 from fastapi import HTTPException
 
 from src.core.application.preliminary_diagnosis.errors.fao import InvalidFreq, SmallSizeError
-from src.core.application.preliminary_diagnosis.schemas.fao import FaoRequest, FaoResult
-from src.core.domain import DataFrequency
+from src.core.application.preliminary_diagnosis.schemas.fao import (
+    FaoRequest,
+    FaoResult,
+    FaoBatchRequest,
+    FaoBatchItem,
+)
+from src.core.domain import DataFrequency, Timeseries
 from src.infrastructure.adapters.preliminary_diagnosis.fao import FaoAdapter
 from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter, FrequencyDeterminer
 
 
+def to_monthly(
+        ts: Timeseries,
+        pandas_adapter: PandasTimeseriesAdapter,
+        frequency_determiner: FrequencyDeterminer
+) -> pd.DataFrame:
+    """Проверяет ряд для FAO процедуры и приводит его к месячной частоте"""
+    freq = frequency_determiner.determine(ts.dates)
+
+    df = pandas_adapter.to_dataframe(ts)
+
+    if freq != DataFrequency.month:
+        if freq == DataFrequency.day:
+            if df.shape[0] < 400:
+                raise HTTPException(status_code=400, detail=InvalidFreq().detail)
+            df = df.resample("ME").mean(numeric_only=True)
+        else:
+            raise HTTPException(status_code=400, detail=InvalidFreq().detail)
+    else:
+        if df.shape[0] < 24:
+            raise HTTPException(status_code=400, detail=SmallSizeError().detail)
+    return df
+
+
 class FaoUC:
     def __init__(
             self,
@@ -19,18 +50,53 @@ class FaoUC:
         self._frequency_determiner = frequency_determiner
 
     def execute(self, request: FaoRequest) -> FaoResult:
-        freq = self._frequency_determiner.determine(request.ts.dates)
+        return self._fao_adapter.run(to_monthly(request.ts, self._pandas_adapter, self._frequency_determiner))
+
+
+class FaoBatchUC:
+    """
+    FAO процедура для многих рядов за один запрос.
+
+    Каждый ряд проверяется и приводится к месячной частоте так же, как в FaoUC, а IPA считается
+    одним проходом для всех рядов с одинаковыми датами. Ошибка в одном ряду не прерывает остальные,
+    она возвращается в результате этого ряда.
+
+    Ряды обрабатываются порциями по chunk_size в порядке запроса, и результаты порции отдаются сразу:
+    ответ начинает передаваться до расчета всех рядов, а в памяти одновременно только одна порция.
+    """
+    chunk_size = 256
+
+    def __init__(
+            self,
+            fao_adapter: FaoAdapter,
+            pandas_adapter: PandasTimeseriesAdapter,
+            frequency_determiner: FrequencyDeterminer
+    ):
+        self._fao_adapter = fao_adapter
+        self._pandas_adapter = pandas_adapter
+        self._frequency_determiner = frequency_determiner
+
+    def execute(self, request: FaoBatchRequest) -> Iterator[FaoBatchItem]:
+        for start in range(0, len(request.ts), self.chunk_size):
+            yield from self._execute_chunk(request.ts[start:start + self.chunk_size])
+
+    def _execute_chunk(self, series: list[Timeseries]) -> Iterator[FaoBatchItem]:
+        frames, errors = [], {}
+        for i, ts in enumerate(series):
+            try:
+                frames.append(to_monthly(ts, self._pandas_adapter, self._frequency_determiner))
+            except HTTPException as exc:
+                errors[i] = exc.detail
 
-        df = self._pandas_adapter.to_dataframe(request.ts)
+        results = iter(self._fao_adapter.run_batch(frames))
 
-        if freq != DataFrequency.month:
-            if freq == DataFrequency.day:
-                if df.shape[0] < 400:
-                    raise HTTPException(status_code=400, detail=InvalidFreq().detail)
-                df = df.resample("ME").mean(numeric_only=True)
+        for i, ts in enumerate(series):
+            if i in errors:
+                yield FaoBatchItem(name=ts.name, error=errors[i])
+                continue
+
+            result = next(results)
+            if result is None:
+                yield FaoBatchItem(name=ts.name, error=SmallSizeError().detail)
             else:
-                raise HTTPException(status_code=400, detail=InvalidFreq().detail)
-        else:
-            if df.shape[0] < 24:
-                raise HTTPException(status_code=400, detail=SmallSizeError().detail)
-        return self._fao_adapter.run(df)
+                yield FaoBatchItem(name=ts.name, result=result)
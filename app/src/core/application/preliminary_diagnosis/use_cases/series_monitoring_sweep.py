@@ -0,0 +1,106 @@
+from typing import Iterator, Optional
+
+import pandas as pd
+from pydantic import ValidationError
+
+from src.core.application.preliminary_diagnosis.schemas.break_finder import BreakFinderRequest
+from src.core.application.preliminary_diagnosis.schemas.series_monitoring import (
+    FisherTestRequest,
+    MonitoringSweepRequest,
+    MonitoringSweepRow,
+    MonitoringTest,
+    StudentTestRequest,
+    TwoSigmaTestRequest,
+)
+from src.core.domain import Timeseries
+from src.core.domain.stat_test.student import StudentTestError
+from src.infrastructure.adapters.stat_tests.sweep import MonitoringSweepPool, SweepTask
+from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter
+
+
+class MonitoringSweepUC:
+    """
+    Тесты мониторинга для многих рядов за один запрос.
+
+    Каждая пара (ряд, тест) проверяется так же, как в отдельном эндпоинте теста, и выполняется в пуле процессов.
+    Ошибка в одной паре не прерывает остальные, она возвращается в строке результата этой пары.
+    """
+
+    def __init__(self, ts_adapter: PandasTimeseriesAdapter, sweep_pool: MonitoringSweepPool):
+        self._ts_adapter = ts_adapter
+        self._sweep_pool = sweep_pool
+
+    def execute(self, request: MonitoringSweepRequest) -> Iterator[MonitoringSweepRow]:
+        """Строки в порядке ряд, затем тест, по мере готовности"""
+        tasks, errors = [], []
+        for ts in request.timeseries:
+            series = self._ts_adapter.to_series(ts)
+            for test in request.tests:
+                error = self._validation_error(request, ts, test)
+                errors.append(error)
+                if error is None:
+                    tasks.append(self._make_task(request, ts, series, test))
+
+        results = self._sweep_pool.run(tasks)
+        pairs = ((ts, test) for ts in request.timeseries for test in request.tests)
+
+        for (ts, test), error in zip(pairs, errors):
+            if error is not None:
+                yield MonitoringSweepRow(name=ts.name, test=test, error=error)
+                continue
+
+            result = next(results)
+            yield MonitoringSweepRow(
+                name=ts.name,
+                test=test,
+                datetime=result.datetime,
+                statistic=result.statistic,
+                p_value=result.p_value,
+                ci_lower=result.ci_lower,
+                ci_upper=result.ci_upper,
+                conclusion=result.conclusion,
+                error=result.error,
+            )
+
+    @staticmethod
+    def _validation_error(request: MonitoringSweepRequest, ts: Timeseries, test: MonitoringTest) -> Optional[str]:
+        """Те же проверки, что у запросов отдельных эндпоинтов. None, если ряд подходит для теста"""
+        try:
+            match test:
+                case MonitoringTest.student:
+                    StudentTestRequest(
+                        timeseries=ts, date_boundary=request.date_boundary, equal_var=request.equal_var, alpha=request.alpha
+                    )
+                case MonitoringTest.fisher:
+                    FisherTestRequest(timeseries=ts, date_boundary=request.date_boundary, alpha=request.alpha)
+                case MonitoringTest.two_sigma:
+                    TwoSigmaTestRequest(timeseries=ts, date_boundary=request.date_boundary)
+                case MonitoringTest.break_finder:
+                    BreakFinderRequest(timeseries=ts, **dict(request.break_finder))
+        except ValidationError as exc:
+            return "; ".join(error["msg"] for error in exc.errors())
+        except StudentTestError as exc:
+            # ошибки теста Стьюдента не наследуют ValueError, поэтому pydantic пропускает их как есть
+            return str(exc)
+        return None
+
+    @staticmethod
+    def _make_task(request: MonitoringSweepRequest, ts: Timeseries, series: pd.Series, test: MonitoringTest) -> SweepTask:
+        match test:
+            case MonitoringTest.student:
+                params = {"equal_var": request.equal_var, "alpha": request.alpha}
+            case MonitoringTest.fisher:
+                params = {"alpha": request.alpha}
+            case MonitoringTest.break_finder:
+                params = request.break_finder.model_dump()
+                params["criterion"] = request.break_finder.criterion.value
+            case _:
+                params = {}
+
+        return SweepTask(
+            test=test.value,
+            series=series,
+            frequency=ts.data_frequency,
+            date_boundary=request.date_boundary,
+            params=params,
+        )
@@ -1,5 +1,6 @@
 from src.core.application.preliminary_diagnosis.schemas.statistics import StatisticResult, \
-    StatisticsRequest, StatisticsResponse, RusStatMetricEnum
+    StatisticsRequest, StatisticsResponse, RusStatMetricEnum, \
+    StatisticsTableRequest, StatisticsTableResponse
 from src.core.domain import Timeseries
 from src.infrastructure.adapters.preliminary_diagnosis.statistics import StatisticsAdapter
 
@@ -13,3 +14,5 @@ class StatisticsUC:
     def execute_many(self, request: StatisticsRequest) -> StatisticsResponse:
         return self._statistics_adapter.execute_many(request)
 
+    def execute_table(self, request: StatisticsTableRequest) -> StatisticsTableResponse:
+        return self._statistics_adapter.execute_table(request)
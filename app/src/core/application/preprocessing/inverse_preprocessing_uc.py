@@ -15,10 +15,8 @@ class InversePreprocessUC:
         self._preprocess_factory = preprocess_factory
 
     def execute(self, request: InversePreprocessingRequest) -> Timeseries:
-        x = self._ts_adapter.to_series(request.ts)
-
-        for transformation in reversed(request.transformations):
-            x = self._preprocess_factory.inverse(x, transformation)
+        pipeline = self._preprocess_factory.compile(request.transformations)
+        x = pipeline.inverse(self._ts_adapter.to_series(request.ts))
 
         ts = self._ts_adapter.from_series(x, request.ts.data_frequency)
 
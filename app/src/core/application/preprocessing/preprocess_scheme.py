@@ -173,7 +173,10 @@ class ContextBase(BaseModel):
 
 class DiffContext(ContextBase):
     """Контекст для разностей"""
-    first_values: list[float] = Field(title='Первые periods значений исходного ряда')
+    first_values: list[Optional[float]] = Field(
+        title='Первые periods значений исходного ряда',
+        description='Для отрицательного порядка разности - последние |periods| значений, пропуски - null'
+    )
 
     @model_validator(mode="after")
     def validate_value(self):
@@ -241,7 +244,10 @@ class InverseStandardTransformation(InverseTransformation):
 class InverseDiffTransformation(InverseTransformation):
     type: Literal['diff'] = 'diff'
     diff_order: int
-    first_values: list[float] = Field(title='Изначальное первое значение ряда')
+    first_values: list[Optional[float]] = Field(
+        title='Изначальное первое значение ряда',
+        description='Значения из DiffContext: последние |diff_order| значений для отрицательного порядка, пропуски - null'
+    )
 
 
 InverseLagTransformation = LagTransformation
@@ -1,7 +1,6 @@
 from src.core.application.preprocessing.preprocess_scheme import (
     PreprocessingRequest,
     PreprocessingResponse,
-    PreprocessContext
 )
 from src.infrastructure.factories.preprocessing import PreprocessFactory
 from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter
@@ -17,15 +16,8 @@ class PreprocessUC:
         self._preprocess_factory = preprocess_factory
 
     def execute(self, request: PreprocessingRequest) -> PreprocessingResponse:
-        x = self._ts_adapter.to_series(request.ts)
-        contexts: list[PreprocessContext] = list()
-
-        for step, transformation in enumerate(request.transformations):
-            x, context = self._preprocess_factory.apply(x, transformation)
-
-            if context is not None:
-                context.step = step + 1
-                contexts.append(context)
+        pipeline = self._preprocess_factory.compile(request.transformations)
+        x, contexts = pipeline.apply(self._ts_adapter.to_series(request.ts))
 
         # Уберем пропуски с краев
         if (first_valid_index := x.first_valid_index()) is not None:
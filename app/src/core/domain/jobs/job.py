@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    queued = 'queued'  # ждет свободного воркера
+    running = 'running'
+    done = 'done'  # результат можно забирать
+    failed = 'failed'
+    cancelled = 'cancelled'
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (JobStatus.done, JobStatus.failed, JobStatus.cancelled)
+
+
+class JobInfo(BaseModel):
+    job_id: str = Field(title='Идентификатор задачи')
+    kind: str = Field(title='Тип задачи', examples=['building_model/nhits/fit'])
+    status: JobStatus = Field(default=JobStatus.queued, title='Статус задачи')
+    progress: float = Field(default=0, ge=0, le=1, title='Доля выполненной работы')
+    cancel_requested: bool = Field(default=False, title='Запрошена отмена задачи')
+
+    created_at: datetime = Field(title='Время постановки в очередь')
+    started_at: Optional[datetime] = Field(default=None, title='Время начала выполнения')
+    finished_at: Optional[datetime] = Field(default=None, title='Время завершения')
+    heartbeat_at: Optional[datetime] = Field(
+        default=None, title='Последний сигнал процесса, который выполняет задачу или держит ее в очереди'
+    )
+
+    error: Optional[Any] = Field(default=None, title='Описание ошибки, если задача упала')
+    error_status_code: Optional[int] = Field(default=None, title='HTTP-код ошибки, как у синхронного эндпоинта')
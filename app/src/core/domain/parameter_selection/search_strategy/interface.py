@@ -0,0 +1,68 @@
+import abc
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Callable, Optional, TypeAlias
+
+
+# (p, q, P, D, Q) - перебираемые порядки SARIMAX, d и m фиксированы на весь перебор
+Order: TypeAlias = tuple[int, int, int, int, int]
+
+
+@dataclass(frozen=True)
+class OrderBounds:
+    max_p: int
+    max_q: int
+    max_P: int
+    max_D: int
+    max_Q: int
+
+    @property
+    def upper(self) -> Order:
+        return self.max_p, self.max_q, self.max_P, self.max_D, self.max_Q
+
+    def contains(self, order: Order) -> bool:
+        return all(0 <= value <= bound for value, bound in zip(order, self.upper))
+
+    def grid(self) -> list[Order]:
+        # тот же порядок обхода, что и у np.meshgrid(...).T.reshape(-1, 5) в гридсерче:
+        # быстрее всего меняется q, затем p, P, D и медленнее всего Q
+        return [
+            (p, q, P, D, Q)
+            for Q, D, P, p, q in product(
+                range(self.max_Q + 1),
+                range(self.max_D + 1),
+                range(self.max_P + 1),
+                range(self.max_p + 1),
+                range(self.max_q + 1),
+            )
+        ]
+
+
+@dataclass
+class ScoreTask:
+    order: Order
+    # ограничение на число итераций оптимизатора
+    maxiter: int
+    # параметры, с которых продолжать оптимизацию (теплый старт)
+    start_params: Optional[list[float]] = None
+
+
+@dataclass
+class ScoreResult:
+    order: Order
+    score: float
+    # оцененные параметры, чтобы продолжить оптимизацию с них на следующем шаге
+    fitted_params: Optional[list[float]] = field(default=None, repr=False)
+
+
+# считает скоры пачки задач, порядок результатов совпадает с порядком задач.
+# Может считать последовательно или параллельно - стратегии это не важно
+ScoreFn: TypeAlias = Callable[[list[ScoreTask]], list[ScoreResult]]
+
+
+class SarimaxSearchStrategy(abc.ABC):
+    """Стратегия перебора порядков SARIMAX по информационному критерию"""
+
+    @abc.abstractmethod
+    def search(self, score: ScoreFn, bounds: OrderBounds, maxiter: int) -> ScoreResult:
+        ...
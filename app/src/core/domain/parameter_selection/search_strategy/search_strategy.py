@@ -0,0 +1,13 @@
+"""
+Какие стратегии перебора параметров реализованы в фабрике
+"""
+from enum import Enum
+
+
+class SearchStrategy(str, Enum):
+    # полный перебор сетки, каждая модель обучается до сходимости
+    grid: str = 'grid'
+    # пошаговый поиск Хайндмана-Хандакара: двигаемся к лучшему соседу, пока он улучшает скор
+    stepwise: str = 'stepwise'
+    # последовательное деление пополам по числу итераций оптимизатора
+    successive_halving: str = 'successive_halving'
@@ -1,7 +1,13 @@
 import abc
+from typing import Iterator
 
 
 class ModelArchiver(abc.ABC):
     @abc.abstractmethod
     def execute(self, data_dict: dict, model_bytes: bytes) -> bytes:
-        ...
\ No newline at end of file
+        ...
+
+    @abc.abstractmethod
+    def stream(self, data_dict: dict, model_bytes: bytes) -> Iterator[bytes]:
+        """Тот же архив, что execute, по частям по мере записи"""
+        ...
@@ -1,21 +1,106 @@
 import json
 import zipfile
-from io import BytesIO
+from typing import Iterator
 
 from .interface import ModelArchiver
 
 
+class _ChunkSink:
+    """Файл только для записи: zipfile пишет в него, а архиватор забирает накопленные байты"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
 class ZipArchiver(ModelArchiver):
+    """
+    ZIP-архив с fit_results.json и model.pickle, который отдается по частям по мере записи.
+
+    Архив не собирается в памяти целиком: JSON кодируется частями, а модель пишется кусками по chunk_size.
+    В памяти остается не больше одного куска сжатых данных.
+    Сжатие задается отдельно для JSON и для модели: файл модели обычно уже сжат или состоит из весов float32,
+    которые DEFLATE почти не уменьшает, поэтому по умолчанию он хранится без сжатия.
+    """
+
+    # сколько верхних уровней JSON кодируется по частям, см. _iterencode
+    _json_stream_depth = 3
+
+    def __init__(
+            self,
+            json_compresslevel: int = 1,
+            model_compression: int = zipfile.ZIP_STORED,
+            model_compresslevel: int | None = None,
+            chunk_size: int = 1024 * 1024,
+    ):
+        self._json_compresslevel = json_compresslevel
+        self._model_compression = model_compression
+        self._model_compresslevel = model_compresslevel
+        self._chunk_size = chunk_size
+        self._encoder = json.JSONEncoder(default=str, ensure_ascii=False, separators=(',', ':'))
+
     def execute(self, data_dict: dict, model_bytes: bytes) -> bytes:
         """Создает ZIP-архив, содержащий JSON-файл с данными и .pickle файл с моделью."""
+        return b''.join(self.stream(data_dict, model_bytes))
+
+    def stream(self, data_dict: dict, model_bytes: bytes) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        # в поток без seek zipfile пишет размеры после данных (data descriptor)
+        with zipfile.ZipFile(sink, 'w') as zipf:
+            with self._open(zipf, 'fit_results.json', zipfile.ZIP_DEFLATED, self._json_compresslevel) as entry:
+                for part in self._iterencode(data_dict, depth=self._json_stream_depth):
+                    entry.write(part.encode('utf-8'))
+                    if sink.size >= self._chunk_size:
+                        yield sink.drain()
 
-        archive_buffer = BytesIO()
+            model = memoryview(model_bytes)
+            with self._open(
+                    zipf, 'model.pickle', self._model_compression, self._model_compresslevel, size=len(model)
+            ) as entry:
+                for start in range(0, len(model), self._chunk_size):
+                    entry.write(model[start:start + self._chunk_size])
+                    if sink.size >= self._chunk_size:
+                        yield sink.drain()
 
-        with zipfile.ZipFile(archive_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            json_data = json.dumps(data_dict, default=str, ensure_ascii=False, indent=4).encode('utf-8')
-            zipf.writestr('fit_results.json', json_data)
-            zipf.writestr('model.pickle', model_bytes)
+        yield sink.drain()
 
-        archive_buffer.seek(0)
+    def _iterencode(self, value, depth: int) -> Iterator[str]:
+        """
+        JSON по частям. json.JSONEncoder.iterencode работает без C-ускорения и в разы медленнее encode,
+        поэтому по частям отдаются только верхние depth уровней словарей и списков (окна прогнозов),
+        а их элементы кодируются целиком.
+        """
+        if depth == 0 or not isinstance(value, (dict, list)) or not value:
+            yield self._encoder.encode(value)
+        elif isinstance(value, dict):
+            for i, (key, item) in enumerate(value.items()):
+                yield ('{' if i == 0 else ',') + self._encoder.encode(str(key)) + ':'
+                yield from self._iterencode(item, depth - 1)
+            yield '}'
+        else:
+            for i, item in enumerate(value):
+                yield '[' if i == 0 else ','
+                yield from self._iterencode(item, depth - 1)
+            yield ']'
 
-        return archive_buffer.getvalue()
+    @staticmethod
+    def _open(zipf: zipfile.ZipFile, name: str, compression: int, compresslevel: int | None, size: int | None = None):
+        # запись, открытая по имени, берет сжатие из настроек архива
+        zipf.compression = compression
+        zipf.compresslevel = compresslevel
+        # размер заранее известен только у модели: для нее ZIP64 включается, если он нужен
+        return zipf.open(name, 'w', force_zip64=size is not None and size > zipfile.ZIP64_LIMIT)
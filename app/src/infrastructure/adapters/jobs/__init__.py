@@ -0,0 +1,4 @@
+from .context import checkpoint
+from .errors import JobNotFoundError, JobQueueFullError, JobNotFinishedError, JobFailedError, JobCancelledError
+from .manager import JobManager
+from .store import FileJobStore
@@ -0,0 +1,18 @@
+import pytorch_lightning as pl
+
+from src.infrastructure.adapters.jobs.context import checkpoint
+
+
+class JobProgressCallback(pl.Callback):
+    """
+    Сообщает прогресс обучения нейросети в фоновую задачу и прерывает обучение при отмене задачи.
+
+    Обучение занимает основную часть времени задачи, поэтому ему отведено 90% прогресса.
+    """
+    train_share = 0.9
+
+    def on_train_batch_end(self, trainer: pl.Trainer, pl_module, outputs, batch, batch_idx) -> None:
+        if trainer.max_steps > 0:
+            checkpoint(progress=self.train_share * trainer.global_step / trainer.max_steps)
+        else:
+            checkpoint()
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from src.infrastructure.adapters.jobs.errors import JobCancelledError
+from src.infrastructure.adapters.jobs.store import FileJobStore
+
+
+@dataclass
+class JobContext:
+    job_id: str
+    store: FileJobStore
+    # последнее записанное значение прогресса, чтобы не писать статус на каждом шаге обучения
+    reported_progress: float = field(default=0.0)
+
+
+_current_job: ContextVar[Optional[JobContext]] = ContextVar('current_job', default=None)
+
+
+def checkpoint(progress: Optional[float] = None) -> None:
+    """
+    Точка, в которой выполняемая задача может сообщить прогресс и быть отменена.
+
+    Вне фоновой задачи ничего не делает, поэтому ее можно вызывать из кода,
+    который работает и в синхронных эндпоинтах.
+    """
+    context = _current_job.get()
+    if context is None:
+        return
+
+    if context.store.is_cancel_requested(context.job_id):
+        raise JobCancelledError()
+
+    if progress is not None and progress - context.reported_progress >= 0.01:
+        info = context.store.load(context.job_id)
+        info.progress = min(progress, 1.0)
+        context.store.save(info)
+        context.reported_progress = progress
+
+
+@contextmanager
+def job_context(job_id: str, store: FileJobStore) -> Iterator[JobContext]:
+    """Делает задачу текущей для checkpoint в пределах блока"""
+    context = JobContext(job_id=job_id, store=store)
+    token = _current_job.set(context)
+    try:
+        yield context
+    finally:
+        _current_job.reset(token)
@@ -0,0 +1,38 @@
+class JobNotFoundError(Exception):
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def __str__(self):
+        return f'Задача {self.job_id} не найдена или ее результат уже удален'
+
+
+class JobQueueFullError(Exception):
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+
+    def __str__(self):
+        return f'Очередь задач заполнена ({self.max_queue} задач), повторите запрос позже'
+
+
+class JobNotFinishedError(Exception):
+    def __init__(self, job_id: str, status: str):
+        self.job_id = job_id
+        self.status = status
+
+    def __str__(self):
+        return f'Задача {self.job_id} еще не завершена успешно, текущий статус: {self.status}'
+
+
+class JobFailedError(Exception):
+    def __init__(self, job_id: str, error, status_code: int):
+        self.job_id = job_id
+        self.error = error
+        self.status_code = status_code
+
+    def __str__(self):
+        return f'Задача {self.job_id} завершилась ошибкой: {self.error}'
+
+
+class JobCancelledError(Exception):
+    def __str__(self):
+        return 'Задача отменена'
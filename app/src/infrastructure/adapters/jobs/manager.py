@@ -0,0 +1,168 @@
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable
+
+from fastapi import HTTPException
+
+from src.core.domain.jobs import JobInfo, JobStatus
+from src.infrastructure.adapters.jobs.context import job_context
+from src.infrastructure.adapters.jobs.errors import (
+    JobCancelledError,
+    JobFailedError,
+    JobNotFinishedError,
+    JobNotFoundError,
+    JobQueueFullError,
+)
+from src.infrastructure.adapters.jobs.store import FileJobStore
+from src.infrastructure.logs import logger
+
+
+class JobManager:
+    """
+    Выполняет тяжелые задачи (обучение моделей, автоподбор) в ограниченном пуле потоков.
+
+    Эндпоинт ставит задачу и сразу отвечает ее идентификатором, поэтому воркер uvicorn не блокируется
+    на время обучения, а легкие эндпоинты не ждут в очереди за тяжелыми. Число одновременно выполняемых
+    задач и длина очереди ограничены на процесс приложения.
+
+    Отмена кооперативная: поставленная в очередь задача снимается сразу, выполняющаяся прерывается
+    в ближайшей точке checkpoint.
+
+    Пока задача в очереди или выполняется, отдельный поток раз в heartbeat_interval сообщает, что ее процесс жив.
+    Задачи, от которых сигнала нет дольше stale_after, при старте менеджера и при очистке помечаются упавшими.
+    """
+
+    def __init__(
+        self,
+        store: FileJobStore,
+        max_workers: int,
+        max_queue: int,
+        result_ttl: timedelta,
+        heartbeat_interval: timedelta = timedelta(seconds=10),
+        stale_after: timedelta = timedelta(minutes=1),
+    ):
+        self._store = store
+        self._max_queue = max_queue
+        self._result_ttl = result_ttl
+        self._heartbeat_interval = heartbeat_interval
+        self._stale_after = stale_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._log = logger.getChild(self.__class__.__name__)
+
+        # задачи, оставшиеся от упавших процессов
+        self._store.cleanup(self._result_ttl, self._stale_after)
+
+        self._stopped = threading.Event()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True)
+        self._heartbeat_thread.start()
+
+    def submit(self, kind: str, fn: Callable[[], bytes]) -> JobInfo:
+        self._store.cleanup(self._result_ttl, self._stale_after)
+
+        info = JobInfo(job_id=uuid.uuid4().hex, kind=kind, created_at=datetime.now())
+        with self._lock:
+            self._futures = {job_id: f for job_id, f in self._futures.items() if not f.done()}
+            if len(self._futures) >= self._max_queue:
+                raise JobQueueFullError(self._max_queue)
+
+            self._store.save(info)
+            self._store.heartbeat(info.job_id)
+            self._futures[info.job_id] = self._executor.submit(self._run, info.job_id, fn)
+
+        self._log.info(msg=f'Задача {info.job_id} ({kind}) поставлена в очередь')
+        return info
+
+    def get(self, job_id: str) -> JobInfo:
+        info = self._store.load(job_id)
+        if info is None:
+            raise JobNotFoundError(job_id)
+        return info
+
+    def result(self, job_id: str) -> bytes:
+        info = self.get(job_id)
+        if info.status == JobStatus.failed:
+            raise JobFailedError(job_id, info.error, info.error_status_code)
+        if info.status != JobStatus.done:
+            raise JobNotFinishedError(job_id, info.status.value)
+
+        result = self._store.load_result(job_id)
+        if result is None:
+            raise JobNotFoundError(job_id)
+        return result
+
+    def cancel(self, job_id: str) -> JobInfo:
+        info = self.get(job_id)
+        if info.status.is_finished:
+            return info
+
+        self._store.request_cancel(job_id)
+        with self._lock:
+            future = self._futures.get(job_id)
+        # задача этого процесса, которая еще не начала выполняться, снимается сразу.
+        # Задачи других процессов увидят запрос на отмену в checkpoint или при старте
+        if future is not None and future.cancel():
+            self._finish(info, JobStatus.cancelled)
+
+        return self.get(job_id)
+
+    def shutdown(self) -> None:
+        self._log.info(msg='Останавливаем пул фоновых задач')
+        self._stopped.set()
+        self._heartbeat_thread.join()
+        with self._lock:
+            futures = dict(self._futures)
+        # выполняющиеся задачи прервутся в ближайшем checkpoint, ждущие в очереди не начнутся
+        for job_id in futures:
+            self._store.request_cancel(job_id)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        for job_id, future in futures.items():
+            info = self._store.load(job_id)
+            if future.cancelled() and info is not None and not info.status.is_finished:
+                self._finish(info, JobStatus.cancelled)
+
+    def _heartbeat(self) -> None:
+        while not self._stopped.wait(self._heartbeat_interval.total_seconds()):
+            with self._lock:
+                job_ids = [job_id for job_id, future in self._futures.items() if not future.done()]
+            for job_id in job_ids:
+                self._store.heartbeat(job_id)
+
+    def _run(self, job_id: str, fn: Callable[[], bytes]) -> None:
+        info = self._store.load(job_id)
+        if info.cancel_requested:
+            self._finish(info, JobStatus.cancelled)
+            return
+
+        info.status = JobStatus.running
+        info.started_at = datetime.now()
+        self._store.save(info)
+
+        try:
+            with job_context(job_id, self._store):
+                result = fn()
+        except JobCancelledError:
+            self._log.info(msg=f'Задача {job_id} отменена')
+            self._finish(self._store.load(job_id), JobStatus.cancelled)
+        except HTTPException as exc:
+            self._finish(self._store.load(job_id), JobStatus.failed, error=exc.detail, status_code=exc.status_code)
+        except Exception as exc:
+            self._log.exception(msg=f'Задача {job_id} упала')
+            self._finish(self._store.load(job_id), JobStatus.failed, error=str(exc), status_code=500)
+        else:
+            self._store.save_result(job_id, result)
+            info = self._store.load(job_id)
+            info.progress = 1.0
+            self._finish(info, JobStatus.done)
+
+    def _finish(self, info: JobInfo, status: JobStatus, error=None, status_code=None) -> None:
+        info.status = status
+        info.finished_at = datetime.now()
+        info.error = error
+        info.error_status_code = status_code
+        self._store.save(info)
+        self._log.info(msg=f'Задача {info.job_id} завершена со статусом {status.value}')
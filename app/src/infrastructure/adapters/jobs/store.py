@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from src.core.domain.jobs import JobInfo, JobStatus
+
+
+class FileJobStore:
+    """
+    Хранилище задач на диске.
+
+    Приложение работает в нескольких процессах uvicorn, и запрос статуса может прийти не в тот процесс,
+    который выполняет задачу. Поэтому статус, результат и запрос на отмену лежат в общем каталоге:
+    <root>/<job_id>/status.json, result.bin и cancel.
+
+    Процесс-владелец задачи периодически обновляет время изменения файла heartbeat. Сигнал лежит
+    отдельно от status.json, чтобы не перезаписывать статус, который в это же время меняет сама задача.
+    """
+
+    def __init__(self, root: str):
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, job_id: str) -> Path:
+        # job_id приходит из URL, не даем выйти за пределы каталога
+        if not job_id.isalnum():
+            raise ValueError(f'Некорректный идентификатор задачи: {job_id}')
+        return self._root / job_id
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        # читатели из других процессов не должны увидеть недописанный файл
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def save(self, info: JobInfo) -> None:
+        job_dir = self._dir(info.job_id)
+        job_dir.mkdir(exist_ok=True)
+        self._write_atomic(job_dir / 'status.json', info.model_dump_json().encode())
+
+    def load(self, job_id: str) -> Optional[JobInfo]:
+        try:
+            job_dir = self._dir(job_id)
+            data = (job_dir / 'status.json').read_bytes()
+        except (ValueError, FileNotFoundError):
+            return None
+        info = JobInfo.model_validate_json(data)
+        info.cancel_requested = self.is_cancel_requested(job_id)
+        info.heartbeat_at = self._heartbeat_at(job_id)
+        return info
+
+    def save_result(self, job_id: str, result: bytes) -> None:
+        self._write_atomic(self._dir(job_id) / 'result.bin', result)
+
+    def load_result(self, job_id: str) -> Optional[bytes]:
+        try:
+            return (self._dir(job_id) / 'result.bin').read_bytes()
+        except (ValueError, FileNotFoundError):
+            return None
+
+    def request_cancel(self, job_id: str) -> None:
+        (self._dir(job_id) / 'cancel').touch()
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return (self._dir(job_id) / 'cancel').exists()
+
+    def heartbeat(self, job_id: str) -> None:
+        try:
+            (self._dir(job_id) / 'heartbeat').touch()
+        except FileNotFoundError:
+            # задачу уже удалили
+            pass
+
+    def _heartbeat_at(self, job_id: str) -> Optional[datetime]:
+        try:
+            return datetime.fromtimestamp((self._dir(job_id) / 'heartbeat').stat().st_mtime)
+        except FileNotFoundError:
+            return None
+
+    def cleanup(self, ttl: timedelta, stale_after: timedelta) -> None:
+        """
+        Удаляет задачи, завершившиеся раньше чем ttl назад.
+        Незавершенные задачи без сигнала от владельца дольше stale_after (процесс упал или был убит)
+        помечает упавшими, иначе они навсегда остались бы в статусе queued или running.
+        """
+        now = datetime.now()
+        for job_dir in self._root.iterdir():
+            info = self.load(job_dir.name)
+            if info is None:
+                continue
+
+            if info.finished_at is not None and info.finished_at < now - ttl:
+                shutil.rmtree(job_dir, ignore_errors=True)
+            elif not info.status.is_finished and (info.heartbeat_at or info.created_at) < now - stale_after:
+                info.status = JobStatus.failed
+                info.finished_at = now
+                info.error = 'Процесс, который выполнял задачу, остановился'
+                info.error_status_code = 500
+                self.save(info)
@@ -1,14 +1,19 @@
-import numpy as np
 import pandas as pd
 from typing import Optional
-from statsmodels.tsa.statespace.sarimax import SARIMAX
 
 from src.core.application.building_model.schemas.arimax import ArimaxParams
 from src.core.domain.parameter_selection.gridsearch_result.arimax import ArimaxGridsearchResult
 from src.core.domain.parameter_selection.scoring.information_criteria import InformationCriteriaScoring
+from src.core.domain.parameter_selection.search_strategy.interface import ScoreTask, ScoreResult
+from src.core.domain.parameter_selection.search_strategy.search_strategy import SearchStrategy
+from src.infrastructure.adapters.model_parameters_selection.sarimax_scoring import order_bounds, score_sarimax
+from src.infrastructure.factories.search_strategy import SearchStrategyFactory
 
 
 class ArimaGridsearch:
+    # ограничение итераций на одну модель (значение по умолчанию в statsmodels для lbfgs)
+    maxiter = 50
+
     def fit(
             self,
             endog: pd.Series,
@@ -22,61 +27,32 @@ class ArimaGridsearch:
             m: int = 12,     # длина сезонного периода. Сложно перебирать поэтому вводится
             # информационный критерий, по которому оптимизируется модель
             scoring: InformationCriteriaScoring = InformationCriteriaScoring.aic,
+            # как перебирать параметры: полный перебор или с ранним отсевом
+            search_strategy: SearchStrategy = SearchStrategy.grid,
     ) -> ArimaxGridsearchResult:
         self.endog = endog
         self.exog = exog
         self.scoring = scoring
+        self.d = d
+        self.m = m
+
+        strategy = SearchStrategyFactory.create(search_strategy)
+        best_result = strategy.search(
+            score=self._score,
+            bounds=order_bounds(max_p, max_q, max_P, max_D, max_Q, m),
+            maxiter=self.maxiter,
+        )
 
-        p_range = np.arange(0, max_p + 1)
-        q_range = np.arange(0, max_q + 1)
-        P_range = np.arange(0, max_P + 1)
-        D_range = np.arange(0, max_D + 1)
-        Q_range = np.arange(0, max_Q + 1)
-
-        # Аналог itertools.product из numpy
-        # Подробнее: https://stackoverflow.com/questions/4709510/itertools-product-speed-up
-        #
-        # Важная справочка: 5 - количество перебираемых параметров
-        grid = (np.array(
-                    np.meshgrid(p_range, q_range, P_range, D_range, Q_range))
-                .T.reshape(-1, 5))
-
-        scores = []
-        for p_, q_, P_, D_, Q_ in grid:
-            try:
-                scores.append(self._score(p_, d, q_, P_, D_, Q_, m))
-            except:
-                scores.append(float('inf'))
-
-        results = np.array(scores)
-
-        print(f'{results = }')
-
-        best_scoring = np.min(results)
-        best_combination_idx = np.argmin(results)
-
-        p, q, P, D, Q = grid[best_combination_idx]
+        p, q, P, D, Q = best_result.order
 
         return ArimaxGridsearchResult(
             optimal_params=ArimaxParams(p=p, d=d, q=q, P=P, D=D, Q=Q, m=m),
-            information_criteria_value=best_scoring,
+            information_criteria_value=best_result.score,
             short_representation=f'SARIMAX({p},{d},{q})({P},{D},{Q})[{m}]'
         )
 
-    def _score(self, p, d, q, P, D, Q, m):
-        result = SARIMAX(
-                self.endog,
-                exog=self.exog,
-                order=(p, d, q),
-                seasonal_order=(P, D, Q, m),
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            ).fit(
-            disp=False,      # не выводим в консоль логи
-            method='lbfgs',  # самый быстрый численный метод оценки OLS
-        )
-
-        if self.scoring.value == InformationCriteriaScoring.aic:
-            return result.aic
-        elif self.scoring.value == InformationCriteriaScoring.bic:
-            return result.bic
+    def _score(self, tasks: list[ScoreTask]) -> list[ScoreResult]:
+        return [
+            score_sarimax(task, self.d, self.m, self.endog, self.exog, self.scoring)
+            for task in tasks
+        ]
@@ -1,24 +1,30 @@
-import numpy as np
 import pandas as pd
 from typing import Optional
-from multiprocessing import Pool
-from statsmodels.tsa.statespace.sarimax import SARIMAX
 
 from src.core.application.building_model.schemas.arimax import ArimaxParams
 from src.core.domain.parameter_selection.gridsearch_result.arimax import ArimaxGridsearchResult, SARIMAXGridsearchUnit
 from src.core.domain.parameter_selection.scoring.information_criteria import InformationCriteriaScoring
-from config import Config
+from src.core.domain.parameter_selection.search_strategy.search_strategy import SearchStrategy
+from src.infrastructure.adapters.model_parameters_selection.arima_gridsearch import ArimaGridsearch
+from src.infrastructure.adapters.model_parameters_selection.sarimax_scoring import order_bounds
+from src.infrastructure.adapters.model_parameters_selection.worker_pool import ParameterSelectionPool
+from src.infrastructure.factories.search_strategy import SearchStrategyFactory
 from src.infrastructure.logs import logger
 
 
 class ParallelArimaGridsearch:
     """
-    Параллельный гридсерч для SARIMAX с использованием multiprocessing.
+    Параллельный гридсерч для SARIMAX на общем пуле процессов приложения.
 
-    Распределяет вычисление скоров по N процессам для каждой комбинации параметров.
+    Распределяет вычисление скоров по процессам пула для каждой комбинации параметров.
+    Какие комбинации и с каким бюджетом итераций обучать, решает стратегия перебора.
     """
+    # тот же бюджет итераций, что у ArimaGridsearch (значение по умолчанию в statsmodels для lbfgs),
+    # чтобы AutoARIMA на пуле выбирала ту же модель, что и последовательный перебор
+    maxiter = ArimaGridsearch.maxiter
 
-    def __init__(self):
+    def __init__(self, pool: ParameterSelectionPool):
+        self._pool = pool
         self.endog: Optional[pd.Series] = None
         self.exog: Optional[pd.DataFrame] = None
         self.scoring: InformationCriteriaScoring = InformationCriteriaScoring.aic
@@ -36,98 +42,37 @@ class ParallelArimaGridsearch:
             max_Q: int = 3,
             m: int = 12,
             scoring: InformationCriteriaScoring = InformationCriteriaScoring.aic,
+            search_strategy: SearchStrategy = SearchStrategy.grid,
     ) -> ArimaxGridsearchResult:
         self.endog = endog
         self.exog = exog
         self.scoring = scoring
 
-        n_jobs = Config.PARAMETER_SELECTION_N_JOBS
-        self._log.info(msg=f'Генерируем сетку параметров:\n'
-                            f'{max_p=} {max_q=} {max_P=} {max_D=} {max_Q=}')
-        p_range = np.arange(0, max_p + 1)
-        q_range = np.arange(0, max_q + 1)
-        P_range = np.arange(0, max_P + 1)
-        D_range = np.arange(0, max_D + 1)
-        Q_range = np.arange(0, max_Q + 1)
+        bounds = order_bounds(max_p, max_q, max_P, max_D, max_Q, m)
+        self._log.info(msg=f'Границы перебора: {bounds}, стратегия: {search_strategy.value}')
+        strategy = SearchStrategyFactory.create(search_strategy)
 
-        grid = (np.array(
-            np.meshgrid(p_range, q_range, P_range, D_range, Q_range))
-                .T.reshape(-1, 5))
-        self._log.info(msg=f'Создали сетку: {grid}')
-
-        task_args = [
-            (p_, d, q_, P_, D_, Q_, m, endog, exog, scoring)
-            for p_, q_, P_, D_, Q_ in grid
-        ]
-
-        self._log.info(msg=f'Начинаем выполнять параллельный расчёт скоров. {n_jobs=}')
-        with Pool(processes=n_jobs) as pool:
-            results = pool.starmap(self._score_static, task_args)
+        self._log.info(msg=f'Начинаем выполнять параллельный расчёт скоров. n_jobs={self._pool.n_jobs}')
+        with self._pool.share(endog, exog) as series:
+            best_result = strategy.search(
+                score=self._pool.scorer(series, d=d, m=m, scoring=scoring),
+                bounds=bounds,
+                maxiter=self.maxiter
+            )
+        self._log.info(msg=f'Лучшая модель: order={best_result.order}, {best_result.score=}')
 
-        best_result: SARIMAXGridsearchUnit = min(results, key=lambda r: r.score)
+        p, q, P, D, Q = best_result.order
+        best_unit = SARIMAXGridsearchUnit(
+            params=ArimaxParams(p=p, d=d, q=q, P=P, D=D, Q=Q, m=m),
+            score=best_result.score
+        )
 
         return ArimaxGridsearchResult(
-            optimal_params=best_result.params,
-            information_criteria_value=best_result.score,
-            short_representation=self._short_representation(best_result)
+            optimal_params=best_unit.params,
+            information_criteria_value=best_unit.score,
+            short_representation=self._short_representation(best_unit)
         )
 
     def _short_representation(self, best_result: SARIMAXGridsearchUnit) -> str:
         return (f'SARIMAX({best_result.params.p},{best_result.params.d},{best_result.params.q})'
                 f'({best_result.params.P},{best_result.params.D},{best_result.params.Q})[{best_result.params.m}]')
-
-    def _score_static(
-            self,
-            p: int,
-            d: int,
-            q: int,
-            P: int,
-            D: int,
-            Q: int,
-            m: int,
-            endog: pd.Series,
-            exog: Optional[pd.DataFrame],
-            scoring: InformationCriteriaScoring,
-    ) -> Optional[float]:
-        try:
-            task_id = hash((p, d, q, P, D, Q, m))
-            self._log.info(msg=f'Создаем модель {task_id=}:\n'
-                                f'order={(p, d, q)}, seasonal_order={(P, D, Q, m)}')
-            model = SARIMAX(
-                endog,
-                exog=exog,
-                order=(p, d, q),
-                seasonal_order=(P, D, Q, m),
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            self._log.info(msg=f'Обучаем модель {task_id=}...')
-            result = model.fit(
-                disp=False,
-                method='lbfgs',
-                maxiter=200,  # Ограничиваем итерации для ускорения
-            )
-
-            if scoring == InformationCriteriaScoring.aic:
-                score = result.aic
-            else:
-                score = result.bic
-
-            self._log.info(msg=f'Результат модели {task_id=}: {score=}')
-            return SARIMAXGridsearchUnit(
-                params=ArimaxParams(
-                    p=p, d=d, q=q,
-                    P=P, D=D, Q=Q, m=m
-                ),
-                score=score
-            )
-
-        except Exception as exc:
-            self._log.info(msg=f'Не удалось обучить модель {task_id=}: {exc=}')
-            return SARIMAXGridsearchUnit(
-                params=ArimaxParams(
-                    p=p, d=d, q=q,
-                    P=P, D=D, Q=Q, m=m
-                ),
-                score=float('inf')  # чтобы не влиял на поиск минимума
-            )
@@ -0,0 +1,59 @@
+import math
+import warnings
+from typing import Optional
+
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from src.core.domain.parameter_selection.search_strategy.interface import ScoreTask, ScoreResult, OrderBounds
+from src.core.domain.parameter_selection.scoring.information_criteria import InformationCriteriaScoring
+
+
+def order_bounds(max_p: int, max_q: int, max_P: int, max_D: int, max_Q: int, m: int) -> OrderBounds:
+    # без сезонности SARIMAX не принимает ненулевые сезонные порядки, их нет смысла перебирать
+    if m <= 1:
+        max_P = max_D = max_Q = 0
+    return OrderBounds(max_p=max_p, max_q=max_q, max_P=max_P, max_D=max_D, max_Q=max_Q)
+
+
+def score_sarimax(
+        task: ScoreTask,
+        d: int,
+        m: int,
+        endog: pd.Series,
+        exog: Optional[pd.DataFrame],
+        scoring: InformationCriteriaScoring,
+) -> ScoreResult:
+    """
+    Обучает SARIMAX с ограничением на число итераций и возвращает значение информационного критерия.
+
+    Функция на уровне модуля, чтобы ее можно было отправлять в процессы пула.
+    Если модель не удалось обучить, скор равен inf, чтобы она не влияла на поиск минимума.
+    """
+    p, q, P, D, Q = task.order
+    try:
+        with warnings.catch_warnings():
+            # на маленьком бюджете итераций оптимизатор ожидаемо не сходится
+            warnings.simplefilter('ignore')
+            result = SARIMAX(
+                endog,
+                exog=exog,
+                order=(p, d, q),
+                seasonal_order=(P, D, Q, m),
+                enforce_stationarity=False,
+                enforce_invertibility=False
+            ).fit(
+                start_params=task.start_params,
+                disp=False,
+                method='lbfgs',
+                maxiter=task.maxiter,
+                cov_type='none',  # для скоринга ковариация параметров не нужна
+            )
+    except Exception:
+        return ScoreResult(order=task.order, score=float('inf'))
+
+    score = result.aic if scoring == InformationCriteriaScoring.aic else result.bic
+    if not math.isfinite(score):
+        score = float('inf')
+
+    return ScoreResult(order=task.order, score=score, fitted_params=list(result.params))
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.domain.parameter_selection.scoring.information_criteria import InformationCriteriaScoring
+from src.core.domain.parameter_selection.search_strategy.interface import ScoreTask, ScoreResult
+from src.infrastructure.adapters.jobs import checkpoint, JobCancelledError
+from src.infrastructure.adapters.model_parameters_selection.sarimax_scoring import score_sarimax
+from src.infrastructure.logs import logger
+
+
+@dataclass(frozen=True)
+class SharedSeries:
+    """
+    Описание endog и exog, лежащих в разделяемой памяти.
+
+    В процессы отправляется только это описание, сами данные воркер берет из разделяемой памяти
+    без копирования. Столбец 0 - endog, остальные - exog.
+    """
+    name: str
+    shape: tuple[int, int]
+    has_exog: bool
+
+
+# Сколько наборов данных держит подключенными каждый воркер.
+# Несколько, потому что запросы обрабатываются параллельно и их задачи перемешиваются в пуле
+_ATTACHED_LIMIT = 8
+_attached: OrderedDict[str, tuple[shared_memory.SharedMemory, np.ndarray]] = OrderedDict()
+
+
+def _attach(series: SharedSeries) -> np.ndarray:
+    if series.name in _attached:
+        _attached.move_to_end(series.name)
+        return _attached[series.name][1]
+
+    shm = shared_memory.SharedMemory(name=series.name)
+    _attached[series.name] = (shm, np.ndarray(series.shape, dtype=np.float64, buffer=shm.buf))
+
+    while len(_attached) > _ATTACHED_LIMIT:
+        # задачи в воркере выполняются последовательно, поэтому старый набор уже никто не использует
+        _, (old_shm, _) = _attached.popitem(last=False)
+        old_shm.close()
+
+    return _attached[series.name][1]
+
+
+def _score_shared(
+        series: SharedSeries,
+        task: ScoreTask,
+        d: int,
+        m: int,
+        scoring: InformationCriteriaScoring,
+) -> ScoreResult:
+    data = _attach(series)
+    endog = data[:, 0]
+    exog = data[:, 1:] if series.has_exog else None
+    return score_sarimax(task, d, m, endog, exog, scoring)
+
+
+class ParameterSelectionPool:
+    """
+    Пул процессов для подбора параметров, живущий все время работы приложения.
+
+    Создается один раз (APP scope в DI-контейнере) и закрывается при остановке приложения,
+    поэтому запрос не платит за запуск процессов. Ряды передаются воркерам один раз на задачу подбора
+    через разделяемую память, в каждую задачу пула уходит только порядок модели и бюджет итераций.
+    """
+
+    def __init__(self, n_jobs: int):
+        self.n_jobs = n_jobs
+        self._executor = ProcessPoolExecutor(max_workers=n_jobs)
+        self._log = logger.getChild(self.__class__.__name__)
+
+    @contextmanager
+    def share(self, endog: pd.Series, exog: Optional[pd.DataFrame] = None) -> Iterator[SharedSeries]:
+        """Кладет endog и exog в разделяемую память на время подбора"""
+        columns = [endog.to_numpy(dtype=np.float64)]
+        if exog is not None:
+            columns.extend(exog.to_numpy(dtype=np.float64).T)
+        values = np.column_stack(columns)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+            yield SharedSeries(name=shm.name, shape=values.shape, has_exog=exog is not None)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def scorer(
+            self,
+            series: SharedSeries,
+            d: int,
+            m: int,
+            scoring: InformationCriteriaScoring,
+    ) -> Callable[[list[ScoreTask]], list[ScoreResult]]:
+        """Функция скоринга пачки задач для стратегии перебора"""
+        def score(tasks: list[ScoreTask]) -> list[ScoreResult]:
+            self._log.info(msg=f'Отправляем в пул {len(tasks)} моделей, n_jobs={self.n_jobs}')
+            futures = [self._executor.submit(_score_shared, series, task, d, m, scoring) for task in tasks]
+            results = []
+            try:
+                for future in futures:
+                    results.append(future.result())
+                    # между моделями проверяем, не отменена ли фоновая задача подбора
+                    checkpoint()
+            except JobCancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+            return results
+
+        return score
+
+    def shutdown(self) -> None:
+        self._log.info(msg='Останавливаем пул процессов подбора параметров')
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,2 @@
+from .interface import ModelRegistry, ModelNotFoundError
+from .file_registry import FileModelRegistry
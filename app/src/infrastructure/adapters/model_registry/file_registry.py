@@ -0,0 +1,100 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from .interface import ModelRegistry, ModelNotFoundError
+
+
+class FileModelRegistry(ModelRegistry):
+    """
+    Реестр моделей в каталоге на диске, общем для всех процессов приложения.
+
+    Идентификатор модели - sha256 ее байтов, поэтому одна и та же модель хранится один раз.
+    Время изменения файла обновляется при каждом обращении: модели, к которым не обращались дольше ttl,
+    удаляются, а при превышении max_bytes удаляются давно не использованные.
+    Файл может удалить очистка другого процесса в любой момент, поэтому время обновляется через os.utime,
+    который в отличие от Path.touch не создаст на месте удаленной модели пустой файл.
+    """
+
+    def __init__(self, root: str, ttl_seconds: int, max_bytes: int):
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+
+    def _path(self, model_id: str) -> Path:
+        # model_id приходит от клиента, не даем выйти за пределы каталога
+        if len(model_id) != 64 or not all(c in '0123456789abcdef' for c in model_id):
+            raise ModelNotFoundError(model_id)
+        return self._root / f'{model_id}.pickle'
+
+    def save(self, model_bytes: bytes) -> str:
+        model_id = hashlib.sha256(model_bytes).hexdigest()
+        path = self._path(model_id)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._write(path, model_bytes)
+
+        self._cleanup(keep=path)
+        return model_id
+
+    def _write(self, path: Path, model_bytes: bytes) -> None:
+        # пишем во временный файл и переименовываем, чтобы другие процессы не прочитали недописанную модель
+        fd, tmp_path = tempfile.mkstemp(dir=self._root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(model_bytes)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def load(self, model_id: str) -> bytes:
+        path = self._path(model_id)
+        try:
+            model_bytes = path.read_bytes()
+        except FileNotFoundError:
+            raise ModelNotFoundError(model_id)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # модель уже удалена очисткой другого процесса, но байты прочитаны
+            pass
+        return model_bytes
+
+    def _cleanup(self, keep: Path) -> None:
+        now = time.time()
+        # временные файлы записи, оборванной падением процесса; идущая запись свежее ttl
+        for path in self._root.glob('*.tmp'):
+            try:
+                if now - path.stat().st_mtime > self._ttl_seconds:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+        files = []
+        for path in self._root.glob('*.pickle'):
+            if path == keep:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self._ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        try:
+            keep_bytes = keep.stat().st_size
+        except FileNotFoundError:
+            keep_bytes = 0
+        total_bytes = keep_bytes + sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
@@ -0,0 +1,22 @@
+import abc
+
+
+class ModelNotFoundError(Exception):
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+
+    def __str__(self):
+        return f'Модель {self.model_id} не найдена в реестре. Возможно, срок ее хранения истек, загрузите файл модели'
+
+
+class ModelRegistry(abc.ABC):
+    """Хранит сериализованные модели, чтобы прогнозировать по идентификатору без повторной загрузки файла"""
+
+    @abc.abstractmethod
+    def save(self, model_bytes: bytes) -> str:
+        """Сохраняет модель и возвращает ее идентификатор"""
+        ...
+
+    @abc.abstractmethod
+    def load(self, model_id: str) -> bytes:
+        ...
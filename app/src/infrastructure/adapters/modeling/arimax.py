@@ -73,53 +73,38 @@ class ArimaxAdapter(MlAdapterInterface):
         # 3.1 In-sample прогноз для тренировочных данных
         train_predict = results.get_prediction().predicted_mean
 
-        # 3.2 Прогноз для валидации с использованием фактических лагов
+        # 3.2 Продолжаем фильтр на val и test с использованием фактических лагов.
+        # Один проход по новым данным вместо повторной фильтрации train + val и train + val + test:
+        # одношаговый прогноз в момент t зависит только от данных до t, поэтому он тот же
+        forecast_model = results
+        new_target = pd.concat([val_target, test_target])
+        if not new_target.empty:
+            new_exog = pd.concat([exog_val, exog_test]) if exog is not None else None
+            try:
+                # фильтр стартует с состояния на конец train, train повторно не фильтруется
+                forecast_model = results.extend(new_target, exog=new_exog)
+            except ValueError:
+                # индекс без частоты (например, торговые дни) продлить нельзя - один проход по всей выборке
+                forecast_model = results.apply(
+                    pd.concat([train_target, new_target]),
+                    exog=pd.concat([exog_train, new_exog]) if exog is not None else None
+                )
+
+        # 3.3 Прогнозы для валидации и теста
         val_predict = pd.Series()
-        val_model = None
         if not val_target.empty:
-            # Объединяем train + val
-            full_val_target = pd.concat([train_target, val_target])
-            full_val_exog = pd.concat([exog_train, exog_val]) if exog is not None else None
-
-            # Применяем модель к объединенным данным
-            val_model = results.apply(full_val_target, exog=full_val_exog)
-            # Получаем предсказания только для валидационного периода
-            val_predict = val_model.get_prediction(
+            val_predict = forecast_model.get_prediction(
                 start=val_target.index[0],
                 end=val_target.index[-1]
             ).predicted_mean
 
-        # 3.3 Прогноз для теста с использованием фактических лагов
         test_predict = pd.Series()
-        test_model = None
         if not test_target.empty:
-            # Объединяем train + val (если есть) + test
-            full_test_target = train_target
-            full_test_exog = exog_train if exog is not None else None
-
-            if not val_target.empty:
-                full_test_target = pd.concat([full_test_target, val_target])
-                full_test_exog = pd.concat([full_test_exog, exog_val]) if exog is not None else None
-
-            full_test_target = pd.concat([full_test_target, test_target])
-            full_test_exog = pd.concat([full_test_exog, exog_test]) if exog is not None else None
-
-            # Применяем модель к объединенным данным
-            test_model = results.apply(full_test_target, exog=full_test_exog)
-            # Получаем предсказания только для тестового периода
-            test_predict = test_model.get_prediction(
+            test_predict = forecast_model.get_prediction(
                 start=test_target.index[0],
                 end=test_target.index[-1]
             ).predicted_mean
 
-        # Определяем модель для out-of-sample прогноза на основе доступных данных
-        if not test_target.empty:
-            forecast_model = test_model
-        elif not val_target.empty:
-            forecast_model = val_model
-        else:
-            forecast_model = results
-
         # 3.4 Out-of-sample прогноз (рекурсивный)
         if exog is None:  # Eсли нет экзогенных переменных
             forecast = forecast_model.get_forecast(
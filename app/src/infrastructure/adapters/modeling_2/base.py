@@ -7,7 +7,9 @@ from fastapi import HTTPException
 from neuralforecast import NeuralForecast
 from pydantic import BaseModel
 
+from config import Config
 from src.core.domain import DataFrequency, FitParams, Timeseries, ModelMetrics
+from src.infrastructure.adapters.jobs.callbacks import JobProgressCallback
 from src.infrastructure.adapters.modeling.interface import MlAdapterInterface
 from typing import Generic, TypeVar
 
@@ -15,10 +17,10 @@ from src.infrastructure.adapters.modeling.neural_forecast.utils import form_trai
 from src.infrastructure.adapters.modeling_2.neural_models_errors import TrainSizeError, LSTM_GRU_TrainSizeError, \
     ValSizeError, PatienceStepsError
 from src.infrastructure.adapters.timeseries import TimeseriesTrainTestSplit, PandasTimeseriesAdapter
+from src.infrastructure.adapters.timeseries.recursive_window import RecursiveWindow
 from src.infrastructure.adapters.timeseries.split_windows import WindowSplitter
 from src.infrastructure.adapters.timeseries.windows_creation import WindowsCreation
 from src.infrastructure.factories.metrics import MetricsFactory
-from src.shared.to_panel import to_panel
 
 
 TResult = TypeVar("TResult", bound=BaseModel)
@@ -129,45 +131,23 @@ class BaseNeuralForecast(Generic[TParams], MlAdapterInterface, ABC):
         )
 
     def _fit_nf(self, data_frequency) -> None:
+        # прогресс обучения и отмена для фоновых задач.
+        # NeuralForecast копирует модели при создании, поэтому колбэк добавляется до него
+        self.model.trainer_kwargs.setdefault('callbacks', []).append(JobProgressCallback())
         self.nf = NeuralForecast(models=[self.model], freq=data_frequency)
-        self.nf.fit(df=self.train_df, val_size=self.val_target.shape[0])
-
-    def _extend_pd_series(self, data: pd.Series, count: int) -> pd.Series:
-        last_value = data.iloc[-1]
-        last_index = data.index[-1]
-        freq = pd.infer_freq(data.index)
-        new_index = pd.date_range(start=last_index + pd.tseries.frequencies.to_offset(freq), periods=count, freq=freq)
-        new_values = [last_value] * count
-        new_series = pd.Series(new_values, index=new_index)
-        new_data = pd.concat([data, new_series])
-        return new_data
-
-    def _extend_exog(self, output_size: int) -> None:
-        if self.exog is not None:
-            extended_data = {}
-            for col in self.exog.columns:
-                extended_series = self._extend_pd_series(self.exog[col], output_size)
-                extended_data[col] = extended_series
-            self.exog = pd.DataFrame(extended_data)
-
-    def _extend_target(self, predictions: pd.Series) -> None:
-        first_prediction = predictions.iloc[0]
-
-        # Создаем следующую временную метку
-        freq = pd.infer_freq(self.target.index)
-        last_target_index = self.target.index[-1]
-        new_index = last_target_index + pd.tseries.frequencies.to_offset(freq)
-
-        # Добавляем предсказание с правильной датой
-        new_prediction_series = pd.Series(
-            [first_prediction],
-            index=[new_index]
-        )
-        self.target = pd.concat([self.target, new_prediction_series])
-
-    def _get_forecast_dates(self, window: pd.DataFrame, output_size: int) -> pd.DatetimeIndex:
+        try:
+            self.nf.fit(df=self.train_df, val_size=self.val_target.shape[0])
+        finally:
+            # колбэк не должен попасть в сериализованную модель
+            for model in [self.model, *self.nf.models]:
+                model.trainer_kwargs['callbacks'] = [
+                    callback for callback in model.trainer_kwargs['callbacks']
+                    if not isinstance(callback, JobProgressCallback)
+                ]
+
+    def _get_forecast_dates(self, last_date: pd.Timestamp, output_size: int) -> pd.DatetimeIndex:
         return pd.date_range(
-            start=window['ds'].iloc[-1],
+            start=last_date,
             periods=output_size + 1,
             freq=self.nf.freq
         )[1:]
@@ -175,23 +155,9 @@ class BaseNeuralForecast(Generic[TParams], MlAdapterInterface, ABC):
     def _predict_window(self, window: pd.DataFrame) -> pd.Series:
         prediction = self.nf.predict(df=window)
         prediction = prediction[self.model_name]
-        prediction.index = self._get_forecast_dates(window=window, output_size=prediction.shape[0])
+        prediction.index = self._get_forecast_dates(last_date=window['ds'].iloc[-1], output_size=prediction.shape[0])
         return prediction
 
-    def _is_last_prediction(
-            self,
-            prediction: pd.Series,
-            start_prediction_date: date, forecast_horizon: int) -> bool:
-        first_prediction_date = prediction.index[0]
-        last_dt = pd.date_range(
-            start=start_prediction_date,
-            periods=forecast_horizon,
-            freq=self.nf.freq
-        )[-1]
-        if first_prediction_date == last_dt:
-            return True
-        return False
-
     def _predict_out_of_sample(
             self,
             start_predictions: pd.Series,
@@ -199,33 +165,20 @@ class BaseNeuralForecast(Generic[TParams], MlAdapterInterface, ABC):
             forecast_horizon: int
     ) -> List[pd.Series]:
         forecast_list = [start_predictions]
-        for _ in range(forecast_horizon):
-            # нужно продлить exog на 1 точку
-            self._extend_exog(1)
-            # нужно дополнить таргет последним предсказанием
-            self._extend_target(forecast_list[-1])
-            # нужно составить окно из последних input_size точек в target, exog
-            window_exog, window_target = self.windows_creation.create_window_out_for_sample(
-                self.exog, self.target, input_size
-            )
-            nf_panel = to_panel(window_target, window_exog)
-            prediction = self._predict_window(nf_panel)
+        # первый прогноз уже есть (последнее окно внутри выборки), осталось forecast_horizon - 1 шагов
+        window = RecursiveWindow(self.target, self.exog, input_size, steps=forecast_horizon - 1)
+        for _ in range(forecast_horizon - 1):
+            # дополняем окно первой точкой последнего прогноза, exog продлевается последним значением
+            window.push(forecast_list[-1].iloc[0])
+            prediction = self._predict_window(window.to_panel())
             forecast_list.append(prediction)
-            if self._is_last_prediction(prediction, start_predictions.index[0], forecast_horizon):
-                break
 
         assert len(forecast_list) == forecast_horizon
         return forecast_list
 
     def _predict_insample(self, input_size) -> List[pd.Series]:
-        forecast_list = []
-        windows_exog, windows_target = self.windows_creation.create_windows(self.exog, self.target, input_size)
-        if self.exog is None:
-            windows_exog = [None] * len(windows_target)
-        for window_target, window_exog in zip(windows_target, windows_exog):
-            nf_panel = to_panel(window_target, window_exog)
-            forecast_list.append(self._predict_window(nf_panel))
-        return forecast_list
+        windows = self.windows_creation.create_windows_view(self.exog, self.target, input_size)
+        return windows.predict(self.nf, self.model_name, Config.NEURAL_PREDICT_WINDOWS_BATCH_SIZE)
 
     def _predict(self, input_size: int, forecast_horizon: int) -> List[Timeseries]:
         insample_predictions = self._predict_insample(input_size)
@@ -325,9 +278,11 @@ class BaseNeuralForecast(Generic[TParams], MlAdapterInterface, ABC):
         return metrics
 
     def _prepare_archive_data(self):
+        # прогнозу от 'model' нужны только гиперпараметры. Обученная копия из nf, а не self.model,
+        # чтобы веса сети не сохранялись в архив дважды
         return {
             'nf': self.nf,
-            'model': self.model,
+            'model': self.nf.models[0],
         }
 
     def fit(
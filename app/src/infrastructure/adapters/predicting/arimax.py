@@ -1,10 +1,11 @@
+import numpy as np
 import pandas as pd
 from typing import Optional
 from statsmodels.tsa.statespace.sarimax import SARIMAXResultsWrapper
 
 from src.core.domain import DataFrequency, ModelMetrics, Forecasts, FitParams, Timeseries
 from src.core.domain.predicting.interface import BasePredictor
-from src.infrastructure.adapters.serializer import ModelSerializer
+from src.infrastructure.adapters.serializer import ModelSerializer, ModelCache
 from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter, TimeseriesTrainTestSplit, TimeseriesExtender
 from src.infrastructure.factories.metrics import MetricsFactory
 
@@ -15,12 +16,14 @@ class PredictArimaxAdapter(BasePredictor):
     def __init__(
             self,
             model_serializer: ModelSerializer,
+            model_cache: ModelCache,
             ts_adapter: PandasTimeseriesAdapter,
             metric_factory: MetricsFactory,
             ts_train_test_split: TimeseriesTrainTestSplit,
             ts_extender: TimeseriesExtender,
     ):
         self._model_serializer = model_serializer
+        self._model_cache = model_cache
         self._ts_adapter = ts_adapter
         self._metric_factory = metric_factory
         self._ts_spliter = ts_train_test_split
@@ -93,6 +96,17 @@ class PredictArimaxAdapter(BasePredictor):
             ) if not forecast.empty else None,
         )
 
+    @staticmethod
+    def _is_fitted_on(model: SARIMAXResultsWrapper, target: pd.Series, exog: Optional[pd.DataFrame]) -> bool:
+        data = model.model.data
+        if not isinstance(data.orig_endog, pd.Series) or not data.orig_endog.index.equals(target.index):
+            return False
+        if not np.array_equal(data.orig_endog.to_numpy(), target.to_numpy()):
+            return False
+        if exog is None or data.orig_exog is None:
+            return exog is None and data.orig_exog is None
+        return np.array_equal(np.asarray(data.orig_exog), exog.to_numpy())
+
     def execute(
             self,
             model_weight: bytes,
@@ -101,16 +115,30 @@ class PredictArimaxAdapter(BasePredictor):
             fit_params: FitParams,
             data_frequency: DataFrequency,
     ) -> tuple[Forecasts, ModelMetrics]:
+        with self._model_cache.checkout(model_weight, self._model_serializer.deserialize) as model:
+            return self._execute(model, target, exog_df, fit_params, data_frequency)
 
-        model: SARIMAXResultsWrapper = self._model_serializer.deserialize(model_weight)
+    def _execute(
+            self,
+            model: SARIMAXResultsWrapper,
+            target: pd.Series,
+            exog_df: Optional[pd.DataFrame],
+            fit_params: FitParams,
+            data_frequency: DataFrequency,
+    ) -> tuple[Forecasts, ModelMetrics]:
 
         # Разделяем данные на train, val, test
         train_target, val_target, test_target = self._ts_spliter.split_ts(
             target, fit_params.train_boundary, fit_params.val_boundary
         )
 
-        # Применяем модель к train данным
-        model_train = model.apply(train_target, exog=exog_df.loc[train_target.index] if exog_df is not None else None)
+        # Применяем модель к train данным. Если модель обучалась ровно на этих данных,
+        # результаты фильтра уже есть в модели и повторно фильтровать train не нужно
+        train_exog = exog_df.loc[train_target.index] if exog_df is not None else None
+        if self._is_fitted_on(model, train_target, train_exog):
+            model_train = model
+        else:
+            model_train = model.apply(train_target, exog=train_exog)
         train_predict = model_train.get_prediction().predicted_mean
 
         # Применяем модель к val данным (если есть)
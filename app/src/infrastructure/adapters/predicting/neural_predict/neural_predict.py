@@ -6,7 +6,7 @@ from neuralforecast.tsdataset import TimeSeriesDataset
 
 from src.core.domain import DataFrequency, ModelMetrics, Forecasts, FitParams, Timeseries
 from src.core.domain.predicting.interface import BasePredictor
-from src.infrastructure.adapters.serializer import ModelSerializer
+from src.infrastructure.adapters.serializer import ModelSerializer, ModelCache
 from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter, TimeseriesTrainTestSplit
 from src.infrastructure.factories.metrics import MetricsFactory
 from src.shared.future_dates import future_dates
@@ -20,6 +20,7 @@ class NeuralPredictAdapter(BasePredictor):
     def __init__(
             self,
             model_serializer: ModelSerializer,
+            model_cache: ModelCache,
             ts_adapter: PandasTimeseriesAdapter,
             metric_factory: MetricsFactory,
             ts_train_test_split: TimeseriesTrainTestSplit,
@@ -28,6 +29,7 @@ class NeuralPredictAdapter(BasePredictor):
         self._ts_spliter = ts_train_test_split
         self._ts_adapter = ts_adapter
         self._model_serializer = model_serializer
+        self._model_cache = model_cache
 
     def _calculate_metrics(
         self,
@@ -104,7 +106,17 @@ class NeuralPredictAdapter(BasePredictor):
             fit_params: FitParams,
             data_frequency: DataFrequency,
     ) -> tuple[Forecasts, ModelMetrics]:
-        deserialized_nf: NeuralForecast = self._model_serializer.deserialize(model_weight)
+        with self._model_cache.checkout(model_weight, self._model_serializer.deserialize) as deserialized_nf:
+            return self._execute(deserialized_nf, target, exog_df, fit_params, data_frequency)
+
+    def _execute(
+            self,
+            deserialized_nf: NeuralForecast,
+            target: pd.Series,
+            exog_df: Optional[pd.DataFrame],
+            fit_params: FitParams,
+            data_frequency: DataFrequency,
+    ) -> tuple[Forecasts, ModelMetrics]:
         train_df = to_panel(target=target, exog=exog_df)
 
         dataset, uids, _, ds = TimeSeriesDataset.from_df(
@@ -4,14 +4,15 @@ from typing import Optional, List
 import pandas as pd
 from neuralforecast import NeuralForecast
 
+from config import Config
 from src.core.domain import DataFrequency, ModelMetrics, FitParams, Timeseries, ForecastResult_V2
 from src.core.domain.predicting.interface import BasePredictor
-from src.infrastructure.adapters.serializer import ModelSerializer
+from src.infrastructure.adapters.serializer import ModelSerializer, ModelCache
 from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter, TimeseriesTrainTestSplit
+from src.infrastructure.adapters.timeseries.recursive_window import RecursiveWindow
 from src.infrastructure.adapters.timeseries.split_windows import WindowSplitter
 from src.infrastructure.adapters.timeseries.windows_creation import WindowsCreation
 from src.infrastructure.factories.metrics import MetricsFactory
-from src.shared.to_panel import to_panel
 
 
 class NeuralPredictAdapter_V2(BasePredictor):
@@ -21,6 +22,7 @@ class NeuralPredictAdapter_V2(BasePredictor):
     def __init__(
             self,
             model_serializer: ModelSerializer,
+            model_cache: ModelCache,
             ts_adapter: PandasTimeseriesAdapter,
             metric_factory: MetricsFactory,
             ts_train_test_split: TimeseriesTrainTestSplit,
@@ -31,6 +33,7 @@ class NeuralPredictAdapter_V2(BasePredictor):
         self._ts_spliter = ts_train_test_split
         self._ts_adapter = ts_adapter
         self._model_serializer = model_serializer
+        self._model_cache = model_cache
         self._windows_creation = windows_creation
         self._windows_splitter = windows_splitter
 
@@ -92,42 +95,9 @@ class NeuralPredictAdapter_V2(BasePredictor):
             exog=self.exog,
         )
 
-    def _extend_pd_series(self, data: pd.Series, count: int) -> pd.Series:
-        last_value = data.iloc[-1]
-        last_index = data.index[-1]
-        freq = pd.infer_freq(data.index)
-        new_index = pd.date_range(start=last_index + pd.tseries.frequencies.to_offset(freq), periods=count, freq=freq)
-        new_values = [last_value] * count
-        new_series = pd.Series(new_values, index=new_index)
-        new_data = pd.concat([data, new_series])
-        return new_data
-
-    def _extend_exog(self, output_size: int) -> None:
-        if self.exog is not None:
-            extended_data = {}
-            for col in self.exog.columns:
-                extended_series = self._extend_pd_series(self.exog[col], output_size)
-                extended_data[col] = extended_series
-            self.exog = pd.DataFrame(extended_data)
-
-    def _extend_target(self, predictions: pd.Series) -> None:
-        first_prediction = predictions.iloc[0]
-
-        # Создаем следующую временную метку
-        freq = pd.infer_freq(self.target.index)
-        last_target_index = self.target.index[-1]
-        new_index = last_target_index + pd.tseries.frequencies.to_offset(freq)
-
-        # Добавляем предсказание с правильной датой
-        new_prediction_series = pd.Series(
-            [first_prediction],
-            index=[new_index]
-        )
-        self.target = pd.concat([self.target, new_prediction_series])
-
-    def _get_forecast_dates(self, window: pd.DataFrame, output_size: int) -> pd.DatetimeIndex:
+    def _get_forecast_dates(self, last_date: pd.Timestamp, output_size: int) -> pd.DatetimeIndex:
         return pd.date_range(
-            start=window['ds'].iloc[-1],
+            start=last_date,
             periods=output_size + 1,
             freq=self.nf.freq
         )[1:]
@@ -135,25 +105,9 @@ class NeuralPredictAdapter_V2(BasePredictor):
     def _predict_window(self, window: pd.DataFrame) -> pd.Series:
         prediction = self.nf.predict(df=window)
         prediction = prediction[self.model_name]
-        prediction.index = self._get_forecast_dates(window=window, output_size=prediction.shape[0])
+        prediction.index = self._get_forecast_dates(last_date=window['ds'].iloc[-1], output_size=prediction.shape[0])
         return prediction
 
-    def _is_last_prediction(
-            self,
-            prediction: pd.Series,
-            start_prediction_date: date,
-            forecast_horizon: int
-    ) -> bool:
-        first_prediction_date = prediction.index[0]
-        last_dt = pd.date_range(
-            start=start_prediction_date,
-            periods=forecast_horizon,
-            freq=self.nf.freq
-        )[-1]
-        if first_prediction_date == last_dt:
-            return True
-        return False
-
     def _predict_out_of_sample(
             self,
             start_predictions: pd.Series,
@@ -164,35 +118,20 @@ class NeuralPredictAdapter_V2(BasePredictor):
             return [start_predictions.iloc[:forecast_horizon]]
 
         forecast_list = [start_predictions]
-        for _ in range(forecast_horizon):
-            # нужно продлить exog на 1 точку
-            self._extend_exog(1)
-            # нужно дополнить таргет последним предсказанием
-            self._extend_target(forecast_list[-1])
-            # нужно составить окно из последних input_size точек в target, exog
-            window_exog, window_target = self._windows_creation.create_window_out_for_sample(
-                self.exog, self.target, self.model.input_size
-            )
-            nf_panel = to_panel(window_target, window_exog)
-            prediction = self._predict_window(nf_panel)
+        # первый прогноз уже есть (последнее окно внутри выборки), осталось forecast_horizon - 1 шагов
+        window = RecursiveWindow(self.target, self.exog, self.model.input_size, steps=forecast_horizon - 1)
+        for _ in range(forecast_horizon - 1):
+            # дополняем окно первой точкой последнего прогноза, exog продлевается последним значением
+            window.push(forecast_list[-1].iloc[0])
+            prediction = self._predict_window(window.to_panel())
             forecast_list.append(prediction)
-            if self._is_last_prediction(prediction, start_predictions.index[0], forecast_horizon):
-                break
 
         assert len(forecast_list) == forecast_horizon
         return forecast_list
 
     def _predict_insample(self) -> List[pd.Series]:
-        forecast_list = []
-        windows_exog, windows_target = self._windows_creation.create_windows(
-            self.exog, self.target, self.model.input_size
-        )
-        if self.exog is None:
-            windows_exog = [None] * len(windows_target)
-        for window_target, window_exog in zip(windows_target, windows_exog):
-            nf_panel = to_panel(window_target, window_exog)
-            forecast_list.append(self._predict_window(nf_panel))
-        return forecast_list
+        windows = self._windows_creation.create_windows_view(self.exog, self.target, self.model.input_size)
+        return windows.predict(self.nf, self.model_name, Config.NEURAL_PREDICT_WINDOWS_BATCH_SIZE)
 
     def _format_forecasts(self, forecasts: List[pd.Series]) -> List[Timeseries]:
         result_forecasts = []
@@ -269,7 +208,17 @@ class NeuralPredictAdapter_V2(BasePredictor):
             fit_params: FitParams,
             data_frequency: DataFrequency,
     ) -> ForecastResult_V2:
-        fit_result = self._model_serializer.deserialize(model_weight)
+        with self._model_cache.checkout(model_weight, self._model_serializer.deserialize) as fit_result:
+            return self._execute(fit_result, target, exog_df, fit_params, data_frequency)
+
+    def _execute(
+            self,
+            fit_result: dict,
+            target: pd.Series,
+            exog_df: Optional[pd.DataFrame],
+            fit_params: FitParams,
+            data_frequency: DataFrequency,
+    ) -> ForecastResult_V2:
         self.nf = fit_result['nf']
         self.model = fit_result['model']
 
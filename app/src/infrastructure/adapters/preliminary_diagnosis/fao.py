@@ -27,6 +27,17 @@ def ipa_ranges(x):
     return "Normal"
 
 
+def ipa_ranges_array(x: np.ndarray) -> np.ndarray:
+    """
+    Векторный аналог ipa_ranges для массива значений IPA.
+    """
+    return np.select(
+        [x <= -1, x <= -0.5, x >= 1, x >= 0.5, np.isnan(x)],
+        ["Alert low", "Watch low", "Alert high", "Watch high", ""],
+        "Normal",
+    )
+
+
 def proc_res(x):
     """
     Данная функция переводит IPA из понятнного пользователям вида в числовое значение {0,1,2}.
@@ -41,6 +52,79 @@ def proc_res(x):
             return 0
 
 
+def _prior_sum(values: np.ndarray, month: np.ndarray) -> np.ndarray:
+    """
+    Сумма values по предыдущим наблюдениям того же календарного месяца (без текущего).
+    """
+    return pd.DataFrame(values).groupby(month).cumsum().to_numpy() - values
+
+
+def ipa_frame(
+    prices: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    quarter=False,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Данная функция рассчитывает IPA сразу для всех столбцов цен с общими датами.
+
+    Взвешенные среднее и стандартное отклонение считаются накопленными суммами по каждому
+    календарному месяцу: для наблюдения берутся суммы весов, взвешенных темпов роста и их квадратов
+    по предыдущим годам того же месяца, так что весь расчет - несколько groupby(month).cumsum().
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        Месячные цены, по столбцу на ряд.
+
+    dates : pd.DatetimeIndex
+        Даты наблюдений, по одной на строку prices.
+
+    quarter : bool
+        Если `True`, то требуется рассчитать квартальный IPA.
+        В противном случае рассчитывается годовой IPA.
+
+    Returns
+    _______
+    tuple[pd.DataFrame, pd.DataFrame]
+        Темпы роста и значения IPA той же формы, что и prices.
+        У рядов без единого темпа роста IPA не определен (NaN).
+    """
+    periods = 3 if quarter else 12
+
+    cgr = (prices / prices.shift(periods)) ** (1 / periods) - 1
+
+    year = dates.year.to_numpy(dtype=float)[:, None]
+    month = dates.month.to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        min_year = np.where(cgr.notna().to_numpy(), year, np.inf).min(axis=0)
+
+        weight = year - min_year + 1
+        nweight = weight - 1
+        rate = cgr.fillna(0).to_numpy()
+
+        cweight = _prior_sum(weight, month)
+        wmean = _prior_sum(weight * rate, month) / cweight
+        wmean[cgr.shift(12).isna().to_numpy()] = np.nan
+
+        # моменты считаются от среднего темпа роста месяца, чтобы не терять точность при вычитании
+        center = pd.DataFrame(rate).groupby(month).transform("mean").to_numpy()
+        deviation = rate - center
+        shift = wmean - center
+        wsquares = (
+            _prior_sum(weight * deviation ** 2, month)
+            - 2 * shift * _prior_sum(weight * deviation, month)
+            + shift ** 2 * cweight
+        )
+        # при единственном предыдущем годе с ненулевым весом среднее совпадает с ним, отклонение ровно 0
+        wsquares[_prior_sum((weight != 0).astype(float), month) <= 1] = 0
+        wsd = np.sqrt(np.maximum(wsquares, 0) / (cweight * (nweight - 1) / nweight))
+
+        ipa = (cgr.to_numpy() - wmean) / wsd
+
+    return cgr, pd.DataFrame(ipa, index=prices.index, columns=prices.columns)
+
+
 def get_ipa(
     dataset: pd.DataFrame,
     price: str | None = None,
@@ -90,67 +174,15 @@ def get_ipa(
         assert (
             type(dataset.index) == pdi.DatetimeIndex
         ), "The index of the `dataset` should be Datetime if no explicit `date` variable is provided!"
-        date = "date"
         dt = dataset.loc[:, [price]]
-        dt[date] = dt.index
 
     cgr = "cqgr" if quarter else "cygr"
-    periods = 3 if quarter else 12
-
-    dt["year"] = dt.loc[:, date].apply(lambda x: x.year)
-    dt["month"] = dt.loc[:, date].apply(lambda x: x.month)
-
-    dt[cgr] = (dt[price] / dt.loc[:, price].shift(periods)) ** (1 / periods) - 1
 
-    min_year = int(dt.loc[dt.loc[:, cgr].notna(), "year"].min())
-    years = list(dt.year.unique())
+    rates, ipa = ipa_frame(dt, pd.DatetimeIndex(dt.index), quarter=quarter)
+    if rates[price].isna().all():
+        raise ValueError("No growth rates to compute IPA!")
 
-    dt["tmp_weight"] = dt.year - min_year + 1
-    dt["tmp_nweight"] = dt.tmp_weight - 1
-
-    dt[f"wmean({cgr})"] = np.nan
-    dt["tmp_wdata"] = dt.tmp_weight * dt.loc[:, cgr].fillna(0)
-
-    for m in range(1, 13):
-        mask = dt.month == m
-        dt.loc[mask, f"wmean({cgr})"] = (
-            dt.loc[mask, "tmp_wdata"].cumsum() - dt.loc[mask, "tmp_wdata"]
-        ) / (dt.loc[mask, "tmp_weight"].cumsum() - dt.loc[mask, "tmp_weight"])
-
-    dt.loc[dt.loc[:, cgr].shift(12).isna(), f"wmean({cgr})"] = np.nan
-
-    dt[f"wsd({cgr})"] = np.nan
-    for m in range(1, 13):
-        for y in years:
-            mask = dt.month == m
-            ymask = (dt.year == y) & (dt.month == m)
-
-            try:
-                mean_val = float(dt.loc[ymask, f"wmean({cgr})"].iloc[0])
-            except IndexError:
-                continue
-            dt.loc[mask, "tmp_wdata"] = (
-                dt.loc[mask, "tmp_weight"]
-                * (dt.loc[mask, cgr].fillna(0) - mean_val) ** 2
-            )
-            dt.loc[mask, "tmp_wdata"] = dt.loc[mask].tmp_wdata.fillna(
-                0
-            ).cumsum() - dt.loc[mask].tmp_wdata.fillna(0)
-            dt.loc[mask, "tmp_cweight"] = (
-                dt.loc[mask].tmp_weight.cumsum() - dt.loc[mask].tmp_weight
-            )
-            dt.loc[ymask, f"wsd({cgr})"] = np.sqrt(
-                dt.loc[ymask].tmp_wdata
-                / (
-                    dt.loc[ymask].tmp_cweight
-                    * (dt.loc[ymask].tmp_nweight - 1)
-                    / dt.loc[ymask].tmp_nweight
-                )
-            )
-
-    dt[f"ipa({cgr})"] = (dt[cgr] - dt[f"wmean({cgr})"]) / dt[f"wsd({cgr})"]
-
-    return dt.loc[:, [cgr, f"ipa({cgr})"]]
+    return pd.DataFrame({cgr: rates[price], f"ipa({cgr})": ipa[price]}, index=dt.index)
 
 
 def fao_procedure(
@@ -217,18 +249,93 @@ def fao_procedure(
     return {"price": price, "date": date, "data": data}
 
 
+def fao_frame(prices: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+    """
+    Данная функция рассчитывает сводный IPA сразу для всех столбцов цен с общим индексом дат,
+    так же как fao_procedure для каждого столбца.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        Месячные цены, по столбцу на ряд. Индекс должен быть типа `DatetimeIndex`.
+
+    Returns
+    _______
+    tuple[pd.DataFrame, pd.DataFrame, np.ndarray]
+        Значения `UN_result` и `PC_result` той же формы, что и prices, и признак того,
+        что для ряда удалось провести процедуру (fao_procedure не упала бы на нем).
+    """
+    dates = pd.DatetimeIndex(prices.index)
+    cqgr, ipa_q = ipa_frame(prices, dates, quarter=True)
+    cygr, ipa_y = ipa_frame(prices, dates, quarter=False)
+
+    q, y = cqgr.to_numpy(), cygr.to_numpy()
+    both = ~np.isnan(q) & ~np.isnan(y)
+
+    # ковариационные матрицы (cqgr, cygr) всех рядов по наблюдениям без пропусков, как в fao_procedure
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = both.sum(axis=0)
+        q_dev = np.where(both, q - np.where(both, q, 0).sum(axis=0) / count, 0)
+        y_dev = np.where(both, y - np.where(both, y, 0).sum(axis=0) / count, 0)
+        cov = np.stack(
+            [
+                np.stack([(q_dev * q_dev).sum(axis=0), (q_dev * y_dev).sum(axis=0)], axis=-1),
+                np.stack([(y_dev * q_dev).sum(axis=0), (y_dev * y_dev).sum(axis=0)], axis=-1),
+            ],
+            axis=-2,
+        ) / (count - 1)[:, None, None]
+
+    valid = cqgr.notna().any(axis=0).to_numpy() & cygr.notna().any(axis=0).to_numpy()
+    valid &= (count > 1) & np.isfinite(cov).all(axis=(1, 2))
+
+    weights = np.full((prices.shape[1], 2), np.nan)
+    if valid.any():
+        eigen = np.linalg.eig(cov[valid])[0]
+        weights[valid] = eigen / eigen.sum(axis=1, keepdims=True)
+
+    ipa_q, ipa_y = ipa_q.to_numpy(), np.nan_to_num(ipa_y.to_numpy(), nan=0.0)
+    un_ipa = 0.4 * ipa_q + 0.6 * ipa_y
+    pc_ipa = weights[:, 0] * ipa_q + weights[:, 1] * ipa_y
+
+    return (
+        pd.DataFrame(ipa_ranges_array(un_ipa), index=prices.index, columns=prices.columns),
+        pd.DataFrame(ipa_ranges_array(pc_ipa), index=prices.index, columns=prices.columns),
+        valid,
+    )
+
+
 
 class FaoAdapter:
-    @staticmethod
-    def validate_data(result) -> list[Optional[FaoEnum]]:
-        validated = []
-        for v in result:
-            match v:
-                case "Alert low" | "Watch low" | "Normal" | "Watch high" | "Alert high":
-                    validated.append(FaoEnum(v))
-                case _:
-                    validated.append(None)
-        return validated
+    _labels = {label.value: label for label in FaoEnum}
+
+    @classmethod
+    def validate_data(cls, result) -> list[Optional[FaoEnum]]:
+        return [cls._labels.get(v) for v in result]
+
+    def run_batch(self, frames: list[pd.DataFrame]) -> list[Optional[FaoResult]]:
+        """
+        FAO процедура для многих рядов. Ряды с одинаковыми датами считаются одним проходом
+        по широкому датафрейму. None - процедуру для ряда провести не удалось.
+        """
+        groups: dict[bytes, list[int]] = {}
+        for i, frame in enumerate(frames):
+            groups.setdefault(frame.index.to_numpy().tobytes(), []).append(i)
+
+        results: list[Optional[FaoResult]] = [None] * len(frames)
+        for positions in groups.values():
+            prices = pd.DataFrame(
+                np.column_stack([frames[i].to_numpy(dtype=float)[:, 0] for i in positions]),
+                index=frames[positions[0]].index,
+            )
+            un_result, pc_result, valid = fao_frame(prices)
+
+            for j, i in enumerate(positions):
+                if valid[j]:
+                    results[i] = FaoResult(
+                        UN_result=self.validate_data(un_result[j].values),
+                        PC_result=self.validate_data(pc_result[j].values),
+                    )
+        return results
 
     def run(self, ts: pd.DataFrame) -> FaoResult:
         try:
@@ -3,7 +3,7 @@ from src.core.application.preliminary_diagnosis.schemas.kim_andrews import KimAn
 from src.core.domain import Timeseries
 
 
-from typing import Any
+from typing import Any, Callable
 import numpy as np
 from numpy import floating
 from numpy.typing import NDArray
@@ -11,6 +11,7 @@ import pandas as pd
 import statsmodels.formula.api as smf
 
 from numpy.linalg import inv, pinv
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 class EOSResult:
@@ -113,7 +114,41 @@ def sigma(u: pd.Series | np.ndarray | list, m: int) -> NDArray[floating[Any]]:
     )
 
 
-def proj(m: int, x: np.ndarray, sigma: np.ndarray) -> NDArray[floating[Any]]:
+def sigma_lagged(u: pd.Series | np.ndarray | list, m: int) -> NDArray[floating[Any]]:
+    """
+    Та же оценка ковариационной матрицы ошибок хвоста, что и sigma, за O(n*m).
+
+    Элемент (a, a + l) матрицы - сумма произведений u[i] * u[i + l] по i от a до n + a,
+    поэтому для каждого лага l достаточно одной кумулятивной суммы произведений
+    вместо суммы n + 1 матриц размера m*m.
+
+    Parameters
+    ----------
+    u: pd.Series | np.ndarray | list
+        Вектор остатков оценивания модели на всей выборке.
+
+    m : int
+        Длина тестируемого хвоста.
+
+    Returns
+    -------
+    NDArray[floating[Any]]
+        Оцененное значение ковариационной матрицы размера m*m.
+    """
+    U = to_array(u)[:, 0]
+    n = U.shape[0] - m
+
+    res = np.empty((m, m))
+    for lag in range(m):
+        cumsum = np.concatenate([[0.0], np.cumsum(U[: U.shape[0] - lag] * U[lag:])])
+        a = np.arange(m - lag)
+        res[a, a + lag] = res[a + lag, a] = cumsum[n + a + 1] - cumsum[a]
+    return res / (n + 1)
+
+
+def proj(
+    m: int, x: np.ndarray, sigma: np.ndarray, isigma: np.ndarray | None = None
+) -> NDArray[floating[Any]]:
     """
     Функция для расчета проективной матрицы на пространство, определяемое
     матрицей x.
@@ -130,6 +165,9 @@ def proj(m: int, x: np.ndarray, sigma: np.ndarray) -> NDArray[floating[Any]]:
     sigma : np.ndarray
         Ковариационная матрица размера m*m.
 
+    isigma : np.ndarray | None
+        Обратная к sigma матрица, если она уже посчитана.
+
     Returns
     -------
     np.ndarray
@@ -138,7 +176,8 @@ def proj(m: int, x: np.ndarray, sigma: np.ndarray) -> NDArray[floating[Any]]:
     assert isinstance(x, np.ndarray), "X should be NDarray"
     assert m == x.shape[0], "not enough observations"
 
-    isigma = inv(sigma)
+    if isigma is None:
+        isigma = inv(sigma)
 
     if m < x.shape[1]:
         return isigma
@@ -153,7 +192,103 @@ def inverse(A):
     return b
 
 
-def andrews_eos_test(formula: str, data: pd.DataFrame, m: int = 1) -> EOSResult:
+def batch_inverse(A: np.ndarray) -> NDArray[floating[Any]]:
+    """
+    Обращение набора матриц X'X формы (T, k, k). Как и в inverse, при вырожденности
+    используется псевдообратная матрица.
+    """
+    try:
+        return inv(A)
+    except np.linalg.LinAlgError:
+        return pinv(A)
+
+
+def block_sums(x: np.ndarray, width: int) -> NDArray[floating[Any]]:
+    """
+    Суммы x[t:t + width] по первой оси для всех t = 0..len(x) - width.
+    """
+    return sliding_window_view(x, width, axis=0).sum(axis=-1)
+
+
+def subsample_stats(
+    X: np.ndarray, Y: np.ndarray, m: int, isigma: np.ndarray
+) -> dict[str, NDArray[floating[Any]]]:
+    """
+    Функция для расчета статистик теста на всех подвыборках начальной части выборки.
+
+    Для каждого t оценки МНК без блока наблюдений [t, t + m) (и без [t, t + ceil(m/2)))
+    получаются вычитанием вклада блока из X'X и X'Y всей начальной выборки (rank-m downdate),
+    вместо нового МНК на каждой подвыборке. SIGMA обращается один раз снаружи.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Матрица объясняющих переменных начальной выборки размера n*k.
+
+    Y : np.ndarray
+        Вектор-столбец зависимой переменной начальной выборки.
+
+    m : int
+        Длина тестируемого хвоста.
+
+    isigma : np.ndarray
+        Обратная ковариационная матрица ошибок хвоста размера m*m.
+
+    Returns
+    -------
+    dict[str, NDArray[floating[Any]]]
+        Значения статистик Sa, Sb, Sc, Sd, R для t = 0..n-m.
+    """
+    n, k = X.shape
+    y = Y[:, 0]
+    n_sub = n - m + 1
+
+    XX = X[:, :, None] * X[:, None, :]
+    XY = X * y[:, None]
+    XX_full, XY_full = XX.sum(axis=0), XY.sum(axis=0)
+
+    def leave_block_out(width: int) -> NDArray[floating[Any]]:
+        XX_sub = XX_full - block_sums(XX, width)[:n_sub]
+        XY_sub = XY_full - block_sums(XY, width)[:n_sub]
+        return (batch_inverse(XX_sub) @ XY_sub[:, :, None])[:, :, 0]
+
+    _b1 = leave_block_out(m)
+    _b2 = leave_block_out(int(np.ceil(m / 2)))
+
+    # блоки [t, t + m): (n_sub, m, k) и (n_sub, m)
+    _X = sliding_window_view(X, m, axis=0).transpose(0, 2, 1)
+    _Y = sliding_window_view(y, m)
+
+    _resid1 = _Y - np.einsum("tik,tk->ti", _X, _b1)
+    _resid2 = _Y - np.einsum("tik,tk->ti", _X, _b2)
+
+    if m < k:
+        Sc = np.einsum("ti,ij,tj->t", _resid1, isigma, _resid1)
+        Sd = np.einsum("ti,ij,tj->t", _resid2, isigma, _resid2)
+    else:
+        # r' PROJ r = z' (X' isigma X)^-1 z, z = X' isigma r
+        _W = isigma @ _X
+        _M = inv(_X.transpose(0, 2, 1) @ _W)
+        z1 = np.einsum("tik,ti->tk", _W, _resid1)
+        z2 = np.einsum("tik,ti->tk", _W, _resid2)
+        Sc = np.einsum("tk,tkl,tl->t", z1, _M, z1)
+        Sd = np.einsum("tk,tkl,tl->t", z2, _M, z2)
+
+    return {
+        "Sa": np.sum(_resid1 ** 2, axis=1),
+        "Sb": np.sum(_resid2 ** 2, axis=1),
+        "Sc": Sc,
+        "Sd": Sd,
+        "R": np.sum(np.cumsum(_resid2[:, ::-1], axis=1) ** 2, axis=1),
+    }
+
+
+def andrews_eos_test(
+    formula: str,
+    data: pd.DataFrame,
+    m: int = 1,
+    cov: Callable[[np.ndarray, int], NDArray[floating[Any]]] = sigma_lagged,
+) -> EOSResult:
     """
     Основная функция, в которой реализуется тест на наличие структурных изменений
     в конце выборки[1]_[2]_.
@@ -169,6 +304,9 @@ def andrews_eos_test(formula: str, data: pd.DataFrame, m: int = 1) -> EOSResult:
     m : int
         Длина тестируемого хвоста.
 
+    cov : Callable[[np.ndarray, int], NDArray]
+        Оценка ковариационной матрицы ошибок хвоста: sigma_lagged или sigma.
+
     Returns
     -------
     EOSResult
@@ -218,8 +356,9 @@ def andrews_eos_test(formula: str, data: pd.DataFrame, m: int = 1) -> EOSResult:
     _b0 = inverse(_X0) @ _X0.T @ _Y0
     _b = inverse(X) @ X.T @ Y
 
-    SIGMA = sigma(Y - X @ _b, m)
-    PROJ = proj(m, _X1, SIGMA)
+    SIGMA = cov(Y - X @ _b, m)
+    isigma = inv(SIGMA)
+    PROJ = proj(m, _X1, SIGMA, isigma)
 
     _resid0 = _Y1 - _X1 @ _b0
     _resid = _Y1 - _X1 @ _b
@@ -231,27 +370,8 @@ def andrews_eos_test(formula: str, data: pd.DataFrame, m: int = 1) -> EOSResult:
     result.stats["R"] = float(np.sum(np.cumsum(_resid[::-1, :]) ** 2))
 
     # SubSampling
-    for t in range(n - m + 1):
-        smpl1 = [i for i in range(n) if not (t <= i < t + m)]
-        smpl2 = [i for i in range(n) if not (t <= i < t + np.ceil(m / 2))]
-        smpl = list(range(t, t + m))
-
-        _X1, _X2, _X = X[smpl1, :], X[smpl2, :], X[smpl, :]
-        _Y1, _Y2, _Y = Y[smpl1, :], Y[smpl2, :], Y[smpl, :]
-
-        _PROJ = proj(m, _X, SIGMA)
-
-        _b1 = inverse(_X1) @ _X1.T @ _Y1
-        _b2 = inverse(_X2) @ _X2.T @ _Y2
-
-        _resid1 = _Y - _X @ _b1
-        _resid2 = _Y - _X @ _b2
-
-        result.substats["Sa"].append((_resid1.T @ _resid1).item())
-        result.substats["Sb"].append((_resid2.T @ _resid2).item())
-        result.substats["Sc"].append((_resid1.T @ _PROJ @ _resid1).item())
-        result.substats["Sd"].append((_resid2.T @ _PROJ @ _resid2).item())
-        result.substats["R"].append(float(np.sum(np.cumsum(_resid2[::-1, :]) ** 2)))
+    for name, values in subsample_stats(X[:n, :], Y[:n, :], m, isigma).items():
+        result.substats[name] = values.tolist()
 
     for s in ["Sa", "Sb", "Sc", "Sd", "R"]:
         try:
@@ -288,7 +408,7 @@ class KimAndrewsAdapter:
             df["t"] = range(len(df))
         df = df.iloc[-(n + m + shift):]
 
-        results = andrews_eos_test(formula, df, m)
+        results = andrews_eos_test(formula, df, m, cov=sigma_lagged)
         return KimAndrewsResult(
             Sa_values=ResultValues(
                 p_value=round(results.pval["Sa"], 4),
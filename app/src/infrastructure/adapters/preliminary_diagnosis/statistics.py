@@ -1,10 +1,11 @@
 import pandas as pd
 
 from src.core.application.preliminary_diagnosis.schemas.statistics import StatisticResult, \
-    StatisticsRequest, StatisticsResponse, RusStatMetricEnum, SplitOption, get_russian_metric
+    StatisticsRequest, StatisticsResponse, RusStatMetricEnum, SplitOption, get_russian_metric, \
+    StatisticsTableRequest, StatisticsTableResponse
 from src.core.domain import Timeseries
 from src.infrastructure.adapters.timeseries import PandasTimeseriesAdapter
-from src.infrastructure.factories.statistics.factory import StatisticsFactory
+from src.infrastructure.factories.statistics import SeriesMoments, StatisticsFactory
 import numpy as np
 
 class StatisticsAdapter:
@@ -31,23 +32,54 @@ class StatisticsAdapter:
             SplitOption.DECILE: 10
         }
         parts = split_map.get(request.split_option, None)
+        values = ts[request.timeseries.name].to_numpy(dtype=float)
+        labels = None
         if parts:
-            ts['group'] = pd.qcut(ts[request.timeseries.name], q=parts, labels=False, duplicates='drop')
-        else:
-            ts['group'] = 'full series'
+            labels = pd.qcut(values, q=parts, labels=False, duplicates='drop').astype(float)
+
+        # ряд сортируется и моменты считаются один раз, каждая статистика считается сразу для всех групп
+        moments = SeriesMoments(values, labels)
+        columns = [self._statistics_fabric.get_group_values(moments=moments, statistic=stat) for stat in rus_metrics]
 
         result_dict = {}
-        for group_num, group_df in ts.groupby('group'):
+        for group, group_num in enumerate(moments.labels):
             if parts:
-                group_name = f"{group_num + 1} {request.split_option.value}"
+                group_name = f"{int(group_num) + 1} {request.split_option.value}"
             else:
                 group_name = 'full series'
-            df = group_df[request.timeseries.name].to_numpy()
-            values = [
-                self._statistics_fabric.get_value(
-                    ts=df,
-                    statistic=stat
-                ) for stat in rus_metrics
-            ]
-            result_dict[group_name] = dict(zip(request.metrics, values))
-        return StatisticsResponse(results=result_dict)
\ No newline at end of file
+            result_dict[group_name] = {
+                metric: StatisticResult(value=column[group]) for metric, column in zip(request.metrics, columns)
+            }
+        return StatisticsResponse(results=result_dict)
+
+    def execute_table(self, request: StatisticsTableRequest) -> StatisticsTableResponse:
+        """
+        Статистики для многих рядов на общей сетке дат.
+
+        Ряды - группы одного SeriesMoments: сортировка и моменты считаются один раз для всей матрицы,
+        и каждая статистика считается сразу для всех рядов. Если статистику для ряда посчитать нельзя
+        (одно наблюдение для дисперсии, пустой ряд для всего, кроме числа наблюдений), в таблице для него None.
+        """
+        # столбцы упорядочиваются по датам, чтобы последнее наблюдение было последним по времени
+        order = np.argsort(np.array(request.dates, dtype='datetime64[D]'), kind='stable')
+        values = np.array(request.values, dtype=float)[:, order]
+        # как в Timeseries (validate_float_param): бесконечности - пропуски, значения округляются до 4 знаков
+        values = np.where(np.isfinite(values), np.round(values, 4), np.nan)
+        n_series, n_dates = values.shape
+        labels = np.repeat(np.arange(n_series, dtype=float), n_dates)
+
+        moments = SeriesMoments(values.ravel(), labels)
+        # ряды без наблюдений в moments не попадают, для них определено только число наблюдений (0)
+        series = moments.labels.astype(int)
+        table = {}
+        for metric in request.metrics:
+            statistic = get_russian_metric(metric)
+            if statistic == RusStatMetricEnum.N_OBS:
+                table[metric] = np.count_nonzero(~np.isnan(values), axis=1).tolist()
+                continue
+
+            table[metric] = [None] * n_series
+            column = self._statistics_fabric.get_group_values(moments=moments, statistic=statistic)
+            for series_num, value in zip(series, column):
+                table[metric][series_num] = value
+        return StatisticsTableResponse(names=request.names, results=table)
@@ -1,5 +1,7 @@
 from .interface import ModelSerializer
 from .pickle_serializer import PickleSerializer
+from .compact_serializer import CompactSerializer, Codec
+from .model_cache import ModelCache, ModelCacheStats, model_size
 
 
-__all__ = ('ModelSerializer', 'PickleSerializer')
+__all__ = ('ModelSerializer', 'PickleSerializer', 'CompactSerializer', 'Codec', 'ModelCache', 'ModelCacheStats', 'model_size')
@@ -0,0 +1,166 @@
+import pickle
+import struct
+import zlib
+from enum import IntEnum
+from typing import Any
+
+from neuralforecast import NeuralForecast
+from neuralforecast.common._base_model import BaseModel, _disable_torch_init
+from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResultsWrapper
+
+from .interface import ModelSerializer, T
+
+try:
+    import zstandard
+except ImportError:  # zstd - необязательная зависимость
+    zstandard = None
+
+
+class Codec(IntEnum):
+    none = 0
+    zlib = 1
+    zstd = 2
+
+
+class CompactSerializer(ModelSerializer):
+    """
+    Компактный формат моделей: хранится только то, что нужно для прогноза.
+
+    - SARIMAX: спецификация модели, оцененные параметры и обучающая выборка. Результаты фильтра
+      (матрицы состояний на каждую точку) не хранятся, а пересчитываются одним проходом фильтра Калмана.
+    - модели neuralforecast: гиперпараметры и state_dict, как в BaseModel.save, и настройки NeuralForecast
+      без датасета и trainer'а.
+    - словари (архив моделей V2) кодируются поэлементно, остальное - обычным pickle.
+
+    Формат: MAGIC, версия, кодек сжатия, затем сжатое описание модели.
+    Байты без MAGIC считаются старым форматом PickleSerializer, поэтому ранее сохраненные модели читаются.
+    """
+
+    MAGIC = b'IMFS'
+    VERSION = 1
+    _header = struct.Struct('<4sBB')
+
+    def __init__(self, codec: Codec | None = None, level: int = 3):
+        # по умолчанию zstd, если он установлен. zlib веса float32 почти не сжимает, а распаковка
+        # стоит дороже чтения несжатых байт, поэтому без zstd модели сохраняются без сжатия
+        if codec is None:
+            codec = Codec.zstd if zstandard is not None else Codec.none
+        if codec == Codec.zstd and zstandard is None:
+            raise ValueError('Для сжатия zstd нужен пакет zstandard')
+        self.codec = codec
+        self.level = level
+
+    def serialize(self, model: T) -> bytes:
+        payload = pickle.dumps(self._encode(model, memo={}), protocol=pickle.HIGHEST_PROTOCOL)
+        return self._header.pack(self.MAGIC, self.VERSION, self.codec) + self._compress(payload)
+
+    def deserialize(self, serialized_model: bytes) -> T:
+        if not serialized_model.startswith(self.MAGIC):
+            return pickle.loads(serialized_model)
+
+        _, version, codec = self._header.unpack_from(serialized_model)
+        if version != self.VERSION:
+            raise ValueError(f'Неподдерживаемая версия формата модели: {version}')
+
+        payload = self._decompress(memoryview(serialized_model)[self._header.size:], Codec(codec))
+        return self._decode(pickle.loads(payload), memo={})
+
+    def _compress(self, payload: bytes) -> bytes:
+        match self.codec:
+            case Codec.zstd:
+                return zstandard.ZstdCompressor(level=self.level).compress(payload)
+            case Codec.zlib:
+                return zlib.compress(payload, self.level)
+        return payload
+
+    @staticmethod
+    def _decompress(payload: memoryview, codec: Codec) -> bytes:
+        match codec:
+            case Codec.zstd:
+                if zstandard is None:
+                    raise ValueError('Модель сжата zstd, а пакет zstandard не установлен')
+                return zstandard.ZstdDecompressor().decompress(payload)
+            case Codec.zlib:
+                return zlib.decompress(payload)
+        return bytes(payload)
+
+    def _encode(self, model: Any, memo: dict[int, dict]) -> dict:
+        # объект, на который ссылаются несколько раз (например, модель и в nf, и в архиве V2), кодируется один раз,
+        # pickle сохранит его описание один раз, а _decode восстановит общую ссылку
+        if id(model) not in memo:
+            memo[id(model)] = self._encode_object(model, memo)
+        return memo[id(model)]
+
+    def _encode_object(self, model: Any, memo: dict[int, dict]) -> dict:
+        if isinstance(model, SARIMAXResultsWrapper):
+            return {
+                'kind': 'sarimax',
+                'spec': model.model._get_init_kwds(),
+                'params': model.params,
+                'endog': model.model.data.orig_endog,
+                'exog': model.model.data.orig_exog,
+            }
+        if isinstance(model, NeuralForecast):
+            # как NeuralForecast.save: даты обучающего датасета остаются, сам датасет - нет
+            dates = {attr: getattr(model, attr) for attr in ('uids', 'last_dates', 'ds') if hasattr(model, attr)}
+            return {
+                'kind': 'neuralforecast',
+                'models': [self._encode(m, memo) for m in model.models],
+                'config': dates | {
+                    'h': model.h,
+                    'freq': model.freq,
+                    'local_scaler_type': model.local_scaler_type,
+                    'scalers_': getattr(model, 'scalers_', {}),
+                    'id_col': model.id_col,
+                    'time_col': model.time_col,
+                    'target_col': model.target_col,
+                    'prediction_intervals': getattr(model, 'prediction_intervals', None),
+                    '_cs_df': getattr(model, '_cs_df', None),
+                    '_fitted': model._fitted,
+                },
+            }
+        if isinstance(model, BaseModel):
+            return {
+                'kind': 'neural_model',
+                'class': type(model),
+                'alias': model.alias,
+                'hparams': dict(model.hparams),
+                'state_dict': model.state_dict(),
+            }
+        if isinstance(model, dict):
+            return {'kind': 'dict', 'items': {key: self._encode(value, memo) for key, value in model.items()}}
+        return {'kind': 'pickle', 'model': model}
+
+    def _decode(self, data: dict, memo: dict[int, Any]) -> Any:
+        if id(data) not in memo:
+            memo[id(data)] = self._decode_object(data, memo)
+        return memo[id(data)]
+
+    def _decode_object(self, data: dict, memo: dict[int, Any]) -> Any:
+        match data['kind']:
+            case 'sarimax':
+                model = SARIMAX(data['endog'], exog=data['exog'], **data['spec'])
+                # ковариация параметров для прогноза не нужна, ее численный расчет дорогой
+                return model.filter(data['params'], cov_type='none')
+            case 'neuralforecast':
+                config = data['config']
+                nf = NeuralForecast(
+                    models=[self._decode(m, memo) for m in data['models']],
+                    freq=config['freq'],
+                    local_scaler_type=config['local_scaler_type'],
+                )
+                for attr, value in config.items():
+                    setattr(nf, attr, value)
+                return nf
+            case 'neural_model':
+                # как BaseModel.load, только без файла: веса не инициализируются, их сразу заменяет state_dict
+                with _disable_torch_init():
+                    model = data['class'](**data['hparams'])
+                model.load_state_dict(data['state_dict'], strict=True, assign=True)
+                model.alias = data['alias']
+                return model
+            case 'dict':
+                return {key: self._decode(value, memo) for key, value in data['items'].items()}
+            case 'pickle':
+                return data['model']
+        raise ValueError(f'Неизвестный тип модели в файле: {data["kind"]}')
@@ -0,0 +1,169 @@
+import hashlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+from src.infrastructure.logs import logger
+
+
+@dataclass(frozen=True)
+class ModelCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_bytes: int
+
+
+class _ByteCounter:
+    """Файл только для записи, который считает байты и ничего не хранит"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data) -> int:
+        # протокол 5 пишет большие буферы (PickleBuffer) напрямую, у них нет len
+        size = memoryview(data).nbytes
+        self.size += size
+        return size
+
+
+def _buffer_nbytes(obj: Any) -> Optional[int]:
+    """Размер данных массива numpy или тензора torch, None для остальных объектов"""
+    if isinstance(obj, np.ndarray) and obj.dtype != object:
+        return obj.nbytes
+    # torch не импортируем ради проверки: тензоры бывают только у моделей, которые его уже загрузили
+    torch = sys.modules.get('torch')
+    if torch is not None and isinstance(obj, torch.Tensor):
+        return obj.element_size() * obj.nelement()
+    return None
+
+
+class _SizePickler(pickle.Pickler):
+    """
+    Pickler, который не сериализует массивы и тензоры, а только складывает их размер.
+    Каждый массив учитывается один раз, даже если на него ссылаются несколько объектов модели.
+    """
+
+    def __init__(self, file: _ByteCounter):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.buffers_size = 0
+        self._seen: set[int] = set()
+
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        nbytes = _buffer_nbytes(obj)
+        if nbytes is None:
+            return None
+        if id(obj) not in self._seen:
+            self._seen.add(id(obj))
+            self.buffers_size += nbytes
+        return id(obj)
+
+
+def model_size(model: Any) -> int:
+    """
+    Оценка памяти, которую занимает модель: размер данных ее массивов и тензоров
+    плюс размер pickle остальных объектов. Массивы не копируются и не сериализуются.
+    Размер файла модели для этого не годится: компактный формат хранит только параметры,
+    а при загрузке модель пересчитывает результаты фильтра, которые в сотни раз больше файла.
+    """
+    counter = _ByteCounter()
+    pickler = _SizePickler(counter)
+    pickler.dump(model)
+    return counter.size + pickler.buffers_size
+
+
+class ModelCache:
+    """
+    LRU-кэш десериализованных моделей, ключ - хэш содержимого файла модели.
+
+    Предсказание повторно с тем же файлом модели не платит за десериализацию.
+    Адаптеры прогноза меняют состояние модели во время прогноза (датасет, горизонт, trainer),
+    поэтому экземпляр модели выдается одному запросу за раз: на время checkout он извлекается из кэша
+    и возвращается в него после прогноза. Параллельный запрос с той же моделью получает свою копию.
+
+    Кэш ограничен числом моделей и суммарной оценкой их размера в памяти (sizeof, по умолчанию model_size).
+    Оценка считается один раз, когда модель впервые попадает в кэш.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, sizeof: Callable[[Any], int] = model_size):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._log = logger.getChild(self.__class__.__name__)
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @contextmanager
+    def checkout(self, model_bytes: bytes, load: Callable[[bytes], Any]) -> Iterator[Any]:
+        """Модель из кэша или, если ее нет, результат load(model_bytes)"""
+        key = hashlib.sha256(model_bytes).hexdigest()
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size_bytes -= entry.size_bytes
+                self._hits += 1
+            else:
+                self._misses += 1
+        self._log.info(msg=f'Модель {key[:12]}: {"из кэша" if entry is not None else "десериализуем"}, {self.stats()}')
+
+        model = entry.model if entry is not None else load(model_bytes)
+        yield model
+
+        # модель возвращается в кэш только после успешного прогноза
+        if self._max_entries > 0:
+            size_bytes = entry.size_bytes if entry is not None else self._size_of(model, model_bytes)
+            self._put(key, _Entry(model=model, size_bytes=size_bytes))
+
+    def _size_of(self, model: Any, model_bytes: bytes) -> int:
+        try:
+            return self._sizeof(model)
+        except Exception as exc:
+            # модель, которую нельзя оценить, считаем хотя бы по размеру файла
+            self._log.warning(msg=f'Не удалось оценить размер модели: {exc!r}')
+            return len(model_bytes)
+
+    def stats(self) -> ModelCacheStats:
+        with self._lock:
+            return ModelCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def _put(self, key: str, entry: _Entry) -> None:
+        if self._max_entries <= 0 or entry.size_bytes > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                # пока модель была выдана, параллельный запрос уже вернул свою копию
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = entry
+            self._size_bytes += entry.size_bytes
+            while len(self._entries) > self._max_entries or self._size_bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+                self._evictions += 1
@@ -3,12 +3,12 @@ from typing import List, Optional
 
 import numpy as np
 import pandas as pd
-from scipy.stats import f
 
 from src.core.domain import DataFrequency
 from src.core.domain.stat_test import Frequency2SeriesSize, Conclusion, SignificanceLevel
 from src.core.domain.stat_test.fisher import FisherTestResult
 from src.core.domain.stat_test.fisher.errors import InsufficientDataError, InvalidDateError
+from src.infrastructure.adapters.stat_tests.monitoring import SegmentMoments, fisher_split_tests
 
 
 class FisherTestAdapter:
@@ -65,33 +65,10 @@ class FisherTestAdapter:
             series_size: int,
             alpha: float
     ) -> List[FisherTestResult]:
-        results: List[FisherTestResult] = []
-        series_values = series.astype(float).values
-
-        # первый элемент — всегда NaN без даты
-        results.append(self._create_nan_result())
+        results: List[FisherTestResult] = [self._create_nan_result()]
 
         points_after_boundary = len(series) - boundary_idx
-        # счётчик реальных тестов (для вычисления дат, как в коде коллеги)
-        test_index = 0
-
-        for i in range(2, points_after_boundary - 1):
-            data1 = series_values[-i:]
-            data2 = series_values[-boundary_idx:-i]
-
-            if len(data1) < 2 or len(data2) < 2:
-                continue
-
-            F_stat = np.var(data1, ddof=1) / np.var(data2, ddof=1)
-            df1 = len(data1) - 1
-            df2 = len(data2) - 1
-            p_val = f.cdf(F_stat, df1, df2)
-
-            # дата по логике коллеги: df.iloc[-3 - i, 0]
-            dt = self._get_result_datetime(series.index, test_index)
-            results.append(self._create_test_result(p_val, F_stat, alpha, dt))
-
-            test_index += 1
+        results.extend(self._split_tests(series, boundary_idx, np.arange(2, points_after_boundary - 1), alpha))
 
         # последний элемент — NaN без даты (как "хвост" в вашем текущем коде)
         results.append(self._create_nan_result())
@@ -109,32 +86,10 @@ class FisherTestAdapter:
             series_size: int,
             alpha: float
     ) -> List[FisherTestResult]:
-        results: List[FisherTestResult] = []
-        series_values = series.astype(float).values
-
-        # первый элемент — всегда NaN без даты
-        results.append(self._create_nan_result())
-
-        # здесь количество тестов = series_size - 1 (как a - 1 в коде коллеги)
-        test_index = 0
-
-        for i in range(2, series_size + 1):
-            data1 = series_values[-i:]
-            data2 = series_values[-boundary_idx:-i]
-
-            if len(data1) < 2 or len(data2) < 2:
-                continue
-
-            F_stat = np.var(data1, ddof=1) / np.var(data2, ddof=1)
-            df1 = len(data1) - 1
-            df2 = len(data2) - 1
-            p_val = f.cdf(F_stat, df1, df2)
-
-            # дата по логике коллеги: df.iloc[-3 - i, 0]
-            dt = self._get_result_datetime(series.index, test_index)
-            results.append(self._create_test_result(p_val, F_stat, alpha, dt))
-
-            test_index += 1
+        # первый элемент — всегда NaN без даты.
+        # Здесь количество тестов = series_size - 1 (как a - 1 в коде коллеги)
+        results: List[FisherTestResult] = [self._create_nan_result()]
+        results.extend(self._split_tests(series, boundary_idx, np.arange(2, series_size + 1), alpha))
 
         # если по какой-то причине тестов оказалось меньше series_size,
         # добавляем один NaN результат без даты (как и раньше)
@@ -143,6 +98,34 @@ class FisherTestAdapter:
 
         return results
 
+    def _split_tests(
+            self,
+            series: pd.Series,
+            boundary_idx: int,
+            splits: np.ndarray,
+            alpha: float
+    ) -> List[FisherTestResult]:
+        """
+        Тесты для точек разбиения i: data1 = values[-i:], data2 = values[-boundary_idx:-i].
+        Разбиения, где в одной из выборок меньше двух точек, пропускаются.
+        """
+        n_obs = len(series)
+        moments = SegmentMoments(series.astype(float).values)
+
+        # границы срезов, как у values[-i:] и values[-boundary_idx:-i]
+        stop2 = np.maximum(n_obs - splits, 0)
+        start2 = max(n_obs - boundary_idx, 0) if boundary_idx else 0
+        is_valid = (n_obs - stop2 >= 2) & (stop2 - start2 >= 2)
+        stop2 = stop2[is_valid]
+
+        F_stats, p_values = fisher_split_tests(moments, stop2, n_obs, start2, stop2)
+
+        # дата по логике коллеги: df.iloc[-3 - i, 0]
+        return [
+            self._create_test_result(float(p_val), float(F_stat), alpha, self._get_result_datetime(series.index, test_index))
+            for test_index, (F_stat, p_val) in enumerate(zip(F_stats, p_values))
+        ]
+
     def _get_result_datetime(
             self,
             index: pd.DatetimeIndex,
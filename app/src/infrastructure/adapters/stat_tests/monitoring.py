@@ -0,0 +1,108 @@
+import numpy as np
+from scipy.stats import f, t
+
+
+class SegmentMoments:
+    """
+    Моменты любого отрезка ряда за O(1) по префиксным суммам x и x².
+
+    Тесты мониторинга сравнивают выборки по всем точкам разбиения ряда. Префиксные суммы считаются
+    один раз, после чего среднее и дисперсия всех отрезков получаются одним векторным вызовом.
+    Перед суммированием ряд сдвигается на свое среднее, чтобы разность сумм не теряла точность на рядах
+    с большим уровнем.
+
+    Отрезок [start, stop) задается, как срез values[start:stop]; start и stop могут быть массивами.
+    Отрезок с бесконечным значением дает NaN, как np.var. NaN тоже дает NaN, а при skipna
+    пропускается (как dropna перед расчетом).
+    """
+
+    def __init__(self, values: np.ndarray, skipna: bool = False):
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        shift = values[finite].mean() if finite.any() else 0.0
+        centred = np.where(finite, values - shift, 0.0)
+
+        self._shift = shift
+        is_nan = np.isnan(values)
+        self._count = self._prefix(~is_nan if skipna else np.ones_like(finite))
+        self._bad = self._prefix(~finite & ~is_nan if skipna else ~finite)
+        self._s1 = self._prefix(centred)
+        self._s2 = self._prefix(centred ** 2)
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        return np.concatenate([[0], np.cumsum(values)])
+
+    def count(self, start, stop) -> np.ndarray:
+        return self._count[stop] - self._count[start]
+
+    def mean(self, start, stop) -> np.ndarray:
+        count = self.count(start, stop)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = (self._s1[stop] - self._s1[start]) / count + self._shift
+        return np.where(self._bad[stop] > self._bad[start], np.nan, mean)
+
+    def var(self, start, stop, ddof: int = 0) -> np.ndarray:
+        count = self.count(start, stop)
+        s1 = self._s1[stop] - self._s1[start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ss = np.maximum(self._s2[stop] - self._s2[start] - s1 ** 2 / count, 0.0)
+            var = ss / (count - ddof)
+        return np.where((self._bad[stop] > self._bad[start]) | (count <= ddof), np.nan, var)
+
+
+def fisher_split_tests(
+        moments: SegmentMoments,
+        start1: np.ndarray,
+        stop1: np.ndarray,
+        start2: np.ndarray,
+        stop2: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """F-статистики var(x[start1:stop1]) / var(x[start2:stop2]) и их функции распределения"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = moments.var(start1, stop1, ddof=1) / moments.var(start2, stop2, ddof=1)
+    dfn = moments.count(start1, stop1) - 1
+    dfd = moments.count(start2, stop2) - 1
+    return statistic, f.cdf(statistic, dfn, dfd)
+
+
+def student_split_tests(
+        moments: SegmentMoments,
+        start1: np.ndarray,
+        stop1: np.ndarray,
+        start2: np.ndarray,
+        stop2: np.ndarray,
+        equal_var: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """t-статистики и двусторонние p-значения сравнения средних двух отрезков, как scipy.stats.ttest_ind"""
+    n1 = moments.count(start1, stop1)
+    n2 = moments.count(start2, stop2)
+    v1 = moments.var(start1, stop1, ddof=1)
+    v2 = moments.var(start2, stop2, ddof=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if equal_var:
+            df = n1 + n2 - 2.0
+            denom = np.sqrt(((n1 - 1) * v1 + (n2 - 1) * v2) / df * (1.0 / n1 + 1.0 / n2))
+        else:
+            vn1, vn2 = v1 / n1, v2 / n2
+            df = (vn1 + vn2) ** 2 / (vn1 ** 2 / (n1 - 1) + vn2 ** 2 / (n2 - 1))
+            # при нулевых дисперсиях df не важна, лишь бы не NaN
+            df = np.where(np.isnan(df), 1.0, df)
+            denom = np.sqrt(vn1 + vn2)
+        statistic = (moments.mean(start1, stop1) - moments.mean(start2, stop2)) / denom
+
+    return statistic, 2 * t.sf(np.abs(statistic), df)
+
+
+def student_point_tests(
+        moments: SegmentMoments,
+        start: np.ndarray,
+        stop: np.ndarray,
+        popmean: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """t-статистики и двусторонние p-значения сравнения среднего отрезка с точкой, как scipy.stats.ttest_1samp"""
+    n = moments.count(start, stop)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistic = (moments.mean(start, stop) - popmean) / np.sqrt(moments.var(start, stop, ddof=1) / n)
+    return statistic, 2 * t.sf(np.abs(statistic), n - 1)
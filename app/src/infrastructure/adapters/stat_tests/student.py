@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import ttest_ind, ttest_1samp
 from typing import List
 from datetime import datetime
 
@@ -8,6 +7,7 @@ from src.core.domain import DataFrequency
 from src.core.domain.stat_test import Frequency2SeriesSize
 from src.core.domain.stat_test.conclusion import Conclusion
 from src.core.domain.stat_test.student import InvalidDateError, StudentTestResult
+from src.infrastructure.adapters.stat_tests.monitoring import SegmentMoments, student_point_tests, student_split_tests
 
 
 class StudentTestAdapter:
@@ -65,23 +65,13 @@ class StudentTestAdapter:
             equal_var: bool,
             alpha: float
     ) -> List[StudentTestResult]:
-        results = []
-
-        # тест для последней точки
-        if boundary_idx < len(df) - 1:
-            test_result = ttest_1samp(df.obs.iloc[boundary_idx:-1], df.obs.iloc[-1])
-            results.append(self._create_test_result(test_result, alpha, df.iloc[-1, 0]))
-
-        # тесты для тела (ttest_ind)
-        for i in range(2, len(df) - boundary_idx - 1):
-            if boundary_idx < len(df) - i:
-                test_result = ttest_ind(df.obs.iloc[boundary_idx:-i], df.obs.iloc[-i:], equal_var=equal_var)
-                results.append(self._create_test_result(test_result, alpha, df.iloc[-2 - (len(results)), 0]))
+        results = self._split_tests(df, boundary_idx, np.arange(2, len(df) - boundary_idx - 1), equal_var, alpha)
 
         # тест для первой точки
         if boundary_idx < len(df) - 2:
-            test_result = ttest_1samp(df.obs.iloc[boundary_idx + 1:-1], df.obs.iloc[boundary_idx])
-            results.append(self._create_test_result(test_result, alpha, df.iloc[boundary_idx, 0]))
+            moments = SegmentMoments(df.obs.values)
+            statistic, p_value = student_point_tests(moments, boundary_idx + 1, len(df) - 1, df.obs.iloc[boundary_idx])
+            results.append(self._create_test_result(statistic, p_value, alpha, df.iloc[boundary_idx, 0]))
 
         return results
         # return self._pad_results(results, series_size)
@@ -94,27 +84,46 @@ class StudentTestAdapter:
             equal_var: bool,
             alpha: float
     ) -> List[StudentTestResult]:
+        results = self._split_tests(df, boundary_idx, np.arange(2, series_size + 1), equal_var, alpha)
+        return self._pad_results(results, series_size)
+
+    def _split_tests(
+            self,
+            df: pd.DataFrame,
+            boundary_idx: int,
+            splits: np.ndarray,
+            equal_var: bool,
+            alpha: float
+    ) -> List[StudentTestResult]:
+        """
+        Тест для последней точки (ttest_1samp) и тесты для тела (ttest_ind obs[boundary_idx:-i] против obs[-i:])
+        по всем точкам разбиения i сразу.
+        """
+        n_obs = len(df)
+        moments = SegmentMoments(df.obs.values)
         results = []
 
         # тест для последней точки
-        if boundary_idx < len(df) - 1:
-            test_result = ttest_1samp(df.obs.iloc[boundary_idx:-1], df.obs.iloc[-1])
-            results.append(self._create_test_result(test_result, alpha, df.iloc[-1, 0]))
+        if boundary_idx < n_obs - 1:
+            statistic, p_value = student_point_tests(moments, boundary_idx, n_obs - 1, df.obs.iloc[-1])
+            results.append(self._create_test_result(statistic, p_value, alpha, df.iloc[-1, 0]))
 
         # тесты для тела (ttest_ind)
-        for i in range(2, series_size + 1):
-            if boundary_idx < len(df) - i:
-                test_result = ttest_ind(df.obs.iloc[boundary_idx:-i], df.obs.iloc[-i:], equal_var=equal_var)
-                results.append(self._create_test_result(test_result, alpha, df.iloc[-2 - (len(results)), 0]))
+        splits = splits[boundary_idx < n_obs - splits]
+        statistics, p_values = student_split_tests(
+            moments, boundary_idx, n_obs - splits, n_obs - splits, n_obs, equal_var=equal_var
+        )
+        for statistic, p_value in zip(statistics, p_values):
+            results.append(self._create_test_result(statistic, p_value, alpha, df.iloc[-2 - (len(results)), 0]))
 
-        return self._pad_results(results, series_size)
+        return results
 
-    def _create_test_result(self, test_result, alpha: float, date: datetime) -> StudentTestResult:
-        conclusion = Conclusion.reject if test_result.pvalue < alpha else Conclusion.fail_to_reject
+    def _create_test_result(self, statistic: float, p_value: float, alpha: float, date: datetime) -> StudentTestResult:
+        conclusion = Conclusion.reject if p_value < alpha else Conclusion.fail_to_reject
         return StudentTestResult(
             datetime=pd.to_datetime(date),
-            p_value=float(test_result.pvalue),
-            statistic=float(test_result.statistic),
+            p_value=float(p_value),
+            statistic=float(statistic),
             conclusion=conclusion
         )
 
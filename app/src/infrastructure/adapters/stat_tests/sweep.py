@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Iterator, Optional
+
+import pandas as pd
+
+from src.core.domain import DataFrequency
+from src.infrastructure.adapters.stat_tests.fisher import FisherTestAdapter
+from src.infrastructure.adapters.stat_tests.student import StudentTestAdapter
+from src.infrastructure.adapters.stat_tests.two_sigma import TwoSigmaTestAdapter
+from src.infrastructure.adapters.structural_shifts.break_finder import BreakFinderAdapter
+from src.infrastructure.logs import logger
+
+
+@dataclass(frozen=True)
+class SweepTask:
+    """
+    Один тест для одного ряда.
+
+    test - значение MonitoringTest, params - параметры теста (alpha, equal_var или параметры поиска сдвигов)
+    """
+    test: str
+    series: pd.Series
+    frequency: DataFrequency
+    date_boundary: Optional[date] = None
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SweepResult:
+    """Результаты теста по столбцам, столбцы, которых у теста нет, равны None"""
+    datetime: Optional[list] = None
+    statistic: Optional[list] = None
+    p_value: Optional[list] = None
+    ci_lower: Optional[list] = None
+    ci_upper: Optional[list] = None
+    conclusion: Optional[list] = None
+    error: Optional[str] = None
+
+
+def run_sweep_task(task: SweepTask) -> SweepResult:
+    """Тест так же, как в эндпоинтах мониторинга. Ошибка возвращается в результате, а не пробрасывается"""
+    try:
+        match task.test:
+            case "student_test":
+                results = StudentTestAdapter().perform_student_test(
+                    task.series, task.frequency, task.date_boundary, **task.params
+                )
+            case "fisher_test":
+                results = FisherTestAdapter().perform_fisher_test(
+                    task.series, task.frequency, task.date_boundary, **task.params
+                )
+            case "two_sigma_test":
+                results = TwoSigmaTestAdapter().perform_two_sigma_test(task.series, task.frequency, task.date_boundary)
+                return SweepResult(
+                    datetime=[r.datetime for r in results],
+                    statistic=[r.std for r in results],
+                    ci_lower=[r.confidence_interval[0] for r in results],
+                    ci_upper=[r.confidence_interval[1] for r in results],
+                    conclusion=[r.conclusion.value for r in results],
+                )
+            case "break_finder":
+                response = BreakFinderAdapter().fit(endog=task.series, **task.params)
+                return SweepResult(datetime=response.break_datetimes)
+            case _:
+                raise ValueError(f"Неизвестный тест {task.test}")
+    except Exception as exc:
+        return SweepResult(error=str(exc))
+
+    return SweepResult(
+        datetime=[None if pd.isna(r.datetime) else r.datetime for r in results],
+        statistic=[r.statistic for r in results],
+        p_value=[r.p_value for r in results],
+        conclusion=[r.conclusion.value for r in results],
+    )
+
+
+def _run_chunk(tasks: list[SweepTask]) -> list[SweepResult]:
+    return [run_sweep_task(task) for task in tasks]
+
+
+class MonitoringSweepPool:
+    """
+    Пул процессов для пакетного мониторинга рядов, живущий все время работы приложения.
+
+    Тесты одного ряда быстрые, поэтому в процесс отправляется пачка из chunk_size задач:
+    накладные расходы на передачу делятся на всю пачку.
+    """
+
+    def __init__(self, n_jobs: int, chunk_size: int):
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(max_workers=n_jobs)
+        self._log = logger.getChild(self.__class__.__name__)
+
+    def run(self, tasks: list[SweepTask]) -> Iterator[SweepResult]:
+        """Результаты в порядке задач, по мере готовности пачек"""
+        chunks = [tasks[i:i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)]
+        self._log.info(msg=f'Отправляем в пул {len(tasks)} задач мониторинга ({len(chunks)} пачек), n_jobs={self.n_jobs}')
+        for results in self._executor.map(_run_chunk, chunks):
+            yield from results
+
+    def shutdown(self) -> None:
+        self._log.info(msg='Останавливаем пул процессов мониторинга рядов')
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -9,6 +9,7 @@ from src.core.domain.stat_test import Frequency2SeriesSize
 from src.core.domain.stat_test.two_sigma.errors import InsufficientDataError, InvalidDateError
 from src.core.domain.stat_test.two_sigma.growth_conclusion import GrowthConclusion
 from src.core.domain.stat_test.two_sigma.result import TwoSigmaTestResult
+from src.infrastructure.adapters.stat_tests.monitoring import SegmentMoments
 
 
 class TwoSigmaTestAdapter:
@@ -49,32 +50,34 @@ class TwoSigmaTestAdapter:
         results: List[TwoSigmaTestResult] = []
         series_values = series.astype(float).values
 
+        # темпы роста growth[i] = values[i] / values[i - series_size] и их приросты diff[i] = growth[i + 1] - growth[i]
+        # для всех i сразу; тест j берет growth на отрезке [max(series_size, boundary_idx - series_size - j), boundary_idx - j)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = series_values[series_size:] / series_values[:-series_size]
+        # приросты с NaN отбрасываются (dropna), поэтому skipna
+        moments = SegmentMoments(np.diff(growth), skipna=True)
+
+        shifts = np.arange(1, series_size + 1)
+        starts = np.maximum(boundary_idx - series_size - shifts, series_size) - series_size
+        stops = np.maximum(boundary_idx - shifts - series_size, starts)
+        # отрезку темпов роста [start, stop) соответствуют приросты [start, stop - 1)
+        diff_stops = np.maximum(stops - 1, starts)
+        counts = moments.count(starts, diff_stops)
+        current_stds = np.sqrt(moments.var(starts, diff_stops))
+        mean_growths = moments.mean(starts, diff_stops)
+
         # счётчик реальных тестов (для вычисления дат, как в коде коллеги)
         test_index = 0
 
-        for j in range(1, series_size + 1):
-            growth_rates = []
-            for i in range(boundary_idx - series_size - j, boundary_idx - j):
-                if i >= series_size:
-                    growth_rate = series_values[i] / series_values[i - series_size]
-                    growth_rates.append(growth_rate)
-
-            if len(growth_rates) < 2:
+        for n_growth, n_diff, current_std, mean_growth in zip(stops - starts, counts, current_stds, mean_growths):
+            if n_growth < 2 or n_diff == 0:
                 # для NaN результата используем None дату
                 results.append(self._create_nan_result())
                 continue
 
-            growth_series = pd.Series(growth_rates)
-            diff_series = growth_series.diff(1).dropna()
-
-            if len(diff_series) == 0:
-                results.append(self._create_nan_result())
-                continue
-
-            current_std = np.std(diff_series)
-            mean_growth = np.mean(diff_series)
-            ci_lower = mean_growth - 2 * current_std
-            ci_upper = mean_growth + 2 * current_std
+            current_std = float(current_std)
+            ci_lower = float(mean_growth - 2 * current_std)
+            ci_upper = float(mean_growth + 2 * current_std)
 
             is_anomalous = current_std < ci_lower or current_std > ci_upper
 
@@ -6,6 +6,7 @@ from math import floor, inf
 import statsmodels.api as sm
 
 from src.core.application.preliminary_diagnosis.schemas.break_finder import BreakFinderResponse
+from src.infrastructure.adapters.structural_shifts.dynamic_programming import optimal_breaks
 
 
 class BreakFinderAdapter:
@@ -116,6 +117,15 @@ class BreakFinderAdapter:
             -1 if criterion in ("rsquared", "rsquared_adj") else 1
         )
 
+    @staticmethod
+    def _is_pure_structural_change(intercept, break_intercept, trend, break_trend, seasons) -> bool:
+        """
+        Все коэффициенты модели меняются в точках сдвига, тогда SSR модели - сумма SSR регрессий на отрезках.
+        Константа со сдвигами дает свой уровень на каждом отрезке, вместе с трендом со сдвигами - свою прямую.
+        Тренд без сдвига константы (непрерывная ломаная) и сезонность общие для всех отрезков, на части не делятся.
+        """
+        return intercept and break_intercept and trend == break_trend and seasons <= 1
+
     def fit(
         self,
         endog: pd.Series,
@@ -162,6 +172,20 @@ class BreakFinderAdapter:
         if seasons > 1:
             self.S = self._get_season(seasons)
 
+        if criterion == "ssr" and self._is_pure_structural_change(
+            intercept, break_intercept, trend, break_trend, seasons
+        ):
+            # вместо МНК на каждой комбинации сдвигов - SSR всех отрезков один раз и динамическое программирование
+            _break = optimal_breaks(
+                self.y.to_numpy(),
+                n_breaks,
+                self.lbound,
+                self.ubound,
+                self.gap,
+                trend=trend,
+            )
+            _breaks = ()
+
         for bs in _breaks:
             if (
                 _cur := self._criterion(
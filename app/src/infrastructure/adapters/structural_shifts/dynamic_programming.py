@@ -0,0 +1,172 @@
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+def segment_ssr(
+    y: np.ndarray,
+    starts: np.ndarray,
+    trend: bool = False,
+    scale: Optional[int] = None,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Генератор сумм квадратов остатков регрессии на отрезках ряда по возрастанию длины отрезка.
+    Для length = 1, 2, ... выдает (length, ssr), где ssr[i] - SSR регрессии y[starts[i]:starts[i] + length]
+    на константу (и тренд, если trend); отрезки, которые выходят за конец ряда, отбрасываются.
+    Детали: Bai J., Perron P. Computation and analysis of multiple structural change models //
+    Journal of Applied Econometrics. – 2003. – Т. 18. – №. 1. – С. 1-22.
+
+    SSR считается через рекурсивные остатки: SSR(i, j + 1) = SSR(i, j) + w_j ** 2.
+    Время внутри отрезка отсчитывается от его начала, поэтому регрессор на шаге L один и тот же
+    для всех отрезков, и рекурсия идет сразу по всем началам. Память - O(len(starts)), матрица SSR не хранится.
+
+    Keyword arguments:
+    y -- значения ряда.
+    starts -- начала отрезков по возрастанию.
+    trend -- включать ли тренд в регрессию на отрезке.
+    scale -- на что нормировать время в тренде, по умолчанию длина ряда.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    starts = np.asarray(starts, dtype=int)
+    n_obs = y.shape[0]
+    scale = scale or n_obs
+    k = 2 if trend else 1
+
+    def n_starts(length: int) -> int:
+        # отрезки длины length помещаются в ряд только у начал не позже n_obs - length
+        return int(np.searchsorted(starts, n_obs - length, side='right'))
+
+    # отрезок из не более чем k точек описывается регрессией точно
+    for length in range(1, min(k, n_obs) + 1):
+        yield length, np.zeros(n_starts(length))
+    if n_obs <= k or not n_starts(k):
+        return
+
+    def regressor(length: int) -> np.ndarray:
+        # время нормировано на длину ряда, чтобы X'X была хорошо обусловлена
+        return np.array([1.0, length / scale]) if trend else np.array([1.0])
+
+    # точная МНК-оценка по первым k точкам каждого отрезка
+    begin = starts[:n_starts(k)]
+    X0 = np.vstack([regressor(length) for length in range(1, k + 1)])
+    Y0 = np.column_stack([y[begin + offset] for offset in range(k)])
+    beta = Y0 @ np.linalg.inv(X0).T
+    P = np.linalg.inv(X0.T @ X0)
+    current = np.zeros(len(begin))
+
+    for length in range(k + 1, n_obs + 1):
+        count = n_starts(length)
+        if not count:
+            return
+        x = regressor(length)
+        Px = P @ x
+        f = 1.0 + x @ Px
+
+        beta = beta[:count]
+        error = y[begin[:count] + length - 1] - beta @ x
+        current = current[:count] + error ** 2 / f
+
+        beta = beta + np.outer(error / f, Px)
+        P = P - np.outer(Px, Px) / f
+
+        yield length, current
+
+
+def prefix_ssr(y: np.ndarray, trend: bool = False) -> np.ndarray:
+    """
+    SSR начальных отрезков ряда за O(n): result[j] - SSR регрессии y[:j] на константу (и тренд), result[0] = 0.
+
+    Накопленные суммы в форме Уэлфорда: приращения берутся от отклонений от текущих средних,
+    а не как разность сумм квадратов, поэтому уровень ряда не съедает значащие цифры.
+    С трендом SSR = M2 - C ** 2 / Stt, где C - накопленный совместный момент времени и ряда.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    result = np.zeros(y.shape[0] + 1)
+    if not y.shape[0]:
+        return result
+
+    y = y - y.mean()
+    j = np.arange(1, y.shape[0] + 1, dtype=np.float64)
+    mean = np.cumsum(y) / j
+    previous_mean = np.r_[y[0], mean[:-1]]
+    ssr = np.cumsum((y - previous_mean) * (y - mean))
+
+    if trend:
+        t = j - 1
+        previous_t_mean = np.r_[0.0, t[:-1] / 2]
+        comoment = np.cumsum((t - previous_t_mean) * (y - mean))
+        stt = (j ** 3 - j) / 12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ssr = np.where(j > 2, ssr - comoment ** 2 / stt, 0.0)
+
+    result[1:] = np.maximum(ssr, 0.0)
+    return result
+
+
+def optimal_breaks(
+    y: np.ndarray,
+    n_breaks: int,
+    lbound: int,
+    ubound: int,
+    gap: int,
+    trend: bool = False,
+) -> Optional[tuple[int, ...]]:
+    """
+    Функция, возвращающая разбиение ряда на n_breaks + 1 отрезков с минимальной суммарной SSR
+    (динамическое программирование Bai-Perron). None, если допустимых разбиений нет.
+
+    Ограничения на сдвиги те же, что у перебора комбинаций в BreakFinderAdapter:
+    первый сдвиг не раньше lbound, последний не позже ubound - 1, соседние сдвиги отстоят больше чем на gap.
+
+    Считаются только допустимые отрезки: первый [0, b) и последний [b, n) - за O(n) через prefix_ssr,
+    отрезки между соседними сдвигами - заново на каждом шаге динамического программирования
+    из segment_ssr, только внутри [lbound, ubound) и длиннее gap. Память - O(n).
+
+    Keyword arguments:
+    y -- значения ряда.
+    n_breaks -- число сдвигов.
+    trend -- включать ли тренд в регрессию на отрезке.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n_obs = y.shape[0]
+    if n_breaks == 0:
+        return ()
+
+    first = prefix_ssr(y, trend)
+    # SSR регрессии на константу и тренд не меняется при обращении времени: [b, n) - начальный отрезок y[::-1]
+    last = prefix_ssr(y[::-1], trend)[::-1]
+
+    positions = np.arange(n_obs + 1)
+    # value[b] - минимальная SSR ряда до b при очередном сдвиге в точке b
+    value = np.where((positions >= max(lbound, 1)) & (positions < ubound), first, np.inf)
+    starts = np.arange(max(lbound, 1), max(ubound, 1))
+    argmins = []
+
+    for _ in range(n_breaks - 1):
+        best = np.full(n_obs + 1, np.inf)
+        argmin = np.zeros(n_obs + 1, dtype=int)
+
+        # отрезок [b', b) между соседними сдвигами заканчивается не позже ubound - 1
+        for length, ssr in segment_ssr(y[:max(ubound - 1, 0)], starts, trend, n_obs):
+            if length <= gap:
+                continue
+            begin = starts[:len(ssr)]
+            end = begin + length
+            total = value[begin] + ssr
+            # длины перебираются по возрастанию, поэтому при равенстве остается более ранний b', как у np.argmin
+            better = total <= best[end]
+            best[end[better]] = total[better]
+            argmin[end[better]] = begin[better]
+
+        value = best
+        argmins.append(argmin)
+
+    total = value[:n_obs] + last[:n_obs]
+    last_break = int(np.argmin(total))
+    if not np.isfinite(total[last_break]):
+        return None
+
+    breaks = [last_break]
+    for argmin in reversed(argmins):
+        breaks.append(int(argmin[breaks[-1]]))
+    return tuple(reversed(breaks))
@@ -0,0 +1,64 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class RecursiveWindow:
+    """
+    Окно из последних input_size точек target и exog для рекурсивного вневыборочного прогноза.
+
+    Буферы под весь горизонт выделяются один раз: target дополняется прогнозами,
+    exog продлевается последним известным значением, даты считаются заранее.
+    Каждый шаг - это сдвиг окна на одну точку, pandas собирается только для панели текущего окна.
+    """
+
+    def __init__(
+            self,
+            target: pd.Series,
+            exog: Optional[pd.DataFrame],
+            input_size: int,
+            steps: int,
+    ):
+        self._input_size = input_size
+        self._position = 0
+
+        freq = pd.infer_freq(target.index)
+        future_index = pd.date_range(
+            start=target.index[-1] + pd.tseries.frequencies.to_offset(freq),
+            periods=steps,
+            freq=freq
+        )
+        self._dates = target.index[-input_size:].append(future_index)
+
+        self._target = np.empty(input_size + steps, dtype=float)
+        self._target[:input_size] = target.to_numpy()[-input_size:]
+
+        self._exog_columns = None
+        self._exog = None
+        if exog is not None:
+            exog_values = exog.to_numpy()
+            self._exog_columns = exog.columns
+            self._exog = np.empty((input_size + steps, exog_values.shape[1]), dtype=exog_values.dtype)
+            self._exog[:input_size] = exog_values[-input_size:]
+            self._exog[input_size:] = exog_values[-1]
+
+    def push(self, value: float) -> None:
+        """Добавляет следующую точку target и сдвигает окно на один шаг вперед"""
+        self._target[self._position + self._input_size] = value
+        self._position += 1
+
+    def to_panel(self) -> pd.DataFrame:
+        """Текущее окно в формате панели NeuralForecast (как в to_panel)"""
+        window = slice(self._position, self._position + self._input_size)
+        df = pd.DataFrame(
+            {
+                "unique_id": 'ts',
+                "ds": self._dates[window],
+                "y": self._target[window],
+            }
+        )
+        if self._exog is not None:
+            for i, col in enumerate(self._exog_columns):
+                df[col] = self._exog[window, i]
+        return df
@@ -1,59 +1,103 @@
-from typing import Optional, List, Tuple
+from dataclasses import dataclass
+from typing import Optional, List
+
+import numpy as np
 import pandas as pd
+from neuralforecast import NeuralForecast
+from numpy.lib.stride_tricks import sliding_window_view
 
+from src.shared.to_panel import validate_exog_columns
 
-class WindowsCreation:
-    @staticmethod
-    def create_windows_for_series(series: pd.Series, input_size: int) -> List[pd.Series]:
-        if input_size > len(series):
-            raise ValueError(f"Input size {input_size} is greater than series length {len(series.dates)}")
 
-        windows = []
-        for i in range(len(series) - input_size + 1):
-            window = series.iloc[i:i + input_size]
-            windows.append(window)
+@dataclass(frozen=True)
+class WindowsView:
+    """
+    Все окна ряда длины input_size как strided-представления исходных массивов.
+
+    Окна не копируются: dates и target имеют форму (n_windows, input_size),
+    exog - (n_windows, input_size, n_exog). Данные материализуются только в to_panel
+    для запрошенного диапазона окон.
+    """
+    input_size: int
+    dates: np.ndarray
+    target: np.ndarray
+    exog: Optional[np.ndarray] = None
+    exog_columns: Optional[pd.Index] = None
+
+    def __len__(self) -> int:
+        return self.target.shape[0]
+
+    def last_dates(self, start: int = 0, stop: Optional[int] = None) -> pd.DatetimeIndex:
+        """Последние даты окон [start, stop)"""
+        return pd.DatetimeIndex(self.dates[start:stop, -1])
 
-        return windows
+    def to_panel(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """
+        Панель NeuralForecast из окон [start, stop), у каждого окна свой unique_id.
 
-    @staticmethod
-    def create_windows_for_df(df: Optional[pd.DataFrame], input_size: int) -> Optional[List[pd.DataFrame]]:
-        if df is None:
-            return None
+        unique_id - номер окна, дополненный нулями, поэтому сортировка по unique_id сохраняет порядок окон.
+        """
+        stop = len(self) if stop is None else stop
+        id_width = len(str(len(self)))
+        unique_ids = np.char.zfill(np.arange(start, stop).astype(str), id_width)
 
-        if input_size > len(df):
-            raise ValueError(f"Input size {input_size} is greater than dataframe length {len(df)}")
+        df = pd.DataFrame(
+            {
+                "unique_id": np.repeat(unique_ids, self.input_size),
+                "ds": self.dates[start:stop].ravel(),
+                "y": self.target[start:stop].ravel(),
+            }
+        )
+        if self.exog is not None:
+            exog_values = self.exog[start:stop].reshape(-1, len(self.exog_columns))
+            for i, col in enumerate(self.exog_columns):
+                df[col] = exog_values[:, i]
+        return df
 
-        windows = []
-        for i in range(len(df) - input_size + 1):
-            window = df.iloc[i:i + input_size].copy()
-            windows.append(window)
+    def predict(self, nf: NeuralForecast, model_name: str, batch_size: int) -> List[pd.Series]:
+        """
+        Прогнозы модели model_name от каждого окна, по порядку окон, с датами после последней даты окна.
 
-        return windows
+        Окна склеиваются в панели по batch_size окон (у каждого окна свой unique_id),
+        чтобы делать один вызов predict на пачку окон, а не на каждое окно.
+        """
+        forecast_list = []
+        for start in range(0, len(self), batch_size):
+            stop = min(start + batch_size, len(self))
+            predictions = nf.predict(df=self.to_panel(start, stop))
+            last_dates = self.last_dates(start, stop)
+            for last_date, (_, prediction) in zip(last_dates, predictions.groupby('unique_id', sort=True)):
+                prediction = prediction[model_name]
+                prediction.index = pd.date_range(start=last_date, periods=prediction.shape[0] + 1, freq=nf.freq)[1:]
+                forecast_list.append(prediction)
+        return forecast_list
 
-    def create_windows(
+
+class WindowsCreation:
+    def create_windows_view(
             self,
             exog: Optional[pd.DataFrame],
             target: pd.Series,
             input_size: int
-    ) -> Tuple[
-        Optional[List[pd.DataFrame]], # преобразованная матрица exog в список матриц из окон
-        List[pd.Series] # преобразованный таргет в список окон
-    ]:
+    ) -> WindowsView:
         if exog is not None and not target.index.equals(exog.index):
             raise ValueError("Индексы target и exog должны совпадать")
 
-        windows_exog = self.create_windows_for_df(exog, input_size)
-        windows_target = self.create_windows_for_series(target, input_size)
+        if input_size > len(target):
+            raise ValueError(f"Input size {input_size} is greater than series length {len(target)}")
 
-        return windows_exog, windows_target
+        windows_exog = None
+        exog_columns = None
+        if exog is not None and not exog.empty:
+            validate_exog_columns(exog.columns)
+            exog_columns = exog.columns
+            # (n_windows, n_exog, input_size) -> (n_windows, input_size, n_exog), без копирования
+            windows_exog = sliding_window_view(exog.to_numpy(), input_size, axis=0).transpose(0, 2, 1)
 
-    def create_window_out_for_sample(
-            self,
-            exog: Optional[pd.DataFrame],
-            target: pd.Series,
-            input_size: int,
-    ) -> Tuple[Optional[pd.DataFrame], pd.Series]:
-        windows_exog, windows_target = self.create_windows(exog, target, input_size)
-        if windows_exog is None:
-            return None, windows_target[-1]
-        return windows_exog[-1], windows_target[-1]
+        return WindowsView(
+            input_size=input_size,
+            dates=sliding_window_view(target.index.to_numpy(), input_size),
+            target=sliding_window_view(target.to_numpy(), input_size),
+            exog=windows_exog,
+            exog_columns=exog_columns,
+        )
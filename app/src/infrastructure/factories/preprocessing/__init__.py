@@ -1,2 +1,3 @@
 from .factory import *
+from .pipeline import *
 from .methods import *
@@ -1,4 +1,4 @@
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Sequence
 
 import pandas as pd
 
@@ -8,6 +8,7 @@ from src.core.application.preprocessing.preprocess_scheme import (
     InverseTransformationUnion
 )
 from src.core.domain.preprocessing.service import PreprocessingServiceI
+from .pipeline import PreprocessPipeline
 
 
 class PreprocessFactory:
@@ -27,6 +28,22 @@ class PreprocessFactory:
 
         return cls.registry[transformation.type]().apply(ts=ts, transformation=transformation)
 
+    @classmethod
+    def compile(
+            cls, transformations: Sequence[TransformationUnion | InverseTransformationUnion]
+    ) -> PreprocessPipeline:
+        """
+        Проверяет список преобразований и собирает из него конвейер, см. PreprocessPipeline.
+        Из списка обратных преобразований собирается конвейер для PreprocessPipeline.inverse
+        """
+        unknown = [transformation.type for transformation in transformations if transformation.type not in cls.registry]
+        if unknown:
+            raise ValueError(f'Неизвестные преобразования: {", ".join(unknown)}')
+
+        return PreprocessPipeline([
+            (cls.registry[transformation.type](), transformation) for transformation in transformations
+        ])
+
     @classmethod
     def inverse(cls, ts: pd.Series, transformation: InverseTransformationUnion) -> pd.Series:
         return cls.registry[transformation.type]().inverse(ts=ts, transformation=transformation)
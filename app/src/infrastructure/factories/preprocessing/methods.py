@@ -2,7 +2,7 @@ from typing import Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.stats import boxcox
+from scipy.special import boxcox
 from statsmodels.tsa.seasonal import seasonal_decompose
 from statsmodels.tsa.stl._stl import STL
 
@@ -37,89 +37,141 @@ from src.core.domain.preprocessing.service import PreprocessingServiceI
 from .factory import (
     PreprocessFactory,
 )
+from .pipeline import ArrayPreprocessing
 
 
-@PreprocessFactory.register(transform_type="diff")
-class Diff(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: DiffTransformation) -> Tuple[pd.Series, DiffContext]:
-        return ts.diff(periods=transformation.diff_order), DiffContext(first_values=ts[:transformation.diff_order])
+def _nan_mean_std(values: np.ndarray) -> Tuple[float, float]:
+    """Среднее и стандартное отклонение (ddof=0) без пропусков, в точности как Series.mean и Series.std у pandas"""
+    mask = np.isnan(values)
+    count = values.size - np.count_nonzero(mask)
+    filled = np.where(mask, 0.0, values)
+    mean = filled.sum() / count if count else np.nan
+
+    square = np.square(mean - values, out=filled)
+    np.putmask(square, mask, 0.0)
+    std = np.sqrt(square.sum() / count) if count else np.nan
+    return mean, std
+
+
+def _nan_min_max(values: np.ndarray) -> Tuple[float, float]:
+    """Минимум и максимум без пропусков, NaN для ряда без наблюдений, как Series.min и Series.max у pandas"""
+    observed = values[~np.isnan(values)]
+    if not observed.size:
+        return np.nan, np.nan
+    return observed.min(), observed.max()
 
-    def inverse(
-        self, ts: pd.Series, transformation: InverseDiffTransformation
-    ) -> pd.Series:
-        periods = transformation.diff_order
-        restored = np.full(len(ts), np.nan)
-        restored[:periods] = transformation.first_values
 
-        for i in range(periods, len(ts)):
-            restored[i] = restored[i - periods] + ts.iloc[i]
+def _shift(values: np.ndarray, periods: int) -> None:
+    """Сдвиг на месте как ts.shift(periods): освободившиеся позиции - NaN"""
+    if periods >= 0:
+        values[periods:] = values[:max(values.size - periods, 0)]
+        values[:periods] = np.nan
+    else:
+        values[:periods] = values[-periods:]
+        values[periods:] = np.nan
+
+
+def _cumulate(values: np.ndarray, first_values: np.ndarray, periods: int) -> None:
+    """
+    Восстановление на месте ряда по разностям порядка periods > 0: x[i] = x[i - periods] + d[i].
+    Ряд раскладывается по строкам длины periods, и каждая позиция строки (класс вычетов i % periods)
+    накапливается одним np.add.accumulate. Пропуск в разностях дает пропуски дальше по своему классу.
+    """
+    values[:periods] = first_values
+    if values.size <= periods:
+        return
+
+    full = values.size - values.size % periods
+    rows = values[:full].reshape(-1, periods)
+    np.add.accumulate(rows, axis=0, out=rows)
+    values[full:] += rows[-1, :values.size - full]
+
+
+@PreprocessFactory.register(transform_type="diff")
+class Diff(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: DiffTransformation) -> DiffContext:
+        periods = transformation.diff_order
+        # для отрицательного порядка ряд восстанавливается с конца, поэтому нужны последние значения
+        context = DiffContext(first_values=(values[:periods] if periods >= 0 else values[periods:]).tolist())
+
+        # как ts.diff(periods): x[i] - x[i - periods], пересечение срезов numpy разрешает сам
+        if periods >= 0:
+            values[periods:] -= values[:max(values.size - periods, 0)]
+            values[:periods] = np.nan
+        else:
+            values[:periods] -= values[-periods:]
+            values[periods:] = np.nan
+        return context
+
+    def inverse_values(self, values: np.ndarray, transformation: InverseDiffTransformation) -> None:
+        periods = transformation.diff_order
+        first_values = np.array(transformation.first_values, dtype=float)
 
-        return pd.Series(restored, index=ts.index, name=ts.name)
+        if periods == 0:
+            # нулевые разности не несут информации о ряде
+            values[:] = np.nan
+        elif periods > 0:
+            _cumulate(values, first_values, periods)
+        else:
+            # x[i] = x[i - periods] + d[i] от конца ряда: то же накопление по развернутому ряду
+            _cumulate(values[::-1], first_values[::-1], -periods)
 
 
 @PreprocessFactory.register(transform_type="lag")
-class Lag(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: LagTransformation) -> Tuple[pd.Series, None]:
-        return ts.shift(periods=transformation.lag_order), None
+class Lag(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: LagTransformation) -> None:
+        _shift(values, transformation.lag_order)
 
-    def inverse(
-        self, ts: pd.Series, transformation: InverseLagTransformation
-    ) -> pd.Series:
-        return ts.shift(periods=-transformation.lag_order)
+    def inverse_values(self, values: np.ndarray, transformation: InverseLagTransformation) -> None:
+        _shift(values, -transformation.lag_order)
 
 
 @PreprocessFactory.register(transform_type="log")
-class Log(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: LogTransformation) -> Tuple[pd.Series, None]:
-        safe_ts = ts.copy()  # FIXME: зачем копию делать ... ?
-        return np.log(safe_ts), None
+class Log(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: LogTransformation) -> None:
+        np.log(values, out=values)
 
-    def inverse(
-        self, ts: pd.Series, transformation: InverseLogTransformation
-    ) -> pd.Series:
-        return np.exp(ts)
+    def inverse_values(self, values: np.ndarray, transformation: InverseLogTransformation) -> None:
+        np.exp(values, out=values)
 
 
 @PreprocessFactory.register(transform_type="pow")
-class Pow(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: PowTransformation) -> Tuple[pd.Series, None]:
-        exp = transformation.pow_order
-        if float(exp).is_integer():  # FIXME: ...?
-            exp = int(exp)
-        return ts ** exp, None
+class Pow(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: PowTransformation) -> None:
+        # **= как и ts ** exp заменяет степени 2 и 0.5 на np.square и np.sqrt
+        values **= transformation.pow_order
 
-    def inverse(
-        self, ts: pd.Series, transformation: InversePowTransformation
-    ) -> pd.Series:
+    def inverse_values(self, values: np.ndarray, transformation: InversePowTransformation) -> None:
         if transformation.pow_order == 0:
             raise TypeError("Невозможно восстановить ряд")
 
-        return ts ** (1 / transformation.pow_order)
+        values **= 1 / transformation.pow_order
 
 
 @PreprocessFactory.register(transform_type="minmax")
-class MinMax(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: MinMaxTransformation) -> Tuple[pd.Series, MinMaxContext]:
-        return (ts - ts.min()) / (ts.max() - ts.min()), MinMaxContext(init_min=ts.min(), init_max=ts.max())
+class MinMax(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: MinMaxTransformation) -> MinMaxContext:
+        init_min, init_max = _nan_min_max(values)
+        values -= init_min
+        values /= init_max - init_min
+        return MinMaxContext(init_min=init_min, init_max=init_max)
 
-    def inverse(
-        self, ts: pd.Series, transformation: InverseMinMaxTransformation
-    ) -> pd.Series:
-        return (
-            ts * (transformation.init_max - transformation.init_min)
-            + transformation.init_min
-        )
+    def inverse_values(self, values: np.ndarray, transformation: InverseMinMaxTransformation) -> None:
+        values *= transformation.init_max - transformation.init_min
+        values += transformation.init_min
 
 
 @PreprocessFactory.register(transform_type="standard")
-class Standard(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: StandardTransformation) -> Tuple[pd.Series, StandardContext]:
-        return (ts - ts.mean()) / ts.std(ddof=0), StandardContext(init_mean=ts.mean(), init_std=ts.std(ddof=0))
+class Standard(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: StandardTransformation) -> StandardContext:
+        init_mean, init_std = _nan_mean_std(values)
+        values -= init_mean
+        values /= init_std
+        return StandardContext(init_mean=init_mean, init_std=init_std)
 
-    def inverse(
-        self, ts: pd.Series, transformation: InverseStandardTransformation
-    ) -> pd.Series:
-        return ts * transformation.init_std + transformation.init_mean
+    def inverse_values(self, values: np.ndarray, transformation: InverseStandardTransformation) -> None:
+        values *= transformation.init_std
+        values += transformation.init_mean
 
 
 @PreprocessFactory.register(transform_type="exp_smooth")
@@ -137,22 +189,22 @@ class ExpSmooth(PreprocessingServiceI):
 
 
 @PreprocessFactory.register(transform_type="boxcox")
-class BoxCox(PreprocessingServiceI):
-    def apply(self, ts: pd.Series, transformation: BoxCoxTransformation) -> Tuple[pd.Series, None]:
-        if not all(ts >= 0):
+class BoxCox(ArrayPreprocessing):
+    def apply_values(self, values: np.ndarray, transformation: BoxCoxTransformation) -> None:
+        # пропуск тоже не проходит проверку, как и раньше
+        if not np.all(values >= 0):
             raise ValueError('Для преобразования Бокса-Кокса все значения ряда должны быть больше нуля')
 
-        safe_ts = ts.copy()  # FIXME: зачем копию делать ... ?
-        transformed = boxcox(safe_ts, lmbda=transformation.param)
-        return pd.Series(transformed, index=ts.index, name=ts.name), None
+        boxcox(values, transformation.param, out=values)
 
-    def inverse(
-        self, ts: pd.Series, transformation: InverseBoxCoxTransformation
-    ) -> pd.Series:
+    def inverse_values(self, values: np.ndarray, transformation: InverseBoxCoxTransformation) -> None:
         if transformation.param == 0:
-            return np.exp(ts)
+            np.exp(values, out=values)
+            return
 
-        return (transformation.param * ts + 1) ** (1 / transformation.param)
+        values *= transformation.param
+        values += 1
+        values **= 1 / transformation.param
 
 
 @PreprocessFactory.register(transform_type="fillna")
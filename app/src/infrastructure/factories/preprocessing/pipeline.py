@@ -0,0 +1,109 @@
+from abc import abstractmethod
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.application.preprocessing.preprocess_scheme import (
+    TransformationUnion,
+    PreprocessContext,
+    InverseTransformationUnion
+)
+from src.core.domain.preprocessing.service import PreprocessingServiceI
+
+
+class ArrayPreprocessing(PreprocessingServiceI):
+    """
+    Предобработка, которая меняет значения ряда на месте и не зависит от его дат
+    (поэлементные преобразования, разности и лаги).
+
+    Такие шаги PreprocessPipeline выполняет подряд над одним массивом, без промежуточных pd.Series,
+    и при предобработке, и при ее отмене.
+    """
+
+    def apply(self, ts: pd.Series, transformation: TransformationUnion) -> Tuple[pd.Series, Optional[PreprocessContext]]:
+        values = ts.to_numpy(dtype=float, copy=True)
+        with np.errstate(all='ignore'):
+            context = self.apply_values(values, transformation)
+        return pd.Series(values, index=ts.index, name=ts.name, copy=False), context
+
+    def inverse(self, ts: pd.Series, transformation: InverseTransformationUnion) -> pd.Series:
+        values = ts.to_numpy(dtype=float, copy=True)
+        with np.errstate(all='ignore'):
+            self.inverse_values(values, transformation)
+        return pd.Series(values, index=ts.index, name=ts.name, copy=False)
+
+    @abstractmethod
+    def apply_values(self, values: np.ndarray, transformation: TransformationUnion) -> Optional[PreprocessContext]:
+        """Предобрабатывает массив значений на месте и возвращает контекст предобработки, если он есть"""
+        ...
+
+    @abstractmethod
+    def inverse_values(self, values: np.ndarray, transformation: InverseTransformationUnion) -> None:
+        """Отменяет предобработку массива значений на месте"""
+        ...
+
+
+class PreprocessPipeline:
+    """
+    Список преобразований, проверенный и подготовленный один раз.
+
+    Подряд идущие шаги ArrayPreprocessing выполняются над одной копией значений ряда:
+    на такой участок цепочки приходится одно выделение памяти под результат.
+    В pandas ряд переводится только для шагов, которым нужны даты или окна (ресемплинг, интерполяция, STL и т.д.).
+
+    apply применяет преобразования по порядку, inverse отменяет их в обратном порядке
+    (для inverse конвейер собирается из списка обратных преобразований).
+    """
+
+    def __init__(self, steps: list[tuple[PreprocessingServiceI, TransformationUnion | InverseTransformationUnion]]):
+        # участки: (массивный ли участок, [(номер шага, сервис, преобразование), ...])
+        self._stages: list[tuple[bool, list[tuple[int, PreprocessingServiceI, TransformationUnion]]]] = []
+
+        for step, (service, transformation) in enumerate(steps, start=1):
+            is_array = isinstance(service, ArrayPreprocessing)
+            if is_array and self._stages and self._stages[-1][0]:
+                self._stages[-1][1].append((step, service, transformation))
+            else:
+                self._stages.append((is_array, [(step, service, transformation)]))
+
+    def apply(self, ts: pd.Series) -> Tuple[pd.Series, list[PreprocessContext]]:
+        """Предобрабатывает ряд и возвращает контексты шагов, у которых они есть, с номерами шагов"""
+        contexts: list[PreprocessContext] = []
+
+        for is_array, stage in self._stages:
+            if is_array:
+                values = ts.to_numpy(dtype=float, copy=True)
+                # как и в арифметике pandas, log(0), 0/0 и т.п. дают inf/NaN без предупреждений
+                with np.errstate(all='ignore'):
+                    for step, service, transformation in stage:
+                        context = service.apply_values(values, transformation)
+                        self._add_context(contexts, context, step)
+                ts = pd.Series(values, index=ts.index, name=ts.name, copy=False)
+            else:
+                for step, service, transformation in stage:
+                    ts, context = service.apply(ts=ts, transformation=transformation)
+                    self._add_context(contexts, context, step)
+
+        return ts, contexts
+
+    def inverse(self, ts: pd.Series) -> pd.Series:
+        """Возвращает ряд к исходному, отменяя преобразования с последнего"""
+        for is_array, stage in reversed(self._stages):
+            if is_array:
+                values = ts.to_numpy(dtype=float, copy=True)
+                with np.errstate(all='ignore'):
+                    for _, service, transformation in reversed(stage):
+                        service.inverse_values(values, transformation)
+                ts = pd.Series(values, index=ts.index, name=ts.name, copy=False)
+            else:
+                for _, service, transformation in reversed(stage):
+                    ts = service.inverse(ts=ts, transformation=transformation)
+
+        return ts
+
+    @staticmethod
+    def _add_context(contexts: list[PreprocessContext], context: Optional[PreprocessContext], step: int) -> None:
+        if context is not None:
+            context.step = step
+            contexts.append(context)
@@ -0,0 +1,2 @@
+from .factory import SearchStrategyFactory
+from .methods import *
@@ -0,0 +1,18 @@
+from src.core.domain.parameter_selection.search_strategy.interface import SarimaxSearchStrategy
+from src.core.domain.parameter_selection.search_strategy.search_strategy import SearchStrategy
+
+
+class SearchStrategyFactory:
+    _registry: dict[SearchStrategy, type[SarimaxSearchStrategy]] = {}
+
+    @classmethod
+    def register(cls, strategy: SearchStrategy):
+        def wrapper(strategy_class: type[SarimaxSearchStrategy]):
+            cls._registry[strategy] = strategy_class
+            return strategy_class
+
+        return wrapper
+
+    @classmethod
+    def create(cls, strategy: SearchStrategy) -> SarimaxSearchStrategy:
+        return cls._registry[strategy]()
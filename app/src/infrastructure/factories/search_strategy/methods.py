@@ -0,0 +1,127 @@
+import math
+
+from .factory import SearchStrategyFactory
+from src.core.domain.parameter_selection.search_strategy.interface import (
+    SarimaxSearchStrategy,
+    ScoreFn,
+    ScoreTask,
+    ScoreResult,
+    OrderBounds,
+    Order,
+)
+from src.core.domain.parameter_selection.search_strategy.search_strategy import SearchStrategy
+from src.infrastructure.logs import logger
+
+
+def _best(results: list[ScoreResult]) -> ScoreResult:
+    # min возвращает первый минимальный элемент, как и np.argmin в полном переборе
+    return min(results, key=lambda result: result.score)
+
+
+@SearchStrategyFactory.register(SearchStrategy.grid)
+class GridSearch(SarimaxSearchStrategy):
+    def search(self, score: ScoreFn, bounds: OrderBounds, maxiter: int) -> ScoreResult:
+        return _best(score([ScoreTask(order=order, maxiter=maxiter) for order in bounds.grid()]))
+
+
+@SearchStrategyFactory.register(SearchStrategy.stepwise)
+class StepwiseSearch(SarimaxSearchStrategy):
+    """
+    Пошаговый поиск в духе Хайндмана-Хандакара (auto.arima).
+
+    Стартуем с четырех моделей, затем на каждом шаге оцениваем всех еще не обученных соседей
+    текущей лучшей модели (p, q, P, D, Q по отдельности на +-1 и пары (p, q), (P, Q) вместе)
+    и переходим к лучшему соседу, пока он улучшает скор. Соседи одного шага оцениваются одной пачкой,
+    поэтому их можно считать параллельно.
+    """
+    # как nmodels в auto.arima
+    max_models = 94
+
+    @staticmethod
+    def _start_orders(bounds: OrderBounds) -> list[Order]:
+        # ARIMA(2,d,2)(1,D,1), ARIMA(0,d,0)(0,D,0), ARIMA(1,d,0)(1,D,0), ARIMA(0,d,1)(0,D,1)
+        starts = [(2, 2, 1, 0, 1), (0, 0, 0, 0, 0), (1, 0, 1, 0, 0), (0, 1, 0, 0, 1)]
+        clipped = [
+            tuple(min(value, bound) for value, bound in zip(order, bounds.upper))
+            for order in starts
+        ]
+        return list(dict.fromkeys(clipped))
+
+    @staticmethod
+    def _neighbours(order: Order, bounds: OrderBounds) -> list[Order]:
+        steps = []
+        for i in range(5):
+            for delta in (-1, 1):
+                step = [0] * 5
+                step[i] = delta
+                steps.append(step)
+        for delta in (-1, 1):
+            steps.append([delta, delta, 0, 0, 0])  # p и q вместе
+            steps.append([0, 0, delta, 0, delta])  # P и Q вместе
+
+        neighbours = [tuple(value + shift for value, shift in zip(order, step)) for step in steps]
+        return [neighbour for neighbour in neighbours if bounds.contains(neighbour)]
+
+    def search(self, score: ScoreFn, bounds: OrderBounds, maxiter: int) -> ScoreResult:
+        results = score([ScoreTask(order=order, maxiter=maxiter) for order in self._start_orders(bounds)])
+        visited = {result.order: result for result in results}
+        best = _best(results)
+
+        while len(visited) < self.max_models:
+            candidates = [
+                order for order in self._neighbours(best.order, bounds)
+                if order not in visited
+            ][:self.max_models - len(visited)]
+            if not candidates:
+                break
+
+            results = score([ScoreTask(order=order, maxiter=maxiter) for order in candidates])
+            visited.update({result.order: result for result in results})
+
+            best_neighbour = _best(results)
+            if best_neighbour.score >= best.score:
+                break
+            best = best_neighbour
+
+        logger.info(msg=f'Пошаговый поиск: обучено {len(visited)} моделей, лучшая {best}')
+        return best
+
+
+@SearchStrategyFactory.register(SearchStrategy.successive_halving)
+class SuccessiveHalvingSearch(SarimaxSearchStrategy):
+    """
+    Последовательное деление по бюджету итераций оптимизатора (successive halving).
+
+    Все модели сетки получают небольшой бюджет итераций L-BFGS, после каждого раунда остается
+    лучшая 1/eta часть, а бюджет выживших растет в eta раз. Оптимизация продолжается с параметров
+    предыдущего раунда, так что суммарно на модель тратится не больше maxiter итераций.
+    До сходимости обучаются только несколько лучших моделей.
+    """
+    min_maxiter = 5
+    eta = 3
+
+    def search(self, score: ScoreFn, bounds: OrderBounds, maxiter: int) -> ScoreResult:
+        candidates = [ScoreTask(order=order, maxiter=0) for order in bounds.grid()]
+        spent = 0
+        budget = self.min_maxiter
+
+        while len(candidates) > self.eta and budget < maxiter:
+            results = score([
+                ScoreTask(order=task.order, maxiter=budget - spent, start_params=task.start_params)
+                for task in candidates
+            ])
+            survivors = sorted(results, key=lambda result: result.score)[:math.ceil(len(results) / self.eta)]
+            logger.info(msg=f'Successive halving: бюджет {budget} итераций, '
+                            f'осталось {len(survivors)} из {len(results)} моделей')
+
+            candidates = [
+                ScoreTask(order=result.order, maxiter=0, start_params=result.fitted_params)
+                for result in survivors
+            ]
+            spent = budget
+            budget *= self.eta
+
+        return _best(score([
+            ScoreTask(order=task.order, maxiter=maxiter - spent, start_params=task.start_params)
+            for task in candidates
+        ]))
@@ -1,2 +1,3 @@
+from .context import ContextStatistic, GroupedStatistic, SeriesMoments, StatisticsContext
 from .factory import StatisticsFactory
 from .methods import *
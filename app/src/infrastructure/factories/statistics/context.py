@@ -0,0 +1,283 @@
+import math
+from abc import abstractmethod
+from functools import cached_property
+from typing import Iterator
+
+import numpy as np
+
+from src.core.application.preliminary_diagnosis.schemas.statistics import StatisticResult
+from src.core.domain.statistics import StatisticsServiceI
+
+
+class SeriesMoments:
+    """
+    Общие для всех статистик величины по группам ряда (квантильным группам или рядам таблицы).
+
+    Значения сортируются один раз: по номеру группы, затем по значению, равные значения - в порядке наблюдений.
+    Группа - непрерывный отрезок отсортированного массива, поэтому порядковые статистики берутся по индексу,
+    а отклонения и степени для центральных моментов считаются сразу для всех групп.
+    Каждая величина считается при первом обращении и дальше берется из кэша.
+    Пропуски (NaN) и наблюдения без группы отбрасываются.
+    """
+
+    def __init__(self, values: np.ndarray, labels: np.ndarray | None = None):
+        values = np.asarray(values, dtype=float)
+        group_labels = np.zeros(values.shape[0]) if labels is None else np.asarray(labels, dtype=float)
+        position = np.flatnonzero(~np.isnan(values) & ~np.isnan(group_labels))
+
+        # np.lexsort устойчива: равные значения остаются в порядке наблюдений
+        order = np.lexsort((values[position], group_labels[position]))
+        self.position = position[order]
+        self.sorted = values[self.position]
+
+        sorted_labels = group_labels[self.position]
+        self.start = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]) if len(order) \
+            else np.zeros(0, dtype=int)
+        self.labels = sorted_labels[self.start]
+        if labels is None and not len(order):
+            # ряд без наблюдений - одна пустая группа, как и при расчете по всему ряду
+            self.start, self.labels = np.zeros(1, dtype=int), np.zeros(1)
+
+        self.stop = np.r_[self.start[1:], len(order)].astype(int)
+        self.size = self.stop - self.start
+        self._group = np.repeat(np.arange(len(self.start)), self.size)
+        self._quantiles: dict[float, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def contexts(self) -> Iterator[tuple[float, 'StatisticsContext']]:
+        """Пары (метка группы, контекст группы) по возрастанию метки"""
+        for group, label in enumerate(self.labels):
+            yield label, StatisticsContext(self, group)
+
+    @cached_property
+    def _chronological(self) -> np.ndarray:
+        """Индексы отсортированного массива по группам, в группе - в порядке наблюдений"""
+        return np.lexsort((self.position, self._group))
+
+    def _group_sum(self, weights: np.ndarray) -> np.ndarray:
+        # np.add.reduce по каждой группе в порядке наблюдений: то же попарное суммирование, что у np.sum
+        # и np.mean по ряду группы, поэтому суммы и моменты совпадают с расчетом по отдельному ряду до бита
+        weights = np.asarray(weights, dtype=float)[self._chronological]
+        return np.array(
+            [np.add.reduce(weights[start:stop]) for start, stop in zip(self.start.tolist(), self.stop.tolist())],
+            dtype=float
+        )
+
+    def _take(self, index: np.ndarray) -> np.ndarray:
+        """Элементы отсортированного массива по индексам, NaN для пустых групп"""
+        if not len(self.sorted):
+            return np.full(len(self), np.nan)
+        return np.where(self.size > 0, self.sorted[np.clip(index, 0, len(self.sorted) - 1)], np.nan)
+
+    @cached_property
+    def sum(self) -> np.ndarray:
+        return self._group_sum(self.sorted)
+
+    @cached_property
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            return self.sum / self.size
+
+    @cached_property
+    def _deviation(self) -> np.ndarray:
+        # центральные моменты по отклонениям от среднего группы, а не по степенным суммам:
+        # у рядов с большим уровнем разность степенных сумм теряет все значащие цифры
+        return self.sorted - self.mean[self._group]
+
+    @cached_property
+    def _square(self) -> np.ndarray:
+        return self._deviation * self._deviation
+
+    @cached_property
+    def square_sum(self) -> np.ndarray:
+        return self._group_sum(self._square)
+
+    @cached_property
+    def var(self) -> np.ndarray:
+        """Несмещенная дисперсия (ddof=1)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.square_sum / (self.size - 1)
+
+    @cached_property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.var)
+
+    @cached_property
+    def m2(self) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            return self.square_sum / self.size
+
+    @cached_property
+    def m3(self) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            return self._group_sum(self._square * self._deviation) / self.size
+
+    @cached_property
+    def m4(self) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            return self._group_sum(self._square * self._square) / self.size
+
+    @cached_property
+    def log_mean(self) -> np.ndarray:
+        """Среднее логарифмов, NaN для групп с неположительными значениями"""
+        positive = self.sorted > 0
+        logs = np.log(np.where(positive, self.sorted, 1.0))
+        with np.errstate(invalid='ignore'):
+            log_mean = self._group_sum(logs) / self.size
+        return np.where(self._group_sum(~positive) == 0, log_mean, np.nan)
+
+    @cached_property
+    def min(self) -> np.ndarray:
+        return self._take(self.start)
+
+    @cached_property
+    def max(self) -> np.ndarray:
+        return self._take(self.stop - 1)
+
+    @cached_property
+    def last(self) -> np.ndarray:
+        """Последнее по времени наблюдение группы"""
+        return self._take(self._chronological[np.clip(self.stop - 1, 0, None)]) if len(self.sorted) \
+            else np.full(len(self), np.nan)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Квантиль каждой группы так же, как np.quantile (линейная интерполяция)"""
+        if q not in self._quantiles:
+            self._quantiles[q] = self._quantile(q)
+        return self._quantiles[q]
+
+    def _quantile(self, q: float) -> np.ndarray:
+        virtual = (self.size - 1) * q
+        previous = np.floor(virtual).astype(int)
+        following = np.minimum(previous + 1, self.size - 1)
+        gamma = virtual - previous
+        a, b = self._take(self.start + previous), self._take(self.start + following)
+        # та же формула, что в numpy: от ближнего к gamma конца отрезка
+        diff = b - a
+        return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+    @cached_property
+    def median(self) -> np.ndarray:
+        lower = self._take(self.start + (self.size - 1) // 2)
+        upper = self._take(self.start + self.size // 2)
+        return np.where(self.size % 2, lower, (lower + upper) / 2)
+
+    def trimmed_mean(self, proportion: float) -> np.ndarray:
+        """Среднее без доли proportion наименьших и наибольших значений группы, как scipy.stats.trim_mean"""
+        cut = (proportion * self.size).astype(int)
+        rank = np.arange(len(self.sorted)) - self.start[self._group]
+        keep = (rank >= cut[self._group]) & (rank < (self.size - cut)[self._group])
+        with np.errstate(invalid='ignore'):
+            return self._group_sum(np.where(keep, self.sorted, 0.0)) / self._group_sum(keep)
+
+    def histogram(self, bins: np.ndarray) -> np.ndarray:
+        """
+        Гистограммы групп с bins[g] равными интервалами у группы g, как np.histogram(группа, bins=bins[g]).
+        Счетчики всех групп идут подряд: интервалы первой группы, затем второй и т.д.
+        """
+        same = self.min == self.max
+        first = np.where(same, self.min - 0.5, self.min)[self._group]
+        last = np.where(same, self.max + 0.5, self.max)[self._group]
+        n_bins = bins[self._group]
+        step = (last - first) / n_bins
+
+        def edge(index: np.ndarray) -> np.ndarray:
+            # как np.linspace: index * step + first, последняя граница - ровно last
+            return np.where(index == n_bins, last, index * step + first)
+
+        index = ((self.sorted - first) / (last - first) * n_bins).astype(np.intp)
+        index[index == n_bins] -= 1
+        # поправки на округление у границ интервалов, как в np.histogram
+        index[self.sorted < edge(index)] -= 1
+        index[(self.sorted >= edge(index + 1)) & (index != n_bins - 1)] += 1
+
+        offset = np.cumsum(bins) - bins
+        return np.bincount(offset[self._group] + index, minlength=int(bins.sum()))
+
+
+class StatisticsContext:
+    """Одна группа SeriesMoments: для статистик, которые нельзя посчитать сразу по всем группам"""
+
+    def __init__(self, moments: SeriesMoments, group: int):
+        self.moments = moments
+        self.group = group
+
+    @classmethod
+    def from_series(cls, ts: np.ndarray) -> 'StatisticsContext':
+        return cls(SeriesMoments(ts), 0)
+
+    @property
+    def n(self) -> int:
+        return int(self.moments.size[self.group])
+
+    @property
+    def sorted(self) -> np.ndarray:
+        """Значения группы по возрастанию"""
+        m = self.moments
+        return m.sorted[m.start[self.group]:m.stop[self.group]]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Значения группы в порядке наблюдений"""
+        m = self.moments
+        group = slice(m.start[self.group], m.stop[self.group])
+        return m.sorted[group][np.argsort(m.position[group], kind='stable')]
+
+
+def to_values(values: np.ndarray, digits: int | None = None) -> list:
+    """
+    Значения статистики по группам для StatisticResult: NaN и бесконечность - None (посчитать нельзя).
+    digits - округление как в расчете по одной группе: round(x) для 0, иначе np.round(x, digits)
+    """
+    if digits:
+        values = np.round(values, digits)
+    return [
+        None if not math.isfinite(value) else round(value) if digits == 0 else value
+        for value in values.tolist()
+    ]
+
+
+class ContextStatistic(StatisticsServiceI):
+    """Статистика, которая считается по группе из общего SeriesMoments, а не заново по ряду"""
+
+    def get_value(self, ts: np.ndarray) -> StatisticResult:
+        return self.from_context(StatisticsContext.from_series(ts))
+
+    @abstractmethod
+    def from_context(self, ctx: StatisticsContext) -> StatisticResult:
+        ...
+
+    def from_moments(self, moments: SeriesMoments) -> list:
+        """Значения для всех групп по порядку"""
+        return [self.from_context(ctx).value for _, ctx in moments.contexts()]
+
+
+class GroupedStatistic(ContextStatistic):
+    """
+    Статистика, которая считается сразу для всех групп операциями над массивами SeriesMoments.
+    group_values возвращает массив значений по группам или, для интервалов, словарь таких массивов.
+    """
+
+    # округление как в расчете по одной группе, см. to_values
+    digits: int | None = None
+
+    def from_context(self, ctx: StatisticsContext) -> StatisticResult:
+        return StatisticResult(value=self.from_moments(ctx.moments)[ctx.group])
+
+    def from_moments(self, moments: SeriesMoments) -> list:
+        with np.errstate(all='ignore'):
+            values = self.group_values(moments)
+        if not isinstance(values, dict):
+            return to_values(values, self.digits)
+
+        columns = {key: to_values(column, self.digits) for key, column in values.items()}
+        return [
+            None if None in row else dict(zip(columns, row))
+            for row in zip(*columns.values())
+        ]
+
+    @abstractmethod
+    def group_values(self, moments: SeriesMoments) -> np.ndarray | dict[str, np.ndarray]:
+        ...
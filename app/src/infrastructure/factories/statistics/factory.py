@@ -2,15 +2,15 @@ import numpy as np
 
 from src.core.application.preliminary_diagnosis.schemas.statistics import StatisticResult, \
     RusStatMetricEnum
-from src.core.domain.statistics import StatisticsServiceI
+from .context import ContextStatistic, SeriesMoments
 
 
 class StatisticsFactory:
-    registry: dict[str, type[StatisticsServiceI]] = {}
+    registry: dict[str, type[ContextStatistic]] = {}
 
     @classmethod
     def register(cls, name: RusStatMetricEnum):
-        def wrapper(stat_class: type[StatisticsServiceI]):
+        def wrapper(stat_class: type[ContextStatistic]):
             cls.registry[name] = stat_class
             return stat_class
 
@@ -19,3 +19,8 @@ class StatisticsFactory:
     @classmethod
     def get_value(cls, ts: np.ndarray, statistic: RusStatMetricEnum) -> StatisticResult:
         return cls.registry[statistic]().get_value(ts)
+
+    @classmethod
+    def get_group_values(cls, moments: SeriesMoments, statistic: RusStatMetricEnum) -> list:
+        """Значения статистики для всех групп: общие величины групп считаются один раз и сразу для всех"""
+        return cls.registry[statistic]().from_moments(moments)
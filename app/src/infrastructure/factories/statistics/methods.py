@@ -1,205 +1,206 @@
-import warnings
-from itertools import combinations, combinations_with_replacement
-
 import numpy as np
 import pandas as pd
-from scipy.stats import kurtosis, skew
 from scipy import stats
-import statistics as st
+from scipy.special import entr
 
 from src.core.application.preliminary_diagnosis.schemas.statistics import RusStatMetricEnum, StatisticResult
-from src.core.domain.statistics import StatisticsServiceI
+from .context import ContextStatistic, GroupedStatistic, SeriesMoments, StatisticsContext
 from .factory import StatisticsFactory
+from .walsh import walsh_median
 
 @StatisticsFactory.register(name=RusStatMetricEnum.N_OBS)
-class Nobs(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=ts.size)
+class Nobs(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.size
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MEAN)
-class Mean(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=np.mean(ts))
+class Mean(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.mean
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MEAN_CONF_INT)
-class MeanConf(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value={
-            'Нижний' : round(
-                st.mean(ts) - stats.t.ppf(
-                    1 - 0.05/2,
-                    df=len(ts)-1
-                ) * np.sqrt(st.variance(ts)) / np.sqrt(len(ts))
-            ),
-            'Верхний': round(
-                st.mean(ts) + stats.t.ppf(
-                    1 - 0.05/2,
-                    df=len(ts)-1
-                ) * np.sqrt(st.variance(ts)) / np.sqrt(len(ts))
-            )
-        })
+class MeanConf(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> dict[str, np.ndarray]:
+        half_width = stats.t.ppf(1 - 0.05/2, df=m.size - 1) * m.std / np.sqrt(m.size)
+        return {
+            'Нижний': m.mean - half_width,
+            'Верхний': m.mean + half_width
+        }
 
 @StatisticsFactory.register(name=RusStatMetricEnum.CR_BOUND_MEAN)
-class CRMean(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=round(ts.var(ddof=1) / len(ts), 2))
+class CRMean(GroupedStatistic):
+    digits = 2
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.var / m.size
 
 @StatisticsFactory.register(name=RusStatMetricEnum.STD_ERR)
-class StdError(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=round(stats.sem(ts, nan_policy='omit')))
+class StdError(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.std / np.sqrt(m.size)
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MEDIAN)
-class Median(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=np.median(ts))
+class Median(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.median
 
 @StatisticsFactory.register(name=RusStatMetricEnum.STD)
-class Std(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=round(st.stdev(ts)))
+class Std(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.std
 
 @StatisticsFactory.register(name=RusStatMetricEnum.GEOM_MEAN)
-class GeoMean(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        value = round(st.geometric_mean(ts)) if (ts > 0).all() else None
-        return StatisticResult(value=value)
+class GeoMean(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        # None, если в группе есть неположительные значения
+        return np.exp(m.log_mean)
 
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MODE)
-class Mode(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        series = pd.Series(ts)
-        value_counts = series.value_counts()
-        mode_value = value_counts.index[0]
+class Mode(ContextStatistic):
+    def from_context(self, ctx: StatisticsContext) -> StatisticResult:
+        # value_counts, а не серии равных значений по сортировке: при равных частотах
+        # pandas выбирает значение по своему порядку сортировки, ответы не должны меняться
+        mode_value = pd.Series(ctx.values).value_counts().index[0]
         return StatisticResult(value=mode_value)
 
 
 @StatisticsFactory.register(name=RusStatMetricEnum.VAR)
-class Variance(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=np.var(ts, ddof=1))
+class Variance(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.var
 
 @StatisticsFactory.register(name=RusStatMetricEnum.VAR_CONF_INT)
-class VarianceConf(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value={
-            'Нижний': round(
-                (len(ts)-1) * ts.var(ddof=1) / stats.chi2.ppf(1 - 0.05/2, df=len(ts)-1)
-            ),
-            'Верхний': round(
-                (len(ts)-1) * ts.var(ddof=1) / stats.chi2.ppf(0.05/2, df=len(ts)-1)
-            )
-        })
+class VarianceConf(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> dict[str, np.ndarray]:
+        return {
+            'Нижний': (m.size - 1) * m.var / stats.chi2.ppf(1 - 0.05/2, df=m.size - 1),
+            'Верхний': (m.size - 1) * m.var / stats.chi2.ppf(0.05/2, df=m.size - 1)
+        }
 
 @StatisticsFactory.register(name=RusStatMetricEnum.CR_BOUND_VAR)
-class CRVariance(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=round(ts.var(ddof=1) / len(ts), 2))
+class CRVariance(GroupedStatistic):
+    digits = 2
 
-@StatisticsFactory.register(name=RusStatMetricEnum.KURTOSIS)
-class Kurtosis(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        with warnings.catch_warnings():
-            warnings.filterwarnings('error', category=RuntimeWarning)
-            try:
-                val = kurtosis(ts, bias=False, fisher=True)
-            except RuntimeWarning:
-                # Если произошла потеря точности, возвращаем None
-                return StatisticResult(value=None)
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.var / m.size
 
-            if np.isnan(val) or not np.isfinite(val):
-                return StatisticResult(value=None)
+@StatisticsFactory.register(name=RusStatMetricEnum.KURTOSIS)
+class Kurtosis(GroupedStatistic):
+    digits = 2
 
-        return StatisticResult(value=round(val, 2))
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        # как scipy.stats.kurtosis(bias=False, fisher=True), поправка на смещение - при n > 3
+        n = m.size.astype(float)
+        biased = m.m4 / m.m2 ** 2
+        unbiased = 1.0 / (n - 2) / (n - 3) * ((n ** 2 - 1.0) * m.m4 / m.m2 ** 2.0 - 3 * (n - 1) ** 2.0) + 3.0
+        return np.where(_is_constant(m), np.nan, np.where(n > 3, unbiased, biased) - 3)
 
 @StatisticsFactory.register(name=RusStatMetricEnum.SKEW)
-class Skewness(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        with warnings.catch_warnings():
-            warnings.filterwarnings('error', category=RuntimeWarning)
-            try:
-                val = skew(ts, bias=False)
-                if np.isnan(val) or not np.isfinite(val):
-                    return StatisticResult(value=None)
-            except RuntimeWarning:
-                return StatisticResult(value=None)
-        return StatisticResult(value=round(skew(ts, bias=False), 2))
+class Skewness(GroupedStatistic):
+    digits = 2
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        # как scipy.stats.skew(bias=False), поправка на смещение - при n > 2
+        n = m.size.astype(float)
+        biased = m.m3 / m.m2 ** 1.5
+        unbiased = ((n - 1.0) * n) ** 0.5 / (n - 2.0) * m.m3 / m.m2 ** 1.5
+        return np.where(_is_constant(m), np.nan, np.where(n > 2, unbiased, biased))
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MIN)
-class Min(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=ts.min())
+class Min(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.min
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MAX)
-class Max(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=ts.max())
+class Max(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.max
 
 @StatisticsFactory.register(name=RusStatMetricEnum.RANGE)
-class Range(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=ts.max() - ts.min())
+class Range(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.max - m.min
 
 @StatisticsFactory.register(name=RusStatMetricEnum.SUM)
-class Sum(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=ts.sum())
+class Sum(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.sum
 
 @StatisticsFactory.register(name=RusStatMetricEnum.Q25)
-class Q25(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=np.quantile(ts, 0.25))
+class Q25(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.quantile(0.25)
 
 @StatisticsFactory.register(name=RusStatMetricEnum.Q75)
-class Q75(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=np.quantile(ts, 0.75))
+class Q75(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.quantile(0.75)
 
 @StatisticsFactory.register(name=RusStatMetricEnum.LAST_Z)
-class LastZ(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        if len(ts) == 0:
-            return StatisticResult(value=0.0)
-        with warnings.catch_warnings():
-            warnings.filterwarnings('error', category=RuntimeWarning)
-            try:
-                z_scores = stats.zscore(ts, nan_policy='omit')
-                val = z_scores[-1]
-                if np.isnan(val) or not np.isfinite(val):
-                    return StatisticResult(value=None)
-            except RuntimeWarning:
-                return StatisticResult(value=None)
-        return StatisticResult(value=float(round(val, 2)))
+class LastZ(GroupedStatistic):
+    digits = 2
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        # z-показатель последнего наблюдения, как scipy.stats.zscore (ddof=0); для пустого ряда - 0
+        z_score = np.where(_is_constant(m), np.nan, (m.last - m.mean) / np.sqrt(m.m2))
+        return np.where(m.size == 0, 0.0, z_score)
 
 @StatisticsFactory.register(name=RusStatMetricEnum.MEDIAN_WOLSH)
-class MedianWolsh(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(
-            value=round(np.median([(x + y) / 2 for x, y in combinations(ts, 2)]))
-        )
+class MedianWolsh(ContextStatistic):
+    def from_context(self, ctx: StatisticsContext) -> StatisticResult:
+        if ctx.n < 2:
+            # у одного наблюдения пар нет, медиана не определена
+            return StatisticResult(value=None)
+        return StatisticResult(value=round(walsh_median(ctx.sorted, with_replacement=False)))
 
 @StatisticsFactory.register(name=RusStatMetricEnum.TRIMMED_MEAN)
-class TrimmedMean(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(value=round(stats.trim_mean(ts, 0.1)))
+class TrimmedMean(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return m.trimmed_mean(0.1)
 
 @StatisticsFactory.register(name=RusStatMetricEnum.ENTROPY)
-class Entropy(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        return StatisticResult(
-            value=round(stats.entropy(np.histogram(ts, bins=int(np.sqrt(len(ts))))[0] / len(ts)))
-        )
+class Entropy(GroupedStatistic):
+    digits = 0
+
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        # энтропия гистограммы с int(sqrt(n)) интервалами, как stats.entropy(np.histogram(...)[0] / n)
+        bins = np.sqrt(m.size).astype(int)
+        bin_group = np.repeat(np.arange(len(m)), bins)
+        pk = m.histogram(bins) / m.size[bin_group]
+        pk = pk / np.bincount(bin_group, weights=pk, minlength=len(m))[bin_group]
+        return np.bincount(bin_group, weights=entr(pk), minlength=len(m))
 
 @StatisticsFactory.register(name=RusStatMetricEnum.VAR_COEFF)
-class VariationCoefficient(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        mean = np.mean(ts)
-        std = np.std(ts, ddof=1)
-        return StatisticResult(value=100 * std / mean)
+class VariationCoefficient(GroupedStatistic):
+    def group_values(self, m: SeriesMoments) -> np.ndarray:
+        return 100 * m.std / m.mean
 
 @StatisticsFactory.register(name=RusStatMetricEnum.HODGES_LEHMANN)
-class HodgesLehmann(StatisticsServiceI):
-    def get_value(self, ts: np.ndarray) -> StatisticResult:
-        value = round(np.median([(x + y) / 2 for x, y in combinations_with_replacement(ts, 2)]))
-        return StatisticResult(value=value)
\ No newline at end of file
+class HodgesLehmann(ContextStatistic):
+    def from_context(self, ctx: StatisticsContext) -> StatisticResult:
+        value = round(walsh_median(ctx.sorted, with_replacement=True)) if ctx.n else None
+        return StatisticResult(value=value)
+
+
+def _is_constant(m: SeriesMoments) -> np.ndarray:
+    """
+    Группа неотличима от константы на фоне своего уровня - те же условия, что в scipy.stats.skew, kurtosis и zscore:
+    дисперсия не больше (eps * среднее)^2 или отклонения от среднего меньше 10 eps среднего
+    (потеря точности: scipy предупреждает, и по отдельному ряду статистика была None)
+    """
+    eps = np.finfo(float).eps
+    spread = np.maximum(m.max - m.mean, m.mean - m.min)
+    return (m.m2 <= (eps * m.mean) ** 2) | ((spread / np.abs(m.mean) < 10 * eps) & (m.size > 1))
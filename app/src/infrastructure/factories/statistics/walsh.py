@@ -0,0 +1,128 @@
+import numpy as np
+
+
+def walsh_median(values: np.ndarray, with_replacement: bool) -> float:
+    """
+    Функция, возвращающая медиану средних Уолша (x_i + x_j) / 2 за O(n log n) на итерацию выбора без построения всех пар.
+    Результат совпадает с np.median([(x + y) / 2 for x, y in combinations(values, 2)]) до бита
+    (combinations_with_replacement, если with_replacement).
+
+    Средние Уолша отсортированного ряда образуют неявную матрицу, строки которой не убывают, поэтому
+    k-я порядковая статистика ищется отбором кандидатов по опорным элементам, как в алгоритме Монахана.
+    Детали: Monahan J. F. Algorithm 616: fast computation of the Hodges-Lehmann location estimator //
+    ACM Transactions on Mathematical Software. – 1984. – Т. 10. – №. 3. – С. 265-270.
+
+    Keyword arguments:
+    values -- значения ряда.
+    with_replacement -- учитывать ли пары (x_i, x_i).
+    """
+    x = np.sort(np.asarray(values))
+    n_obs = x.shape[0]
+    # так же, как np.median по списку пар: NaN в парах (NaN в ряду или -inf + inf) дает NaN.
+    # np.sort ставит NaN в конец
+    if n_obs and (np.isnan(x[-1]) or (x[0] == -np.inf and x[-1] == np.inf)):
+        return np.nan
+
+    start = np.arange(n_obs) if with_replacement else np.arange(1, n_obs + 1)
+    n_pairs = int((n_obs - start).sum())
+    if n_pairs == 0:
+        return np.median(np.array([], dtype=x.dtype))
+
+    middle = n_pairs // 2
+    ranks = [middle] if n_pairs % 2 else [middle - 1, middle]
+    return np.median(np.array([_select(x, start, k) for k in ranks]))
+
+
+def _walsh(x: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # то же выражение и тот же dtype, что (x + y) / 2 для элементов массива
+    return (x[rows] + x[cols]) / 2
+
+
+def _select(x: np.ndarray, start: np.ndarray, k: int, brute_force: int = 4096, sample_size: int = 4096):
+    """
+    k-е (с нуля) по возрастанию среднее Уолша.
+
+    Строка i - средние (x_i + x_j) / 2 при j из [start_i, n), они не убывают по j, так как x отсортирован
+    и округление суммы монотонно. Равные значения упорядочиваются по (i, j), тогда все элементы различны
+    и в каждой строке остаются кандидатами столбцы [lo_i, hi_i): левее лежат элементы меньше искомого, правее - больше.
+
+    Опорные элементы выбираются, как в алгоритме Флойда-Ривеста: по случайной выборке кандидатов берутся два элемента
+    по обе стороны от искомого ранга, и за итерацию кандидатов становится в ~sqrt(sample_size) / 4 раз меньше.
+    """
+    n_obs = x.shape[0]
+    rows = np.arange(n_obs)
+    lo, hi = start.copy(), np.full(n_obs, n_obs)
+    rank = k
+    rng = np.random.default_rng(0)
+
+    while True:
+        sizes = hi - lo
+        offsets = np.cumsum(sizes) - sizes
+        total = int(sizes.sum())
+        if total <= brute_force:
+            cand_rows = np.repeat(rows, sizes)
+            cand_cols = np.arange(total) - np.repeat(offsets - lo, sizes)
+            return np.partition(_walsh(x, cand_rows, cand_cols), rank)[rank]
+
+        # случайная выборка кандидатов в порядке (значение, строка, столбец)
+        position = np.sort(rng.integers(total, size=sample_size))
+        sample_rows = np.searchsorted(offsets, position, side='right') - 1
+        sample_cols = lo[sample_rows] + position - offsets[sample_rows]
+        order = np.lexsort((sample_cols, sample_rows, _walsh(x, sample_rows, sample_cols)))
+
+        # искомый элемент лежит между опорными с вероятностью ~1 - 1e-4
+        margin = 2 * np.sqrt(sample_size)
+        quantile = rank / total * sample_size
+        pivots = [order[max(int(quantile - margin), 0)], order[min(int(quantile + margin), sample_size - 1)]]
+        # выборка с повторениями: оба опорных могут оказаться одним элементом
+        pivots = list(dict.fromkeys((int(sample_rows[i]), int(sample_cols[i])) for i in pivots))
+
+        for pivot_row, pivot_col in pivots:
+            bound = _bound(x, rows, lo, hi, pivot_row, pivot_col)
+            below = int((bound - lo).sum())
+            if below == rank:
+                return _walsh(x, np.array([pivot_row]), np.array([pivot_col]))[0]
+            if below > rank:
+                hi = bound
+                break
+            rank -= below + 1
+            lo = bound
+            lo[pivot_row] += 1
+
+
+def _bound(x: np.ndarray, rows: np.ndarray, lo: np.ndarray, hi: np.ndarray, pivot_row: int, pivot_col: int) -> np.ndarray:
+    """Сколько столбцов каждой строки (считая от начала строки) меньше опорного элемента в порядке (значение, строка, столбец)"""
+    pivot = _walsh(x, np.array([pivot_row]), np.array([pivot_col]))[0]
+    # в строках выше опорной равные ему тоже меньше, ниже - больше
+    less = _row_bound(x, rows, lo, hi, pivot, strict=True)
+    less_equal = _row_bound(x, rows, lo, hi, pivot, strict=False)
+    bound = np.where(rows < pivot_row, less_equal, less)
+    bound[pivot_row] = pivot_col
+    return bound
+
+
+def _row_bound(x: np.ndarray, rows: np.ndarray, lo: np.ndarray, hi: np.ndarray, pivot, strict: bool) -> np.ndarray:
+    """Первый столбец из [lo_i, hi_i), где среднее >= pivot (> pivot, если не strict), двоичным поиском по всем строкам"""
+    lo, hi = lo.copy(), hi.copy()
+
+    # (x_i + x_j) / 2 сравнивается с pivot так же, как x_j с 2 * pivot - x_i, с точностью до округления.
+    # Граница ищется в x за O(log n) на строку, затем точный двоичный поиск идет только внутри зазора округления.
+    # Ошибка вычисленного среднего не больше eps * max|x| / 2, tol берется с запасом
+    scale = max(abs(float(x[0])), abs(float(x[-1])), abs(float(pivot)))
+    tol = 8 * np.finfo(np.result_type(pivot)).eps * scale
+    if np.isfinite(tol):
+        # порог убывает по строкам, по возрастанию searchsorted идет по x последовательно
+        threshold = 2 * float(pivot) - x[::-1].astype(np.float64)
+        lo = np.clip(np.searchsorted(x, threshold - tol, side='left')[::-1], lo, hi)
+        hi = np.clip(np.searchsorted(x, threshold + tol, side='right')[::-1], lo, hi)
+
+    # поиск идет только в строках, где он еще не закончился
+    active = np.flatnonzero(lo < hi)
+    while active.size:
+        mid = (lo[active] + hi[active]) // 2
+        value = _walsh(x, rows[active], mid)
+        go_right = (value < pivot) if strict else (value <= pivot)
+        lo[active[go_right]] = mid[go_right] + 1
+        hi[active[~go_right]] = mid[~go_right]
+        active = active[lo[active] < hi[active]]
+    return lo
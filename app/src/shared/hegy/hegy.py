@@ -1,9 +1,12 @@
-from math import ceil, pi, sqrt
+from functools import lru_cache
+from math import ceil, pi
+from pathlib import Path
 from typing import Literal
 from warnings import simplefilter
 
 import numpy as np
 import pandas as pd
+from scipy.linalg import solve_triangular
 from scipy.stats import chi2, norm
 from statsmodels.api import OLS
 
@@ -30,6 +33,25 @@ TYPES = {
     "all": "CFt",
 }
 
+# Таблицы загружаются один раз при импорте, путь - относительно модуля, а не рабочей директории.
+# Ключ - (test, trend, criteria)
+_TABLES: dict[tuple[str, str, str], np.ndarray] = {
+    (test, *path.stem.split("_")[1:]): np.load(path)
+    for test, name in TYPES.items()
+    for path in (Path(__file__).parent / "hegy_coefs").glob(f"{name}_*.npy")
+}
+
+# Вероятности, для которых в таблицах заданы квантили
+_PS = np.hstack(
+    [
+        (0.0001, 0.0002, 0.0005),
+        np.linspace(0.001, 0.010, 10),
+        np.linspace(0.015, 0.985, 195),
+        np.linspace(0.990, 0.999, 10),
+        (0.9995, 0.9998, 0.9999),
+    ]
+)
+
 
 def _aux_regressors(y: np.ndarray, S: int) -> np.ndarray:
     evenS = 1 - (S % 2)
@@ -67,6 +89,58 @@ def _seasonal_dummies(rows: int, S: int) -> np.ndarray:
     return np.tile(np.eye(S), ceil(rows / S))[1:, :rows].T
 
 
+class _NestedOLS:
+    """
+    МНК-оценки для вложенных моделей из первых p столбцов X по одному QR-разложению X.
+
+    Первые p столбцов Q порождают те же пространства, что и первые p столбцов X, поэтому
+    RSS модели из p столбцов - RSS полной модели плюс сумма квадратов z = Q'Y начиная с p.
+    Информационные критерии и статистики Вальда считаются так же, как в statsmodels OLS.
+    """
+
+    def __init__(self, Y: np.ndarray, X: np.ndarray):
+        self.nobs, self.k = X.shape
+        self._q, self._r = np.linalg.qr(X)
+        self._z = self._q.T @ Y[:, 0]
+
+        resid = Y[:, 0] - self._q @ self._z
+        tail = np.cumsum((self._z**2)[::-1])[::-1]
+        self.rss = resid @ resid + np.append(tail, 0.0)
+
+    @property
+    def full_rank(self) -> bool:
+        return self.nobs > self.k and np.linalg.matrix_rank(self._r) == self.k
+
+    def info_criteria(self, criteria: str, p: int) -> float:
+        llf = -self.nobs / 2 * (np.log(2 * np.pi) + np.log(self.rss[p] / self.nobs) + 1)
+        match criteria:
+            case "aic":
+                penalty = 2 * p
+            case "bic":
+                penalty = np.log(self.nobs) * p
+            case _:
+                penalty = 2 * np.log(np.log(self.nobs)) * p
+        return -2 * llf + penalty
+
+    def wald(self, p: int, restrictions: list[tuple[str, list[int]]]) -> list[float]:
+        """
+        Статистики Вальда для гипотез о равенстве нулю групп коэффициентов модели из p столбцов:
+        t-статистика для гипотезы "t" об одном коэффициенте, F-статистика для гипотезы "f".
+        """
+        r_inv = solve_triangular(self._r[:p, :p], np.eye(p))
+        params = r_inv @ self._z[:p]
+        cov = self.rss[p] / (self.nobs - p) * (r_inv @ r_inv.T)
+
+        stats = []
+        for kind, idx in restrictions:
+            if kind == "t":
+                stats.append(float(params[idx[0]] / np.sqrt(cov[idx[0], idx[0]])))
+            else:
+                b = params[idx]
+                stats.append(float(b @ np.linalg.solve(cov[np.ix_(idx, idx)], b) / len(idx)))
+        return stats
+
+
 def seasonalURoot(
     y: np.ndarray | pd.Series,
     max_lag: int | None = None,
@@ -120,6 +194,77 @@ def seasonalURoot(
     _Y, _X = np.hsplit(datamat, [1])
     del datamat
 
+    result = pd.DataFrame({"stat": np.empty(Star + 3), "pval": np.empty(Star + 3)})
+    result.index = (
+        ["Zero freq"]
+        + (["Nyquist"] if evenS else [])
+        + [f"{i}w" for i in range(1, Star - evenS + 1)]
+        + ["Seas.", "ALL"]
+    )
+
+    _common = {
+        "T": rows,
+        "S": S,
+        "lags": max_lag,
+        "trend": trend,
+        "criteria": criteria,
+    }
+
+    # гипотезы теста: нулевая частота, частота Найквиста, пары коэффициентов частот k, все сезонные, все
+    restrictions = (
+        [("t", [0])]
+        + ([("t", [S - 1])] if evenS else [])
+        + [("f", [2 * k - 1, 2 * k]) for k in range(1, Star - evenS + 1)]
+        + [("f", list(range(1, S))), ("f", list(range(S)))]
+    )
+
+    nested = _NestedOLS(_Y, _X)
+    if nested.full_rank:
+        cols = nested.k
+        if criteria != "fixed" and max_lag > 0:
+            ic_value = float("inf")
+            for lag in range(max_lag + 1):
+                loop_value = nested.info_criteria(criteria, _offset + lag)
+
+                if loop_value < ic_value:
+                    ic_value = loop_value
+                    cols = _offset + lag
+                else:
+                    break
+
+        result["stat"] = nested.wald(cols, restrictions)
+    else:
+        result["stat"] = _ols_stats(_Y, _X, _offset, max_lag, criteria, restrictions)
+
+    if not stats_only:
+        tests = (
+            ["zero"]
+            + (["pi"] if evenS else [])
+            + ["pair"] * (Star - evenS)
+            + ["seas", "all"]
+        )
+        pvals = np.empty(len(tests))
+        stats = result["stat"].to_numpy()
+        # статистики одного теста (все пары частот) считаются одним вызовом
+        for test in dict.fromkeys(tests):
+            rows_mask = np.array([t == test for t in tests])
+            pvals[rows_mask] = seasonalURootCV(x=stats[rows_mask], test=test, **_common)
+        result["pval"] = pvals
+
+    return result
+
+
+def _ols_stats(
+    _Y: np.ndarray,
+    _X: np.ndarray,
+    _offset: int,
+    max_lag: int,
+    criteria: str,
+    restrictions: list[tuple[str, list[int]]],
+) -> list[float]:
+    """
+    Подбор лагов и статистики теста через statsmodels OLS для вырожденной матрицы регрессоров.
+    """
     ic_model = None
     ic_value = float("inf")
 
@@ -138,69 +283,44 @@ def seasonalURoot(
 
     assert ic_model is not None, "Что-то пошло не так, модель не подобрана!"
 
-    result = pd.DataFrame({"stat": np.empty(Star + 3), "pval": np.empty(Star + 3)})
-    result.index = (
-        ["Zero freq"]
-        + (["Nyquist"] if evenS else [])
-        + [f"{i}w" for i in range(1, Star - evenS + 1)]
-        + ["Seas.", "ALL"]
-    )
-
-    _common = {
-        "T": rows,
-        "S": S,
-        "lags": max_lag,
-        "trend": trend,
-        "criteria": criteria,
-    }
-
     cols = ic_model.params.size
 
-    rmatrix = np.zeros(cols)
-    rmatrix[0] = 1
-    result.loc["Zero freq", "stat"] = ic_model.t_test(rmatrix).tvalue
-    if evenS:
-        rmatrix = np.zeros(cols)
-        rmatrix[S - 1] = 1
-        result.loc["Nyquist", "stat"] = ic_model.t_test(rmatrix).tvalue
+    stats = []
+    for kind, idx in restrictions:
+        rmatrix = np.zeros((len(idx), cols))
+        rmatrix[np.arange(len(idx)), idx] = 1
+        if kind == "t":
+            stats.append(float(np.squeeze(ic_model.t_test(rmatrix).tvalue)))
+        else:
+            stats.append(float(np.squeeze(ic_model.f_test(rmatrix).fvalue)))
+    return stats
 
-    for k in range(1, Star - evenS + 1):
-        rmatrix = np.zeros((2, cols))
-        rmatrix[:, (2 * k - 1) : (2 * k + 1)] = np.eye(2)
-        result.loc[f"{k}w", "stat"] = ic_model.f_test(rmatrix).fvalue
 
-    rmatrix = np.zeros((S - 1, cols))
-    rmatrix[:, 1:S] = np.eye(S - 1)
-    result.loc["Seas.", "stat"] = ic_model.f_test(rmatrix).fvalue
+@lru_cache
+def _gls_weights(regT: int) -> np.ndarray:
+    """
+    Матрицы весов GLS-регрессии для всех окрестностей из regT соседних вероятностей.
 
-    rmatrix = np.zeros((S, cols))
-    rmatrix[:, :S] = np.eye(S)
-    result.loc["ALL", "stat"] = ic_model.f_test(rmatrix).fvalue
+    Ковариация квантилей в окрестности Sigma = D C D, где D - диагональ стандартных ошибок из таблицы,
+    а C зависит только от вероятностей. Поэтому inv(cholesky(Sigma, upper)).T = inv(cholesky(C, upper)).T @ inv(D),
+    и первый множитель считается заранее для каждой окрестности.
+    """
+    weights = np.empty((len(_PS) - regT + 1, regT, regT))
+    for start in range(len(weights)):
+        regP = _PS[start : start + regT]
+        lo, hi = np.minimum.outer(regP, regP), np.maximum.outer(regP, regP)
+        corr = np.sqrt((lo * (1 - hi)) / (hi * (1 - lo)))
+        weights[start] = np.linalg.inv(np.linalg.cholesky(corr, upper=True)).T
+    return weights
 
-    if not stats_only:
-        result.loc["Zero freq", "pval"] = seasonalURootCV(
-            x=result.loc["Zero freq", "stat"], test="zero", **_common
-        )
-        if evenS:
-            result.loc["Nyquist", "pval"] = seasonalURootCV(
-                x=result.loc["Nyquist", "stat"], test="pi", **_common
-            )
-        for k in range(1, Star - evenS + 1):
-            result.loc[f"{k}w", "pval"] = seasonalURootCV(
-                x=result.loc[f"{k}w", "stat"], test="pair", **_common
-            )
-        result.loc["Seas.", "pval"] = seasonalURootCV(
-            x=result.loc["Seas.", "stat"], test="seas", **_common
-        )
-        result.loc["ALL", "pval"] = seasonalURootCV(
-            x=result.loc["ALL", "stat"], test="all", **_common
-        )
 
-    return result
+@lru_cache
+def _quantiles(df: int) -> np.ndarray:
+    return chi2.ppf(_PS, df=df) if df else norm.ppf(_PS)
 
 
 def seasonalURootCV(
-    x: float,
+    x: float | np.ndarray,
     T: int,
     S: int,
     lags: int,
@@ -209,8 +329,11 @@ def seasonalURootCV(
     criteria: Literal["aic", "bic", "fixed"] = "fixed",
     regT: int = 15,
 ):
-    # data = rr.read_r(f"hegy_cv/{TYPES[test]}_{trend}_{criteria}.Rds")[None].values
-    data = np.load(f"src/shared/hegy/hegy_coefs/{TYPES[test]}_{trend}_{criteria}.npy")
+    """
+    p-значения статистик теста по таблицам функций распределения (Diaz-Emparanza, 2014).
+    x может быть массивом статистик одного теста, тогда возвращается массив p-значений.
+    """
+    data = _TABLES[(test, trend, criteria)]
 
     isFtest = test not in ("zero", "pi")
     match test:
@@ -229,16 +352,7 @@ def seasonalURootCV(
     sd = data[:, -1]
     T = T - S - lags - nd
 
-    Ps = np.hstack(
-        [
-            (0.0001, 0.0002, 0.0005),
-            np.linspace(0.001, 0.010, 10),
-            np.linspace(0.015, 0.985, 195),
-            np.linspace(0.990, 0.999, 10),
-            (0.9995, 0.9998, 0.9999),
-        ]
-    )
-    nPs = len(Ps)
+    nPs = len(_PS)
 
     vars = np.array(
         [
@@ -266,49 +380,30 @@ def seasonalURootCV(
     Qs = Qs[idx]
     sd = sd[idx]
 
-    if x < Qs.min():
-        return 1.0 if isFtest else 0.0
-    elif x > Qs.max():
-        return 0.0 if isFtest else 1.0
-
-    try:
-        mask = np.where(x > Qs)[0].max()
-    except ValueError:
-        mask = 0
-
-    if mask < nPs - 1:
-        mask += 0 if (x - Qs[mask]) < (Qs[mask + 1] - x) else 1
-    else:
-        mask = nPs - 1
-
-    mask = max(mask, regT // 2)
-    mask = min(mask, nPs - regT // 2 - 1)
+    x = np.asarray(x, dtype=float)
+    xs = x.reshape(-1)
 
-    regQ = Qs[(mask - regT // 2) : (mask - regT // 2 + regT)]
-    regP = Ps[(mask - regT // 2) : (mask - regT // 2 + regT)]
-    regSD = sd[(mask - regT // 2) : (mask - regT // 2 + regT)]
+    # ближайшая к x точка таблицы - центр окрестности из regT точек
+    mask = np.maximum(np.searchsorted(Qs, xs, side="left") - 1, 0)
+    inner = mask < nPs - 1
+    nearer_right = ~((xs - Qs[mask]) < (Qs[np.minimum(mask + 1, nPs - 1)] - xs))
+    mask = np.where(inner, mask + nearer_right, nPs - 1)
+    start = np.clip(mask, regT // 2, nPs - regT // 2 - 1) - regT // 2
 
-    Y = chi2.ppf(regP, df=df) if isFtest else norm.ppf(regP)
-    X = np.vstack([np.ones(regT), regQ, regQ**2, regQ**3]).T
-
-    Sigma = np.empty((regT, regT))
-    for i in range(regT):
-        for j in range(regT):
-            if i <= j:
-                Sigma[i, j] = (regSD[i] * regSD[j]) * sqrt(
-                    (regP[i] * (1 - regP[j])) / (regP[j] * (1 - regP[i]))
-                )
-            else:
-                Sigma[i, j] = (regSD[i] * regSD[j]) * sqrt(
-                    (regP[j] * (1 - regP[i])) / (regP[i] * (1 - regP[j]))
-                )
+    window = start[:, None] + np.arange(regT)
+    regQ = Qs[window]
+    weights = _gls_weights(regT)[start]
 
-    Chol = np.linalg.inv(np.linalg.cholesky(Sigma, upper=True)).T
+    X = weights @ (np.stack([np.ones_like(regQ), regQ, regQ**2, regQ**3], axis=-1) / sd[window][..., None])
+    Y = np.einsum("nij,nj->ni", weights, _quantiles(df)[window] / sd[window])
 
-    X = Chol @ X
-    Y = Chol @ Y
+    coefP = np.linalg.solve(
+        X.transpose(0, 2, 1) @ X, np.einsum("nji,nj->ni", X, Y)[..., None]
+    )[..., 0]
+    value = np.einsum("nk,nk->n", coefP, np.stack([np.ones_like(xs), xs, xs**2, xs**3], axis=-1))
 
-    coefP = np.linalg.solve(X.T @ X, X.T @ Y)
-    value = np.dot(coefP, (1, x, x**2, x**3))
+    pval = chi2.cdf(np.abs(value), df=df) if isFtest else norm.cdf(value)
+    pval = np.where(xs < Qs[0], 1.0 if isFtest else 0.0, pval)
+    pval = np.where(xs > Qs[-1], 0.0 if isFtest else 1.0, pval)
 
-    return chi2.cdf(abs(value), df=df) if isFtest else norm.cdf(value)
+    return float(pval[0]) if x.ndim == 0 else pval.reshape(x.shape)
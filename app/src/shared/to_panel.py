@@ -2,6 +2,16 @@ import pandas as pd
 from fastapi import HTTPException
 
 
+def validate_exog_columns(columns: pd.Index) -> None:
+    # Проверка конфликта имен
+    conflict_columns = set(columns) & {'unique_id', 'ds', 'y'}
+    if conflict_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Конфликт имен в экзогенных переменных: {conflict_columns}"
+        )
+
+
 def to_panel(
         target: pd.Series,
         exog: pd.DataFrame | None = None,
@@ -16,13 +26,7 @@ def to_panel(
         }
     )
     if exog is not None and not exog.empty:
-        # Проверка конфликта имен
-        conflict_columns = set(exog.columns) & {'unique_id', 'ds', 'y'}
-        if conflict_columns:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Конфликт имен в экзогенных переменных: {conflict_columns}"
-            )
+        validate_exog_columns(exog.columns)
 
         # Объединяем с экзогенными переменными
         df = df.set_index('ds')
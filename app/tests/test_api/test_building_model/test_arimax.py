@@ -0,0 +1,53 @@
+import io
+import json
+import pickle
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+
+def _variable(name: str, values: np.ndarray, dates: pd.DatetimeIndex) -> dict:
+    return {
+        "name": name,
+        "values": values.tolist(),
+        "dates": [date.strftime("%Y-%m-%d") for date in dates],
+        "data_frequency": "ME",
+    }
+
+
+def _request(exog: np.ndarray) -> dict:
+    dates = pd.date_range("2010-01-31", periods=80, freq="ME")
+    target = np.cumsum(np.random.default_rng(0).normal(size=80)) + 50
+    return dict(
+        model_data=dict(
+            dependent_variables=_variable("target", target, dates),
+            explanatory_variables=[_variable("exog", exog, dates)],
+        ),
+        hyperparameters=dict(p=1, d=1, q=0),
+        fit_params=dict(train_boundary="2014-12-31", val_boundary="2015-12-31", forecast_horizon=6),
+    )
+
+
+def test_arimax_fit_archive(client):
+    response = client.post(
+        url="/api/v1/building_model/arimax/fit",
+        json=_request(np.random.default_rng(1).normal(size=80)),
+    )
+    assert response.status_code == 200
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+        assert zipf.testzip() is None
+        fit_results = json.loads(zipf.read("fit_results.json"))
+        # по умолчанию файл модели в архиве - обычный pickle
+        model = pickle.loads(zipf.read("model.pickle"))
+
+    assert fit_results["model_id"]
+    assert fit_results["forecasts"]["forecast"]["values"]
+    assert model.params.shape[0] > 0
+
+
+def test_arimax_fit_error_before_stream(client):
+    # константа в экзогенных переменных при trend='c' - ошибка обучения, а не оборванный архив
+    response = client.post(url="/api/v1/building_model/arimax/fit", json=_request(np.ones(80)))
+    assert response.status_code == 400
@@ -1,3 +1,4 @@
+import json
 from datetime import date
 
 import pytest
@@ -6,6 +7,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from src.core.application.preliminary_diagnosis.use_cases.fao import FaoBatchUC
 from src.infrastructure.adapters.preliminary_diagnosis.fao import proc_res
 
 
@@ -139,3 +141,37 @@ def test_fao_day_freq(num, client):
         fao_plot(data, ts, title='Fao plot day freq', file='fao_plot_day.png')
     else:
         assert result.status_code == 400, num
+
+
+@pytest.mark.parametrize("chunk_size", [256, 3])
+def test_fao_batch_matches_single_requests(client, monkeypatch, chunk_size):
+    # при маленькой порции ряды одного запроса считаются в нескольких порциях
+    monkeypatch.setattr(FaoBatchUC, "chunk_size", chunk_size)
+
+    series = [process_ts(130), process_ts(12), process_ts_day(500), process_ts(60)]
+    for i, ts in enumerate(series):
+        ts["name"] = f"ts_{i}"
+
+    result = client.post(
+        url='/api/v1/preliminary_diagnosis/data_representations/fao/batch',
+        json={"ts": series}
+    )
+    assert result.status_code == 200, result.text
+    assert result.headers["content-type"].startswith("application/x-ndjson")
+
+    items = [json.loads(line) for line in result.text.splitlines()]
+    assert [item["name"] for item in items] == ["ts_0", "ts_1", "ts_2", "ts_3"]
+
+    for ts, item in zip(series, items):
+        single = client.post(
+            url='/api/v1/preliminary_diagnosis/data_representations/fao',
+            json={"ts": ts}
+        )
+        if single.status_code == 200:
+            assert item["error"] is None
+            assert item["result"] == single.json()
+        else:
+            assert item["result"] is None
+            assert item["error"] == single.json()["detail"]
+
+    assert items[1]["error"] is not None
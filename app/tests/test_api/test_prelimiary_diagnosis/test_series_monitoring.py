@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def monthly_ts(name: str, num: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "name": name,
+        "dates": [d.strftime("%Y-%m-%d") for d in pd.date_range("2010-01-31", periods=num, freq="ME")],
+        "values": (100 + np.cumsum(rng.normal(size=num))).tolist(),
+        "data_frequency": "ME",
+    }
+
+
+@pytest.fixture
+def sweep_request():
+    return {
+        "timeseries": [monthly_ts("ts_0", 120, 0), monthly_ts("ts_1", 8, 1), monthly_ts("ts_2", 96, 2)],
+        "tests": ["student_test", "fisher_test", "two_sigma_test", "break_finder"],
+        "date_boundary": "2015-01-31",
+        "equal_var": False,
+        "alpha": 0.1,
+        "break_finder": {"criterion": "ssr", "n_breaks": 2},
+    }
+
+
+def test_sweep_matches_single_endpoints(client, sweep_request):
+    result = client.post(url='/api/v1/preliminary_diagnosis/series_monitoring/sweep', json=sweep_request)
+    assert result.status_code == 200, result.text
+    rows = result.json()["results"]
+    assert [(row["name"], row["test"]) for row in rows] == [
+        (ts["name"], test) for ts in sweep_request["timeseries"] for test in sweep_request["tests"]
+    ]
+
+    common = {key: sweep_request[key] for key in ("date_boundary", "equal_var", "alpha")}
+    for row in rows:
+        if row["name"] == "ts_1":
+            continue
+        ts = next(ts for ts in sweep_request["timeseries"] if ts["name"] == row["name"])
+        if row["test"] == "break_finder":
+            single = client.post(
+                url='/api/v1/preliminary_diagnosis/series_monitoring/break_finder',
+                json={"timeseries": ts, **sweep_request["break_finder"]},
+            )
+        else:
+            single = client.post(
+                url=f'/api/v1/preliminary_diagnosis/series_monitoring/{row["test"]}',
+                json={"timeseries": ts, **common},
+            )
+
+        if single.status_code != 200:
+            assert row["error"] is not None
+            continue
+
+        assert row["error"] is None
+        expected = single.json()
+        if row["test"] == "break_finder":
+            assert row["datetime"] == expected["break_datetimes"]
+        elif row["test"] == "two_sigma_test":
+            assert row["statistic"] == [r["std"] for r in expected["results"]]
+            assert row["ci_lower"] == [r["confidence_interval"][0] for r in expected["results"]]
+            assert row["conclusion"] == [r["conclusion"] for r in expected["results"]]
+        else:
+            assert row["statistic"] == [r["statistic"] for r in expected["results"]]
+            assert row["p_value"] == [r["p_value"] for r in expected["results"]]
+            assert row["conclusion"] == [r["conclusion"] for r in expected["results"]]
+
+    # короткий ряд не проходит проверки тестов, но не прерывает остальные
+    assert all(row["error"] is not None for row in rows if row["name"] == "ts_1" and row["test"] != "break_finder")
+
+
+def test_sweep_streaming(client, sweep_request):
+    result = client.post(
+        url='/api/v1/preliminary_diagnosis/series_monitoring/sweep',
+        params={"stream": True},
+        json=sweep_request,
+    )
+    assert result.status_code == 200, result.text
+    assert result.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in result.text.splitlines()]
+    expected = client.post(url='/api/v1/preliminary_diagnosis/series_monitoring/sweep', json=sweep_request)
+    assert rows == expected.json()["results"]
+
+
+def test_sweep_requires_date_boundary(client, sweep_request):
+    sweep_request.pop("date_boundary")
+    result = client.post(url='/api/v1/preliminary_diagnosis/series_monitoring/sweep', json=sweep_request)
+    assert result.status_code == 422
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+URL = '/api/v1/preliminary_diagnosis/descriptive_statistics'
+METRICS = [
+    "Number of observations", "Mean", "Mean confidence interval", "Median", "Mode", "Standard Deviation",
+    "Variance", "Excess kurtosis", "Skewness", "25% quantile", "Last z-score", "Entropy", "Trimmed Mean",
+    "Hodges Lehmann estimator",
+]
+
+
+@pytest.fixture
+def table_request():
+    rng = np.random.default_rng(0)
+    dates = [d.strftime("%Y-%m-%d") for d in pd.date_range("2010-01-31", periods=60, freq="ME")]
+    values = np.round(100 + np.cumsum(rng.normal(size=(4, 60)), axis=1), 2)
+    columns = values.tolist()
+    columns[1][:10] = [None] * 10
+    columns[2] = [None] * 59 + [5.0]
+    columns[3] = [None] * 60
+    return {"metrics": METRICS, "names": ["a", "b", "c", "d"], "dates": dates, "values": columns}
+
+
+def test_table_matches_single_series(client, table_request):
+    result = client.post(url=f'{URL}/statistics_table', json=table_request)
+    assert result.status_code == 200, result.text
+    table = result.json()
+    assert table["names"] == table_request["names"]
+
+    for num, name in enumerate(table_request["names"][:2]):
+        single = client.post(url=f'{URL}/statistics', json={
+            "metrics": METRICS,
+            "split_option": None,
+            "timeseries": {
+                "name": name, "dates": table_request["dates"], "values": table_request["values"][num],
+                "data_frequency": "ME",
+            },
+        })
+        assert single.status_code == 200, single.text
+        expected = single.json()["results"]["full series"]
+        assert {metric: column[num] for metric, column in table["results"].items()} == {
+            metric: value["value"] for metric, value in expected.items()
+        }
+
+    # одно наблюдение: разброс не определен, пустой ряд: определено только число наблюдений
+    assert table["results"]["Number of observations"] == [60, 50, 1, 0]
+    assert table["results"]["Mean"][2:] == [5.0, None]
+    assert table["results"]["Standard Deviation"][2:] == [None, None]
+
+
+def test_table_shape_mismatch(client, table_request):
+    table_request["values"][0] = table_request["values"][0][:-1]
+    result = client.post(url=f'{URL}/statistics_table', json=table_request)
+    assert result.status_code == 422
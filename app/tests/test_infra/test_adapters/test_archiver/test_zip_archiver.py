@@ -0,0 +1,50 @@
+import io
+import json
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.infrastructure.adapters.archiver import ZipArchiver
+
+
+@pytest.fixture
+def data_dict():
+    rng = np.random.default_rng(0)
+    return {
+        'forecasts': [{'dates': [datetime(2020, 1, i + 1) for i in range(20)], 'values': rng.normal(size=20).tolist()}
+                      for _ in range(500)],
+        'metrics': {'RMSE': 1.5, 'name': 'Прогноз'},
+        'empty': [],
+        'model_id': 'abc',
+    }
+
+
+@pytest.fixture
+def model_bytes():
+    return np.random.default_rng(1).normal(size=100_000).astype(np.float32).tobytes()
+
+
+def test_stream_is_valid_archive(data_dict, model_bytes):
+    archiver = ZipArchiver(chunk_size=16 * 1024)
+    chunks = list(archiver.stream(data_dict, model_bytes))
+
+    assert len(chunks) > 2
+    assert b''.join(chunks) == archiver.execute(data_dict, model_bytes)
+
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zipf:
+        assert zipf.testzip() is None
+        assert json.loads(zipf.read('fit_results.json')) == json.loads(json.dumps(data_dict, default=str))
+        assert zipf.read('model.pickle') == model_bytes
+        assert zipf.getinfo('fit_results.json').compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.getinfo('model.pickle').compress_type == zipfile.ZIP_STORED
+
+
+def test_compressed_model(data_dict):
+    model_bytes = bytes(100_000)
+    archive = ZipArchiver(model_compression=zipfile.ZIP_DEFLATED, model_compresslevel=1).execute(data_dict, model_bytes)
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as zipf:
+        assert zipf.read('model.pickle') == model_bytes
+        assert zipf.getinfo('model.pickle').compress_size < len(model_bytes) / 100
@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.domain.jobs import JobInfo, JobStatus
+from src.infrastructure.adapters.jobs import (
+    FileJobStore,
+    JobFailedError,
+    JobManager,
+    JobNotFinishedError,
+    JobNotFoundError,
+    JobQueueFullError,
+    checkpoint,
+)
+
+
+@pytest.fixture
+def job_manager(tmp_path):
+    manager = JobManager(
+        store=FileJobStore(str(tmp_path)),
+        max_workers=1,
+        max_queue=2,
+        result_ttl=timedelta(hours=1),
+    )
+    yield manager
+    manager.shutdown()
+
+
+def wait_finished(job_manager, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = job_manager.get(job_id)
+        if info.status.is_finished:
+            return info
+        time.sleep(0.01)
+    raise TimeoutError(job_id)
+
+
+def test_job_result(job_manager):
+    info = job_manager.submit(kind='test', fn=lambda: b'archive')
+    assert info.status == JobStatus.queued
+
+    info = wait_finished(job_manager, info.job_id)
+    assert info.status == JobStatus.done
+    assert info.progress == 1.0
+    assert job_manager.result(info.job_id) == b'archive'
+
+
+def test_failed_job_returns_same_http_error(job_manager):
+    def fail():
+        raise HTTPException(status_code=400, detail='bad request')
+
+    info = wait_finished(job_manager, job_manager.submit(kind='test', fn=fail).job_id)
+    assert info.status == JobStatus.failed
+
+    with pytest.raises(JobFailedError) as exc:
+        job_manager.result(info.job_id)
+    assert exc.value.status_code == 400
+    assert exc.value.error == 'bad request'
+
+
+def test_cancel_queued_and_running(job_manager):
+    started = threading.Event()
+
+    def long_running():
+        started.set()
+        while True:
+            checkpoint(progress=0.5)
+            time.sleep(0.01)
+
+    running = job_manager.submit(kind='test', fn=long_running)
+    queued = job_manager.submit(kind='test', fn=lambda: b'never')
+    started.wait(timeout=5)
+
+    assert job_manager.cancel(queued.job_id).status == JobStatus.cancelled
+    assert job_manager.get(running.job_id).progress == 0.5
+    with pytest.raises(JobNotFinishedError):
+        job_manager.result(running.job_id)
+
+    assert job_manager.cancel(running.job_id).cancel_requested
+    assert wait_finished(job_manager, running.job_id).status == JobStatus.cancelled
+
+
+def test_queue_limit(job_manager):
+    release = threading.Event()
+    for _ in range(2):
+        job_manager.submit(kind='test', fn=lambda: release.wait(timeout=5) and b'')
+
+    with pytest.raises(JobQueueFullError):
+        job_manager.submit(kind='test', fn=lambda: b'')
+    release.set()
+
+
+def test_unknown_job(job_manager):
+    with pytest.raises(JobNotFoundError):
+        job_manager.get('0' * 32)
+    with pytest.raises(JobNotFoundError):
+        job_manager.get('../etc')
+
+
+def test_orphaned_jobs_failed_on_startup(tmp_path):
+    store = FileJobStore(str(tmp_path))
+    # задачи процесса, который упал: одна так и не получила сигнала, у другой сигнал устарел
+    created_at = datetime.now() - timedelta(hours=1)
+    store.save(JobInfo(job_id='a' * 32, kind='test', created_at=created_at))
+    store.save(JobInfo(job_id='b' * 32, kind='test', status=JobStatus.running, created_at=created_at))
+    store.heartbeat('b' * 32)
+    os.utime(tmp_path / ('b' * 32) / 'heartbeat', (created_at.timestamp(), created_at.timestamp()))
+    # задача живого процесса
+    store.save(JobInfo(job_id='c' * 32, kind='test', status=JobStatus.running, created_at=created_at))
+    store.heartbeat('c' * 32)
+
+    manager = JobManager(store=store, max_workers=1, max_queue=2, result_ttl=timedelta(hours=1))
+    try:
+        for job_id in ('a' * 32, 'b' * 32):
+            info = manager.get(job_id)
+            assert info.status == JobStatus.failed
+            with pytest.raises(JobFailedError) as exc:
+                manager.result(job_id)
+            assert exc.value.status_code == 500
+        assert manager.get('c' * 32).status == JobStatus.running
+    finally:
+        manager.shutdown()
+
+
+def test_heartbeat_keeps_long_job_alive(tmp_path):
+    manager = JobManager(
+        store=FileJobStore(str(tmp_path)),
+        max_workers=1,
+        max_queue=3,
+        result_ttl=timedelta(hours=1),
+        heartbeat_interval=timedelta(seconds=0.05),
+        stale_after=timedelta(seconds=0.5),
+    )
+    release = threading.Event()
+    try:
+        running = manager.submit(kind='test', fn=lambda: release.wait(timeout=10) and b'done')
+        queued = manager.submit(kind='test', fn=lambda: b'queued')
+        time.sleep(1)
+
+        # очистка при постановке новой задачи не трогает задачи живого процесса
+        last = manager.submit(kind='test', fn=lambda: b'last')
+        assert manager.get(running.job_id).status == JobStatus.running
+        assert manager.get(queued.job_id).status == JobStatus.queued
+        assert manager.get(running.job_id).heartbeat_at > datetime.now() - timedelta(seconds=0.5)
+
+        release.set()
+        assert wait_finished(manager, running.job_id).status == JobStatus.done
+        assert wait_finished(manager, queued.job_id).status == JobStatus.done
+        assert wait_finished(manager, last.job_id).status == JobStatus.done
+    finally:
+        release.set()
+        manager.shutdown()
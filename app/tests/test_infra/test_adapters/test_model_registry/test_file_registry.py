@@ -0,0 +1,86 @@
+import hashlib
+import os
+import time
+
+import pytest
+
+from src.infrastructure.adapters.model_registry import FileModelRegistry, ModelNotFoundError
+
+
+def test_save_is_content_addressed(tmp_path):
+    registry = FileModelRegistry(str(tmp_path), ttl_seconds=60, max_bytes=10 ** 6)
+
+    model_id = registry.save(b'model')
+    assert model_id == hashlib.sha256(b'model').hexdigest()
+    assert registry.save(b'model') == model_id
+    assert registry.load(model_id) == b'model'
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_unknown_or_malformed_id(tmp_path):
+    registry = FileModelRegistry(str(tmp_path), ttl_seconds=60, max_bytes=10 ** 6)
+
+    with pytest.raises(ModelNotFoundError):
+        registry.load('0' * 64)
+    with pytest.raises(ModelNotFoundError):
+        registry.load('../' + '0' * 61)
+
+
+def test_expired_models_removed(tmp_path):
+    registry = FileModelRegistry(str(tmp_path), ttl_seconds=60, max_bytes=10 ** 6)
+    old_id = registry.save(b'old')
+    expired = time.time() - 120
+    os.utime(tmp_path / f'{old_id}.pickle', (expired, expired))
+
+    registry.save(b'new')
+    with pytest.raises(ModelNotFoundError):
+        registry.load(old_id)
+
+
+def test_least_recently_used_evicted_by_size(tmp_path):
+    registry = FileModelRegistry(str(tmp_path), ttl_seconds=60, max_bytes=20)
+    first, second = registry.save(b'a' * 8), registry.save(b'b' * 8)
+    now = time.time()
+    os.utime(tmp_path / f'{first}.pickle', (now - 10, now - 10))
+    os.utime(tmp_path / f'{second}.pickle', (now - 20, now - 20))
+
+    registry.load(first)
+    registry.save(b'c' * 8)
+
+    with pytest.raises(ModelNotFoundError):
+        registry.load(second)
+    assert registry.load(first) == b'a' * 8
+
+
+def test_load_does_not_recreate_removed_model(tmp_path, monkeypatch):
+    registry = FileModelRegistry(str(tmp_path), ttl_seconds=60, max_bytes=10 ** 6)
+    model_id = registry.save(b'model')
+    path = tmp_path / f'{model_id}.pickle'
+    read_bytes = type(path).read_bytes
+
+    def read_then_removed(self):
+        # очистка другого процесса удаляет файл сразу после чтения
+        data = read_bytes(self)
+        self.unlink()
+        return data
+
+    monkeypatch.setattr(type(path), 'read_bytes', read_then_removed)
+    assert registry.load(model_id) == b'model'
+    assert not path.exists()
+
+    monkeypatch.undo()
+    assert registry.save(b'model') == model_id
+    assert registry.load(model_id) == b'model'
+
+
+def test_orphaned_tmp_files_removed(tmp_path):
+    registry = FileModelRegistry(str(tmp_path), ttl_seconds=60, max_bytes=10 ** 6)
+    orphan, fresh = tmp_path / 'orphan.tmp', tmp_path / 'fresh.tmp'
+    orphan.write_bytes(b'partial')
+    fresh.write_bytes(b'partial')
+    expired = time.time() - 120
+    os.utime(orphan, (expired, expired))
+
+    registry.save(b'model')
+    assert not orphan.exists()
+    assert fresh.exists()
@@ -0,0 +1,70 @@
+import numpy as np
+
+from src.core.domain.parameter_selection.search_strategy.interface import OrderBounds, ScoreTask, ScoreResult
+from src.core.domain.parameter_selection.search_strategy.search_strategy import SearchStrategy
+from src.infrastructure.factories.search_strategy import SearchStrategyFactory
+
+OPTIMUM = (2, 1, 1, 0, 1)
+BOUNDS = OrderBounds(max_p=3, max_q=3, max_P=2, max_D=1, max_Q=2)
+
+
+def quadratic_score(tasks: list[ScoreTask], calls: list) -> list[ScoreResult]:
+    """Скор с единственным минимумом в OPTIMUM, чем больше maxiter, тем точнее"""
+    calls.extend(tasks)
+    return [
+        ScoreResult(
+            order=task.order,
+            score=sum((a - b) ** 2 for a, b in zip(task.order, OPTIMUM)) + 1 / task.maxiter,
+            fitted_params=[float(task.maxiter)],
+        )
+        for task in tasks
+    ]
+
+
+def test_grid_order_matches_meshgrid():
+    p, q, P, D, Q = (np.arange(bound + 1) for bound in BOUNDS.upper)
+    expected = np.array(np.meshgrid(p, q, P, D, Q)).T.reshape(-1, 5)
+
+    assert BOUNDS.grid() == [tuple(int(x) for x in row) for row in expected]
+
+
+def test_strategies_find_optimum():
+    for strategy in SearchStrategy:
+        calls = []
+        best = SearchStrategyFactory.create(strategy).search(
+            score=lambda tasks: quadratic_score(tasks, calls),
+            bounds=BOUNDS,
+            maxiter=50,
+        )
+        assert best.order == OPTIMUM, strategy
+        assert all(BOUNDS.contains(task.order) for task in calls), strategy
+
+
+def test_stepwise_fits_fewer_models_than_grid():
+    calls = []
+    SearchStrategyFactory.create(SearchStrategy.stepwise).search(
+        score=lambda tasks: quadratic_score(tasks, calls),
+        bounds=BOUNDS,
+        maxiter=50,
+    )
+
+    assert len(calls) < len(BOUNDS.grid())
+    assert len({task.order for task in calls}) == len(calls)
+
+
+def test_successive_halving_spends_full_budget_only_on_survivors():
+    calls = []
+    SearchStrategyFactory.create(SearchStrategy.successive_halving).search(
+        score=lambda tasks: quadratic_score(tasks, calls),
+        bounds=BOUNDS,
+        maxiter=50,
+    )
+
+    spent = {}
+    for task in calls:
+        spent[task.order] = spent.get(task.order, 0) + task.maxiter
+    # до полного бюджета дообучена лишь малая часть моделей
+    assert spent[OPTIMUM] == 50
+    assert sum(total == 50 for total in spent.values()) < len(BOUNDS.grid()) / 3
+    # дообучение продолжается с параметров предыдущего раунда
+    assert any(task.start_params is not None for task in calls)
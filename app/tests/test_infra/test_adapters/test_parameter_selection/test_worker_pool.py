@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from multiprocessing import shared_memory
+
+from src.core.domain.parameter_selection.scoring.information_criteria import InformationCriteriaScoring
+from src.core.domain.parameter_selection.search_strategy.interface import OrderBounds, ScoreTask
+from src.infrastructure.adapters.model_parameters_selection.arima_gridsearch import ArimaGridsearch
+from src.infrastructure.adapters.model_parameters_selection.parallel_arima_gridsearch import ParallelArimaGridsearch
+from src.infrastructure.adapters.model_parameters_selection.sarimax_scoring import score_sarimax
+from src.infrastructure.adapters.model_parameters_selection.worker_pool import ParameterSelectionPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParameterSelectionPool(n_jobs=2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-31", periods=60, freq="ME")
+    endog = pd.Series(np.cumsum(rng.normal(size=60)), index=index)
+    exog = pd.DataFrame({"x": rng.normal(size=60)}, index=index)
+    return endog, exog
+
+
+def test_pool_scores_match_sequential(pool, series):
+    endog, exog = series
+    tasks = [ScoreTask(order=order, maxiter=20) for order in OrderBounds(1, 1, 0, 0, 0).grid()]
+
+    with pool.share(endog, exog) as shared:
+        results = pool.scorer(shared, d=1, m=0, scoring=InformationCriteriaScoring.aic)(tasks)
+
+    expected = [score_sarimax(task, 1, 0, endog, exog, InformationCriteriaScoring.aic) for task in tasks]
+    assert [result.order for result in results] == [task.order for task in tasks]
+    np.testing.assert_allclose([r.score for r in results], [e.score for e in expected])
+
+
+def test_shared_memory_released_after_job(pool, series):
+    endog, _ = series
+    with pool.share(endog) as shared:
+        assert shared.shape == (60, 1)
+        assert not shared.has_exog
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared.name)
+
+
+def test_parallel_gridsearch_selects_same_model_as_sequential(pool):
+    # эталонный сезонный ряд, на котором AutoARIMA раньше работала через последовательный ArimaGridsearch
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2010-01-31", periods=96, freq="ME")
+    endog = pd.Series(
+        np.cumsum(rng.normal(size=96)) + 3 * np.sin(np.arange(96) * 2 * np.pi / 12), index=index
+    )
+    bounds = dict(max_p=2, d=1, max_q=1, max_P=1, max_D=0, max_Q=1, m=12)
+
+    expected = ArimaGridsearch().fit(endog, None, **bounds)
+    result = ParallelArimaGridsearch(pool).fit(endog, None, **bounds)
+
+    assert result.optimal_params == expected.optimal_params
+    assert result.short_representation == expected.short_representation
+    np.testing.assert_allclose(result.information_criteria_value, expected.information_criteria_value)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fastapi import HTTPException
+
+from src.infrastructure.adapters.preliminary_diagnosis.fao import FaoAdapter, get_ipa, ipa_frame
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2001-05-31", periods=120, freq="ME")
+    return pd.DataFrame(
+        {
+            "wheat": 100 + rng.normal(size=120).cumsum(),
+            "rice": np.exp(rng.normal(size=120) * 0.1 + np.linspace(0, 1, 120)),
+        },
+        index=index,
+    )
+
+
+@pytest.mark.parametrize("quarter", [True, False])
+def test_ipa_matches_weighted_moments_of_previous_years(prices, quarter):
+    result = get_ipa(prices, "wheat", quarter=quarter)
+    cgr = "cqgr" if quarter else "cygr"
+
+    rates = result[cgr]
+    min_year = rates.dropna().index.year.min()
+    weight = prices.index.year - min_year + 1
+
+    for i in (40, 77, 119):
+        prior = [j for j in range(i) if prices.index[j].month == prices.index[i].month]
+        w, c = weight[prior].to_numpy(), rates.iloc[prior].fillna(0).to_numpy()
+        wmean = (w * c).sum() / w.sum()
+        nweight = weight[i] - 1
+        wsd = np.sqrt((w * (c - wmean) ** 2).sum() / (w.sum() * (nweight - 1) / nweight))
+
+        assert result[f"ipa({cgr})"].iloc[i] == pytest.approx((rates.iloc[i] - wmean) / wsd)
+
+
+@pytest.mark.parametrize("quarter", [True, False])
+def test_ipa_frame_matches_single_series(prices, quarter):
+    _, ipa = ipa_frame(prices, prices.index, quarter=quarter)
+    cgr = "cqgr" if quarter else "cygr"
+
+    for column in prices.columns:
+        expected = get_ipa(prices, column, quarter=quarter)[f"ipa({cgr})"]
+        np.testing.assert_allclose(ipa[column].to_numpy(), expected.to_numpy())
+
+
+def test_ipa_without_growth_rates():
+    prices = pd.DataFrame({"price": np.arange(10.0)}, index=pd.date_range("2020-01-31", periods=10, freq="ME"))
+    with pytest.raises(ValueError):
+        get_ipa(prices, "price")
+
+
+def test_run_batch_matches_run(prices):
+    adapter = FaoAdapter()
+    frames = [
+        prices[["wheat"]],
+        prices[["rice"]].iloc[:60],
+        prices[["rice"]],
+        prices[["wheat"]].iloc[:10],
+    ]
+
+    expected = []
+    for frame in frames:
+        try:
+            expected.append(adapter.run(frame))
+        except HTTPException:
+            expected.append(None)
+
+    assert adapter.run_batch(frames) == expected
+    assert expected[3] is None
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from numpy.linalg import inv
+
+from src.infrastructure.adapters.preliminary_diagnosis.kim_andrews import (
+    inverse,
+    proj,
+    sigma,
+    sigma_lagged,
+    subsample_stats,
+)
+
+
+@pytest.mark.parametrize("m", [1, 2, 5])
+def test_subsample_stats_match_direct_estimates(m):
+    rng = np.random.default_rng(0)
+    n = 40
+    X = np.column_stack([np.ones(n), rng.normal(size=(n, 2))])
+    Y = X @ np.array([[1.0], [0.5], [-2.0]]) + rng.normal(size=(n, 1))
+    SIGMA = np.cov(rng.normal(size=(m, 3 * m))) + np.eye(m)
+
+    stats = subsample_stats(X, Y, m, inv(SIGMA))
+
+    assert all(len(values) == n - m + 1 for values in stats.values())
+    for t in (0, 7, n - m):
+        smpl1 = [i for i in range(n) if not (t <= i < t + m)]
+        smpl2 = [i for i in range(n) if not (t <= i < t + np.ceil(m / 2))]
+        _X, _Y = X[t:t + m], Y[t:t + m]
+
+        _resid1 = _Y - _X @ inverse(X[smpl1]) @ X[smpl1].T @ Y[smpl1]
+        _resid2 = _Y - _X @ inverse(X[smpl2]) @ X[smpl2].T @ Y[smpl2]
+        _PROJ = proj(m, _X, SIGMA)
+
+        assert stats["Sa"][t] == pytest.approx((_resid1.T @ _resid1).item())
+        assert stats["Sb"][t] == pytest.approx((_resid2.T @ _resid2).item())
+        assert stats["Sc"][t] == pytest.approx((_resid1.T @ _PROJ @ _resid1).item())
+        assert stats["Sd"][t] == pytest.approx((_resid2.T @ _PROJ @ _resid2).item())
+        assert stats["R"][t] == pytest.approx(float(np.sum(np.cumsum(_resid2[::-1, :]) ** 2)))
+
+
+@pytest.mark.parametrize("n", [100, 1000, 10000])
+@pytest.mark.parametrize("m", [1, 12, 24])
+def test_sigma_lagged_matches_sigma(n, m):
+    u = np.random.default_rng(n + m).normal(size=n + m)
+    np.testing.assert_allclose(sigma_lagged(u, m), sigma(u, m), rtol=1e-10, atol=1e-12)
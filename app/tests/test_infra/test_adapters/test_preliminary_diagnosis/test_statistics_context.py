@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.core.application.preliminary_diagnosis.schemas.statistics import RusStatMetricEnum, StatisticResult
+from src.infrastructure.factories.statistics import SeriesMoments, StatisticsFactory
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=503) * 50 + 1000
+    x[::7] = np.round(x[::7])
+    x[[3, 40, 41]] = np.nan
+    return x
+
+
+@pytest.mark.parametrize('parts', [None, 4, 10])
+def test_groups_match_direct_calculation(values, parts):
+    labels = pd.qcut(values, q=parts, labels=False).astype(float) if parts else None
+    moments = SeriesMoments(values, labels)
+
+    observed = values[~np.isnan(values)]
+    groups = [observed] if parts is None else [values[labels == g] for g in range(parts)]
+    assert len(moments) == len(groups)
+
+    for (_, ctx), group in zip(moments.contexts(), groups):
+        np.testing.assert_array_equal(ctx.values, group)
+        np.testing.assert_array_equal(ctx.sorted, np.sort(group))
+
+    np.testing.assert_array_equal(moments.size, [len(g) for g in groups])
+    np.testing.assert_array_equal(moments.mean, [np.mean(g) for g in groups])
+    np.testing.assert_array_equal(moments.var, [np.var(g, ddof=1) for g in groups])
+    np.testing.assert_array_equal(moments.median, [np.median(g) for g in groups])
+    np.testing.assert_array_equal(moments.quantile(0.25), [np.quantile(g, 0.25) for g in groups])
+    np.testing.assert_array_equal(moments.last, [g[-1] for g in groups])
+    np.testing.assert_allclose(moments.m3 / moments.m2 ** 1.5, [stats.skew(g) for g in groups], rtol=1e-12)
+    np.testing.assert_allclose(moments.trimmed_mean(0.1), [stats.trim_mean(g, 0.1) for g in groups], rtol=1e-12)
+
+    bins = np.sqrt(moments.size).astype(int)
+    np.testing.assert_array_equal(
+        moments.histogram(bins), np.concatenate([np.histogram(g, bins=b)[0] for g, b in zip(groups, bins)])
+    )
+
+
+def test_group_values_match_single_series(values):
+    labels = pd.qcut(values, q=5, labels=False).astype(float)
+    moments = SeriesMoments(values, labels)
+    groups = [values[labels == g] for g in range(5)]
+
+    for statistic in RusStatMetricEnum:
+        group_values = StatisticsFactory.get_group_values(moments, statistic)
+        assert [StatisticResult(value=value).value for value in group_values] == [
+            StatisticsFactory.get_value(group, statistic).value for group in groups
+        ], statistic
+
+
+def test_statistics_of_series(values):
+    ts = values[~np.isnan(values)]
+
+    def value(statistic: RusStatMetricEnum):
+        return StatisticsFactory.get_value(ts, statistic).value
+
+    assert value(RusStatMetricEnum.N_OBS) == len(ts)
+    assert value(RusStatMetricEnum.SUM) == round(ts.sum(), 3)
+    assert value(RusStatMetricEnum.STD_ERR) == round(stats.sem(ts))
+    assert value(RusStatMetricEnum.TRIMMED_MEAN) == round(stats.trim_mean(ts, 0.1))
+    assert value(RusStatMetricEnum.ENTROPY) == round(stats.entropy(np.histogram(ts, bins=22)[0] / len(ts)))
+    assert value(RusStatMetricEnum.SKEW) == round(stats.skew(ts, bias=False), 2)
+    assert value(RusStatMetricEnum.KURTOSIS) == round(stats.kurtosis(ts, bias=False), 2)
+    assert value(RusStatMetricEnum.LAST_Z) == round(stats.zscore(ts)[-1], 2)
+    assert value(RusStatMetricEnum.MODE) == pd.Series(ts).value_counts().index[0]
+    assert value(RusStatMetricEnum.MEAN_CONF_INT) == {
+        'Нижний': round(np.mean(ts) - stats.t.ppf(0.975, len(ts) - 1) * stats.sem(ts)),
+        'Верхний': round(np.mean(ts) + stats.t.ppf(0.975, len(ts) - 1) * stats.sem(ts)),
+    }
+
+
+@pytest.mark.parametrize('ts', [np.full(20, 7.0), 1e9 + np.arange(20) * 1e-7])
+def test_constant_series_moments_are_undefined(ts):
+    moments = SeriesMoments(ts)
+    for statistic in (RusStatMetricEnum.SKEW, RusStatMetricEnum.KURTOSIS, RusStatMetricEnum.LAST_Z):
+        assert StatisticsFactory.get_group_values(moments, statistic) == [None]
+
+
+def test_single_observation():
+    moments = SeriesMoments(np.array([np.nan, 5.0]))
+    assert StatisticsFactory.get_group_values(moments, RusStatMetricEnum.N_OBS) == [1]
+    assert StatisticsFactory.get_group_values(moments, RusStatMetricEnum.STD) == [None]
+    assert StatisticsFactory.get_group_values(moments, RusStatMetricEnum.MEAN_CONF_INT) == [None]
+    assert StatisticsFactory.get_group_values(moments, RusStatMetricEnum.MEDIAN_WOLSH) == [None]
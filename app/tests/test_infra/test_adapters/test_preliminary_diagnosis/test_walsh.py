@@ -0,0 +1,47 @@
+from itertools import combinations, combinations_with_replacement
+
+import numpy as np
+import pytest
+
+from src.infrastructure.factories.statistics.methods import HodgesLehmann, MedianWolsh
+from src.infrastructure.factories.statistics.walsh import walsh_median
+
+
+def brute_force(values: np.ndarray, with_replacement: bool):
+    pairs = combinations_with_replacement(values, 2) if with_replacement else combinations(values, 2)
+    return np.median([(x + y) / 2 for x, y in pairs])
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("with_replacement", [False, True])
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.random.default_rng(0).normal(size=301),
+        np.random.default_rng(1).normal(size=200) * 1e12 + 0.3,
+        np.random.default_rng(2).integers(-3, 3, size=250),
+        np.round(np.random.default_rng(3).normal(size=180), 1).astype(np.float32),
+        np.full(150, 0.1),
+        np.array([2.5]),
+        np.array([1.0, 4.0]),
+    ]
+)
+def test_walsh_median_matches_all_pairs(values, with_replacement):
+    expected = brute_force(values, with_replacement)
+    result = walsh_median(values, with_replacement)
+
+    # у одной точки нет пар без повторения, медиана - NaN, как у np.median пустого списка
+    np.testing.assert_equal(result, expected)
+    assert np.asarray(result).dtype == np.asarray(expected).dtype
+
+
+def test_long_series():
+    # 20 000 точек - 200 млн пар, перебор не помещается в память
+    values = np.random.default_rng(4).standard_t(df=3, size=20_000)
+    result = walsh_median(values, with_replacement=True)
+
+    sample = values[:2_000]
+    assert walsh_median(sample, with_replacement=True) == brute_force(sample, with_replacement=True)
+    assert abs(result - np.median(values)) < 0.1
+    assert round(result) == HodgesLehmann().get_value(values).value
+    assert round(walsh_median(values, with_replacement=False)) == MedianWolsh().get_value(values).value
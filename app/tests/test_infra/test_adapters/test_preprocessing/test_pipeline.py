@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.application.preprocessing.preprocess_scheme import (
+    DiffTransformation,
+    LagTransformation,
+    LogTransformation,
+    PowTransformation,
+    StandardTransformation,
+    MinMaxTransformation,
+    BoxCoxTransformation,
+    FillMissingTransformation,
+    MovingAverageTransformation,
+    InterpolateTransformation,
+    DiffContext,
+    InverseDiffTransformation,
+    InverseLogTransformation,
+    InverseMinMaxTransformation,
+)
+from src.infrastructure.factories.preprocessing import PreprocessFactory
+
+
+@pytest.fixture
+def sample_series() -> pd.Series:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start="2020-01-01", periods=400, freq="D")
+    ts = pd.Series(np.abs(rng.normal(size=400)) * 100 + 1, index=dates, name="y")
+    ts.iloc[[3, 50, 51]] = np.nan
+    return ts
+
+
+def apply_by_step(ts: pd.Series, transformations: list):
+    contexts = []
+    for step, transformation in enumerate(transformations, start=1):
+        ts, context = PreprocessFactory.apply(ts, transformation)
+        if context is not None:
+            context.step = step
+            contexts.append(context)
+    return ts, contexts
+
+
+@pytest.mark.parametrize("transformations", [
+    [LogTransformation(), PowTransformation(pow_order=2), StandardTransformation(), MinMaxTransformation()],
+    [
+        FillMissingTransformation(method='last'),
+        BoxCoxTransformation(param=0.5),
+        DiffTransformation(diff_order=7),
+        PowTransformation(pow_order=1.5),
+    ],
+    [
+        MinMaxTransformation(),
+        InterpolateTransformation(interpolate_method='linear'),
+        LogTransformation(),
+        DiffTransformation(diff_order=-2),
+        LagTransformation(lag_order=3),
+        MovingAverageTransformation(window=4),
+        StandardTransformation(),
+    ],
+])
+def test_pipeline_matches_steps(sample_series, transformations):
+    expected, expected_contexts = apply_by_step(sample_series, transformations)
+    result, contexts = PreprocessFactory.compile(transformations).apply(sample_series)
+
+    pd.testing.assert_series_equal(result, expected)
+    assert [context.model_dump() for context in contexts] == [context.model_dump() for context in expected_contexts]
+    # исходный ряд не меняется
+    assert sample_series.isna().sum() == 3
+
+
+@pytest.mark.parametrize("order", [-3, 0, 2, 500])
+def test_diff_and_lag_match_pandas(sample_series, order):
+    res, context = PreprocessFactory.apply(sample_series, DiffTransformation(diff_order=order))
+    pd.testing.assert_series_equal(res, sample_series.diff(order))
+    boundary = sample_series[:order] if order >= 0 else sample_series[order:]
+    assert context.first_values == DiffContext(first_values=boundary).first_values
+
+    res, _ = PreprocessFactory.apply(sample_series, LagTransformation(lag_order=order))
+    pd.testing.assert_series_equal(res, sample_series.shift(order))
+
+
+def test_pipeline_boxcox_negative(sample_series):
+    pipeline = PreprocessFactory.compile([
+        FillMissingTransformation(method='mean'), StandardTransformation(), BoxCoxTransformation(param=0.5)
+    ])
+    with pytest.raises(ValueError):
+        pipeline.apply(sample_series)
+
+
+@pytest.mark.parametrize("order", [-12, -1, 1, 7, 500])
+def test_diff_inverse_round_trip(order):
+    dates = pd.date_range(start="2020-01-01", periods=100, freq="D")
+    ts = pd.Series(np.round(np.random.default_rng(1).normal(size=100), 4), index=dates, name="y")
+
+    diff, context = PreprocessFactory.apply(ts, DiffTransformation(diff_order=order))
+    restored = PreprocessFactory.inverse(
+        diff, InverseDiffTransformation(diff_order=order, first_values=context.first_values)
+    )
+
+    pd.testing.assert_series_equal(restored, ts)
+
+
+def test_diff_inverse_matches_recursion(sample_series):
+    first_values = [1.0, None, 3.0]
+    restored = PreprocessFactory.inverse(
+        sample_series, InverseDiffTransformation(diff_order=3, first_values=first_values)
+    )
+
+    expected = np.full(len(sample_series), np.nan)
+    expected[:3] = np.array(first_values, dtype=float)
+    for i in range(3, len(sample_series)):
+        expected[i] = expected[i - 3] + sample_series.iloc[i]
+
+    np.testing.assert_array_equal(restored.to_numpy(), expected)
+
+
+def test_pipeline_inverse(sample_series):
+    ts = sample_series.dropna()
+    transformations = [
+        LogTransformation(), MinMaxTransformation(), DiffTransformation(diff_order=12), LagTransformation(lag_order=-2)
+    ]
+    preprocessed, (minmax, diff) = PreprocessFactory.compile(transformations).apply(ts)
+
+    inverse_transformations = [
+        InverseLogTransformation(),
+        InverseMinMaxTransformation(init_min=minmax.init_min, init_max=minmax.init_max),
+        InverseDiffTransformation(diff_order=12, first_values=diff.first_values),
+        LagTransformation(lag_order=-2),
+    ]
+    restored = PreprocessFactory.compile(inverse_transformations).inverse(preprocessed)
+
+    expected = preprocessed
+    for transformation in reversed(inverse_transformations):
+        expected = PreprocessFactory.inverse(expected, transformation)
+
+    pd.testing.assert_series_equal(restored, expected)
+    pd.testing.assert_series_equal(restored, ts, rtol=1e-3)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+from neuralforecast import NeuralForecast
+from neuralforecast.models import NHITS
+
+from src.infrastructure.adapters.serializer import Codec, CompactSerializer, PickleSerializer
+
+
+@pytest.fixture
+def target():
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2000-01-31', periods=120, freq='ME')
+    return pd.Series(np.cumsum(rng.normal(size=120)) + 50, index=index)
+
+
+@pytest.fixture
+def sarimax(target):
+    exog = pd.DataFrame({'x': np.sin(np.arange(len(target)))}, index=target.index)
+    model = sm.tsa.SARIMAX(target, exog=exog, order=(1, 1, 1), seasonal_order=(1, 0, 0, 12), trend='c')
+    return model.fit(disp=False), exog
+
+
+@pytest.mark.parametrize('codec', [None, Codec.none, Codec.zlib])
+def test_sarimax_round_trip(sarimax, codec):
+    model, exog = sarimax
+    serializer = CompactSerializer(codec=codec)
+
+    model_bytes = serializer.serialize(model)
+    restored = serializer.deserialize(model_bytes)
+
+    assert len(model_bytes) < len(PickleSerializer().serialize(model)) / 100
+    np.testing.assert_array_equal(restored.params, model.params)
+    pd.testing.assert_series_equal(restored.model.data.orig_endog, model.model.data.orig_endog)
+    pd.testing.assert_series_equal(
+        restored.get_prediction().predicted_mean, model.get_prediction().predicted_mean
+    )
+
+    new_exog = exog.iloc[-24:]
+    pd.testing.assert_series_equal(
+        restored.apply(model.model.data.orig_endog.iloc[-24:], exog=new_exog).get_forecast(6, exog=new_exog.iloc[:6]).predicted_mean,
+        model.apply(model.model.data.orig_endog.iloc[-24:], exog=new_exog).get_forecast(6, exog=new_exog.iloc[:6]).predicted_mean,
+    )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_neural_archive_round_trip(target):
+    df = pd.DataFrame({'unique_id': 'ts', 'ds': target.index, 'y': target.values})
+    model = NHITS(h=4, input_size=8, max_steps=2, mlp_units=[[8, 8]] * 3, accelerator='cpu', enable_progress_bar=False)
+    nf = NeuralForecast(models=[model], freq='ME')
+    nf.fit(df=df)
+    archive = {'nf': nf, 'model': nf.models[0]}
+
+    serializer = CompactSerializer()
+    restored = serializer.deserialize(serializer.serialize(archive))
+
+    assert restored['model'].input_size == 8
+    assert restored['nf'].freq == 'ME'
+    pd.testing.assert_frame_equal(restored['nf'].predict(df=df), nf.predict(df=df))
+
+
+def test_reads_pickle_serializer_bytes():
+    model = {'weights': list(range(10))}
+    assert CompactSerializer().deserialize(PickleSerializer().serialize(model)) == model
+
+
+def test_unknown_version():
+    model_bytes = bytearray(CompactSerializer(codec=Codec.none).serialize([1, 2, 3]))
+    model_bytes[len(CompactSerializer.MAGIC)] = CompactSerializer.VERSION + 1
+    with pytest.raises(ValueError):
+        CompactSerializer().deserialize(bytes(model_bytes))
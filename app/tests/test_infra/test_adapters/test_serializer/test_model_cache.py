@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from src.infrastructure.adapters.serializer import CompactSerializer, ModelCache, PickleSerializer, model_size
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+        self._serializer = PickleSerializer()
+
+    def __call__(self, model_bytes: bytes):
+        self.calls += 1
+        return self._serializer.deserialize(model_bytes)
+
+
+@pytest.fixture
+def model_bytes():
+    return PickleSerializer().serialize({'weights': list(range(100))})
+
+
+def test_hit_reuses_deserialized_model(model_bytes):
+    cache, load = ModelCache(max_entries=4, max_bytes=10 ** 6), CountingLoader()
+
+    with cache.checkout(model_bytes, load) as first:
+        pass
+    with cache.checkout(bytes(model_bytes), load) as second:
+        assert second is first
+
+    assert load.calls == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (1, 1, 1, model_size(first))
+
+
+def test_concurrent_checkout_gets_own_copy(model_bytes):
+    cache, load = ModelCache(max_entries=4, max_bytes=10 ** 6), CountingLoader()
+
+    with cache.checkout(model_bytes, load) as first:
+        with cache.checkout(model_bytes, load) as second:
+            assert second is not first
+
+    assert load.calls == 2
+    assert cache.stats().entries == 1
+
+
+def test_eviction_by_count_and_size():
+    serializer = PickleSerializer()
+    models = [serializer.serialize(list(range(i * 10))) for i in range(1, 4)]
+
+    cache = ModelCache(max_entries=2, max_bytes=10 ** 6)
+    for model in models:
+        with cache.checkout(model, serializer.deserialize):
+            pass
+    assert cache.stats().entries == 2
+    assert cache.stats().evictions == 1
+
+    cache = ModelCache(max_entries=10, max_bytes=30, sizeof=len)
+    for model in models:
+        with cache.checkout(model, serializer.deserialize):
+            pass
+    # списки длиной 10 и 20 вместе занимают 30, третий вытесняет оба
+    assert (cache.stats().entries, cache.stats().size_bytes) == (1, 30)
+
+
+def test_failed_prediction_does_not_cache(model_bytes):
+    cache = ModelCache(max_entries=4, max_bytes=10 ** 6)
+    with pytest.raises(RuntimeError):
+        with cache.checkout(model_bytes, PickleSerializer().deserialize):
+            raise RuntimeError()
+
+    assert cache.stats().entries == 0
+
+
+def test_model_size_counts_large_buffers():
+    # массивы больше порога протокола 5 пишутся в pickle отдельными буферами
+    values = np.arange(200_000, dtype=np.float64)
+    model = {'a': values, 'b': values, 'view': values[::2], 'weights': list(range(10))}
+
+    # общий массив учитывается один раз
+    size = model_size(model)
+    assert values.nbytes + values[::2].nbytes <= size < values.nbytes + values[::2].nbytes + 1000
+
+
+def test_compact_model_sized_in_memory():
+    index = pd.date_range('1970-01-31', periods=600, freq='ME')
+    target = pd.Series(np.cumsum(np.random.default_rng(0).normal(size=600)), index=index)
+    model = sm.tsa.SARIMAX(target, order=(2, 1, 2), seasonal_order=(1, 0, 1, 12)).fit(disp=False)
+    model_bytes = CompactSerializer().serialize(model)
+
+    cache = ModelCache(max_entries=4, max_bytes=10 ** 9)
+    with cache.checkout(model_bytes, CompactSerializer().deserialize) as model:
+        pass
+
+    # компактный файл хранит только параметры, модель в памяти в сотни раз больше
+    assert cache.stats().size_bytes == model_size(model) > 100 * len(model_bytes)
+
+    # лимит, в который уложился бы файл, модель из памяти не пропускает
+    cache = ModelCache(max_entries=4, max_bytes=100 * len(model_bytes))
+    with cache.checkout(model_bytes, CompactSerializer().deserialize):
+        pass
+    assert cache.stats().entries == 0
+
+
+def test_unsized_model_charged_by_file(model_bytes):
+    def sizeof(model):
+        raise TypeError()
+
+    cache = ModelCache(max_entries=4, max_bytes=10 ** 6, sizeof=sizeof)
+    with cache.checkout(model_bytes, PickleSerializer().deserialize):
+        pass
+
+    assert cache.stats().size_bytes == len(model_bytes)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import f, ttest_1samp, ttest_ind
+
+from src.core.domain import DataFrequency
+from src.infrastructure.adapters.stat_tests.fisher import FisherTestAdapter
+from src.infrastructure.adapters.stat_tests.monitoring import (
+    SegmentMoments,
+    fisher_split_tests,
+    student_point_tests,
+    student_split_tests,
+)
+from src.infrastructure.adapters.stat_tests.two_sigma import TwoSigmaTestAdapter
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    # большой уровень ряда, чтобы проверить точность разности префиксных сумм
+    return 1e4 + np.cumsum(rng.normal(size=200))
+
+
+def test_segment_moments_match_numpy(values):
+    moments = SegmentMoments(values)
+    starts = np.array([0, 10, 50, 150, 198])
+    stops = np.array([200, 40, 51, 170, 200])
+
+    for start, stop, mean, var in zip(starts, stops, moments.mean(starts, stops), moments.var(starts, stops, ddof=1)):
+        assert mean == pytest.approx(np.mean(values[start:stop]), rel=1e-12)
+        if stop - start > 1:
+            assert var == pytest.approx(np.var(values[start:stop], ddof=1), rel=1e-8)
+        else:
+            assert np.isnan(var)
+
+
+def test_segment_moments_skipna():
+    values = np.array([1.0, np.nan, 3.0, np.inf, 5.0])
+    moments = SegmentMoments(values, skipna=True)
+
+    assert moments.count(0, 3) == 2
+    assert moments.mean(0, 3) == pytest.approx(2.0)
+    assert moments.var(0, 3) == pytest.approx(1.0)
+    assert moments.count(0, 5) == 4
+    assert np.isnan(moments.var(0, 5))
+    assert np.isnan(SegmentMoments(values).var(0, 3))
+
+
+@pytest.mark.parametrize("equal_var", [True, False])
+def test_split_tests_match_scipy(values, equal_var):
+    moments = SegmentMoments(values)
+    splits = np.arange(150, 198)
+
+    statistics, p_values = student_split_tests(moments, 20, splits, splits, 200, equal_var=equal_var)
+    F_stats, F_cdf = fisher_split_tests(moments, splits, 200, 20, splits)
+    for split, statistic, p_value, F_stat, cdf in zip(splits, statistics, p_values, F_stats, F_cdf):
+        expected = ttest_ind(values[20:split], values[split:], equal_var=equal_var)
+        assert statistic == pytest.approx(expected.statistic, rel=1e-6)
+        assert p_value == pytest.approx(expected.pvalue, rel=1e-6)
+
+        expected_F = np.var(values[split:], ddof=1) / np.var(values[20:split], ddof=1)
+        assert F_stat == pytest.approx(expected_F, rel=1e-6)
+        assert cdf == pytest.approx(f.cdf(expected_F, 199 - split, split - 21), rel=1e-6)
+
+    statistic, p_value = student_point_tests(moments, 20, 199, values[-1])
+    expected = ttest_1samp(values[20:-1], values[-1])
+    assert statistic == pytest.approx(expected.statistic, rel=1e-8)
+    assert p_value == pytest.approx(expected.pvalue, rel=1e-6)
+
+
+def test_fisher_adapter_matches_slices(values):
+    series = pd.Series(values, index=pd.date_range("2000-01-01", periods=200, freq="MS"))
+    results = FisherTestAdapter().perform_fisher_test(series, DataFrequency.month, series.index[50])
+
+    assert len(results) == 12
+    assert results[0].statistic is None
+    for test_index, (i, result) in enumerate(zip(range(2, 13), results[1:])):
+        expected = np.var(values[-i:], ddof=1) / np.var(values[-50:-i], ddof=1)
+        assert result.statistic == pytest.approx(round(expected, 4))
+        assert result.datetime == series.index[-3 - test_index]
+
+
+def test_two_sigma_adapter_matches_growth_rates(values):
+    series = pd.Series(values, index=pd.date_range("2000-01-01", periods=200, freq="QS"))
+    results = TwoSigmaTestAdapter().perform_two_sigma_test(series, DataFrequency.quart, series.index[100])
+
+    assert len(results) == 4
+    for j, result in zip(range(1, 5), results):
+        growth = values[100 - 4 - j:100 - j] / values[100 - 8 - j:100 - 4 - j]
+        diff = np.diff(growth)
+        assert result.std == pytest.approx(round(np.std(diff), 4))
+        assert result.confidence_interval[0] == pytest.approx(round(np.mean(diff) - 2 * np.std(diff), 4))
@@ -0,0 +1,81 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.adapters.structural_shifts.break_finder import BreakFinderAdapter
+from src.infrastructure.adapters.structural_shifts.dynamic_programming import (
+    optimal_breaks,
+    prefix_ssr,
+    segment_ssr,
+)
+
+
+@pytest.fixture
+def shifted_series():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=60) + np.r_[np.zeros(20), 4 * np.ones(25), -3 * np.ones(15)]
+    return pd.Series(values, index=pd.date_range("2000-01-31", periods=60, freq="ME"))
+
+
+def ols_ssr(y, trend):
+    X = np.column_stack([np.ones(len(y)), np.arange(len(y))]) if trend else np.ones((len(y), 1))
+    resid = y - X @ np.linalg.lstsq(X, y, rcond=None)[0]
+    return resid @ resid
+
+
+@pytest.mark.parametrize("trend", [False, True])
+def test_segment_ssr_matches_ols(trend):
+    y = np.random.default_rng(1).normal(size=25)
+    starts = np.array([0, 3, 4, 10, 24])
+
+    for length, ssr in segment_ssr(y, starts, trend=trend):
+        assert len(ssr) == np.sum(starts + length <= 25)
+        for start, value in zip(starts, ssr):
+            assert value == pytest.approx(ols_ssr(y[start:start + length], trend), abs=1e-9)
+
+    first = prefix_ssr(y, trend=trend)
+    last = prefix_ssr(y[::-1], trend=trend)[::-1]
+    for b in range(1, 25):
+        assert first[b] == pytest.approx(ols_ssr(y[:b], trend), abs=1e-9)
+        assert last[b] == pytest.approx(ols_ssr(y[b:], trend), abs=1e-9)
+
+
+@pytest.mark.parametrize("n_obs, n_breaks", [(20000, 1), (3000, 2)])
+def test_dynamic_programming_memory(n_obs, n_breaks):
+    y = np.random.default_rng(2).normal(size=n_obs) + 4 * np.r_[np.zeros(n_obs // 3), np.ones(n_obs - n_obs // 3)]
+
+    tracemalloc.start()
+    breaks = optimal_breaks(y, n_breaks, lbound=n_obs // 10, ubound=n_obs - n_obs // 10, gap=n_obs // 20)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # память линейна по длине ряда: несколько векторов длины n, а не матрица n x n
+    assert peak < 50 * 8 * n_obs
+    assert n_obs // 3 in breaks
+
+
+@pytest.mark.parametrize("n_breaks", [1, 2, 3])
+@pytest.mark.parametrize("trend", [False, True])
+def test_dynamic_programming_matches_enumeration(shifted_series, n_breaks, trend, monkeypatch):
+    params = dict(n_breaks=n_breaks, gap=3, trend=trend, break_trend=trend)
+    fast = BreakFinderAdapter().fit(shifted_series, **params)
+
+    monkeypatch.setattr(BreakFinderAdapter, "_is_pure_structural_change", staticmethod(lambda *args: False))
+    slow = BreakFinderAdapter().fit(shifted_series, **params)
+
+    assert fast == slow
+
+
+def test_finds_level_shifts(shifted_series):
+    response = BreakFinderAdapter().fit(shifted_series, n_breaks=2, gap=3)
+    assert response.break_datetimes == [
+        shifted_series.index[20].to_pydatetime(),
+        shifted_series.index[45].to_pydatetime(),
+    ]
+
+
+def test_no_admissible_breaks(shifted_series):
+    with pytest.raises(ValueError):
+        BreakFinderAdapter().fit(shifted_series, n_breaks=3, gap=0.4)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from src.infrastructure.adapters.timeseries.recursive_window import RecursiveWindow
+from src.shared.to_panel import to_panel
+
+
+def test_first_window_matches_to_panel(sample_data_to_split):
+    target, exog = sample_data_to_split
+    window = RecursiveWindow(target, exog, input_size=4, steps=3)
+
+    expected = to_panel(target.iloc[-4:], exog.iloc[-4:])
+    pd.testing.assert_frame_equal(window.to_panel(), expected, check_dtype=False, check_like=True)
+
+
+def test_push_shifts_window_and_extends_exog(sample_data_to_split):
+    target, exog = sample_data_to_split
+    window = RecursiveWindow(target, exog, input_size=4, steps=3)
+
+    window.push(100.0)
+    window.push(101.0)
+    panel = window.to_panel()
+
+    assert panel['y'].tolist() == [8, 9, 100, 101]
+    assert panel['ds'].tolist() == pd.date_range("2020-01-09", "2020-01-12").tolist()
+    # exog продлевается последним известным значением
+    assert panel['feature'].tolist() == [8, 9, 9, 9]
+    assert panel['feature 2'].tolist() == [18, 19, 19, 19]
+
+
+def test_without_exog(sample_data_to_split):
+    target, _ = sample_data_to_split
+    window = RecursiveWindow(target, None, input_size=3, steps=1)
+    window.push(np.float32(0.5))
+    panel = window.to_panel()
+
+    assert list(panel.columns) == ['unique_id', 'ds', 'y']
+    assert panel['y'].tolist() == [8, 9, 0.5]
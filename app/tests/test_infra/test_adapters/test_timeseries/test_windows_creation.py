@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from neuralforecast import NeuralForecast
+from neuralforecast.models import NHITS
+
+from src.infrastructure.adapters.timeseries.windows_creation import WindowsCreation
+from src.shared.to_panel import to_panel
+
+
+def test_windows_view_is_not_a_copy(sample_data_to_split):
+    target, exog = sample_data_to_split
+    windows = WindowsCreation().create_windows_view(exog, target, input_size=4)
+
+    assert len(windows) == 7
+    assert windows.target.shape == (7, 4)
+    assert windows.exog.shape == (7, 4, 2)
+    assert np.shares_memory(windows.target, target.to_numpy())
+    assert windows.exog[2, :, 1].tolist() == [12, 13, 14, 15]
+
+
+def test_windows_view_panel_matches_per_window_panels(sample_data_to_split):
+    target, exog = sample_data_to_split
+    windows = WindowsCreation().create_windows_view(exog, target, input_size=4)
+
+    panel = windows.to_panel(2, 5)
+    assert panel['unique_id'].unique().tolist() == ['2', '3', '4']
+    for i, (_, window_panel) in zip(range(2, 5), panel.groupby('unique_id', sort=True)):
+        expected = to_panel(target.iloc[i:i + 4], exog.iloc[i:i + 4])
+        pd.testing.assert_frame_equal(
+            window_panel.drop(columns='unique_id').reset_index(drop=True),
+            expected.drop(columns='unique_id'),
+            check_dtype=False,
+            check_like=True,
+        )
+    assert windows.last_dates(2, 5).tolist() == pd.date_range("2020-01-06", "2020-01-08").tolist()
+
+
+def test_windows_view_without_exog(sample_data_to_split):
+    target, _ = sample_data_to_split
+    panel = WindowsCreation().create_windows_view(None, target, input_size=9).to_panel()
+
+    assert list(panel.columns) == ['unique_id', 'ds', 'y']
+    assert panel['y'].tolist() == list(range(9)) + list(range(1, 10))
+
+
+def test_windows_view_too_long_input(sample_data_to_split):
+    target, _ = sample_data_to_split
+    with pytest.raises(ValueError):
+        WindowsCreation().create_windows_view(None, target, input_size=11)
+
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_windows_predict_in_batches_matches_per_window():
+    index = pd.date_range('2000-01-31', periods=30, freq='ME')
+    target = pd.Series(np.sin(np.arange(30) / 3) + 5, index=index, name='target')
+    model = NHITS(h=2, input_size=8, max_steps=2, mlp_units=[[8, 8]] * 3, accelerator='cpu', enable_progress_bar=False)
+    nf = NeuralForecast(models=[model], freq='ME')
+    nf.fit(df=pd.DataFrame({'unique_id': 'ts', 'ds': index, 'y': target.values}))
+
+    windows = WindowsCreation().create_windows_view(None, target, input_size=8)
+    # пачка меньше числа окон, последняя пачка неполная
+    predictions = windows.predict(nf, 'NHITS', batch_size=5)
+
+    assert len(predictions) == len(windows) == 23
+    for i, prediction in enumerate(predictions):
+        expected = nf.predict(df=windows.to_panel(i, i + 1))['NHITS']
+        np.testing.assert_allclose(prediction.to_numpy(), expected.to_numpy(), rtol=1e-6)
+        assert prediction.index.tolist() == pd.date_range(index[i + 7], periods=3, freq='ME')[1:].tolist()
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from statsmodels.api import OLS
+
+from src.shared.hegy import seasonalURoot
+from src.shared.hegy.hegy import _NestedOLS, _PS, _gls_weights, seasonalURootCV
+
+
+@pytest.fixture
+def seasonal_series():
+    rng = np.random.default_rng(0)
+    e = rng.normal(size=301)
+    return np.cumsum(e[1:] - 0.9 * e[:-1]) + 3 * np.sin(np.arange(300) * np.pi / 2)
+
+
+def test_nested_ols_matches_statsmodels():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(80, 6))
+    Y = X @ rng.normal(size=(6, 1)) + rng.normal(size=(80, 1))
+    nested = _NestedOLS(Y, X)
+
+    for p in range(1, 7):
+        model = OLS(Y, X[:, :p]).fit()
+        assert nested.rss[p] == pytest.approx(model.ssr)
+        for criteria in ("aic", "bic", "hqic"):
+            assert nested.info_criteria(criteria, p) == pytest.approx(model.info_criteria(criteria))
+
+    model = OLS(Y, X[:, :4]).fit()
+    t_value, f_value = nested.wald(4, [("t", [2]), ("f", [0, 1, 3])])
+    assert t_value == pytest.approx(model.tvalues[2])
+    assert f_value == pytest.approx(model.f_test(np.eye(4)[[0, 1, 3]]).fvalue)
+
+
+@pytest.mark.parametrize("S", [2, 4, 7])
+@pytest.mark.parametrize("trend", ["n", "cd", "cdt"])
+@pytest.mark.parametrize("criteria", ["aic", "bic", "fixed"])
+def test_stats_match_ols_lag_search(seasonal_series, S, trend, criteria, monkeypatch):
+    result = seasonalURoot(seasonal_series, max_lag=8, trend=trend, criteria=criteria, S=S)
+
+    monkeypatch.setattr(_NestedOLS, "full_rank", property(lambda self: False))
+    expected = seasonalURoot(seasonal_series, max_lag=8, trend=trend, criteria=criteria, S=S)
+
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result["stat"], expected["stat"], rtol=1e-8)
+    np.testing.assert_allclose(result["pval"], expected["pval"], rtol=1e-6, atol=1e-8)
+
+
+def test_gls_weights_match_direct_cholesky():
+    rng = np.random.default_rng(2)
+    regP = _PS[100:115]
+    regSD = rng.uniform(0.01, 0.1, size=15)
+    lo, hi = np.minimum.outer(regP, regP), np.maximum.outer(regP, regP)
+    Sigma = np.outer(regSD, regSD) * np.sqrt((lo * (1 - hi)) / (hi * (1 - lo)))
+
+    expected = np.linalg.inv(np.linalg.cholesky(Sigma, upper=True)).T
+    np.testing.assert_allclose(_gls_weights(15)[100] / regSD, expected, rtol=1e-8, atol=1e-8)
+
+
+@pytest.mark.parametrize("test", ["zero", "pi", "pair", "seas", "all"])
+def test_cv_array_matches_scalar(test):
+    x = np.array([-1e3, -3.0, -1.5, 0.0, 1.0, 2.5, 6.0, 15.0, 1e3])
+    pvals = seasonalURootCV(x, T=200, S=4, lags=2, test=test, trend="cd", criteria="aic")
+
+    assert pvals.shape == x.shape
+    for value, pval in zip(x, pvals):
+        scalar = seasonalURootCV(value, T=200, S=4, lags=2, test=test, trend="cd", criteria="aic")
+        assert isinstance(scalar, float)
+        assert scalar == pytest.approx(pval)
+
+    isFtest = test not in ("zero", "pi")
+    assert pvals[0] == (1.0 if isFtest else 0.0)
+    assert pvals[-1] == (0.0 if isFtest else 1.0)
+
+
+def test_cv_does_not_depend_on_working_directory(seasonal_series, tmp_path, monkeypatch):
+    expected = seasonalURoot(seasonal_series, max_lag=4, trend="c", criteria="bic", S=4)
+    monkeypatch.chdir(tmp_path)
+    result = seasonalURoot(seasonal_series, max_lag=4, trend="c", criteria="bic", S=4)
+
+    np.testing.assert_array_equal(result["pval"], expected["pval"])